@@ -6,13 +6,20 @@ import re
 from pathlib import Path
 from typing import Dict
 
+from utils.event_bundle import DEFAULT_ROUTE_PACK_FILE
 from utils.event_storage import (
     DEFAULT_EVENTS_FILE,
-    load_events_for_runtime,
-    save_events_to_storage,
+    commit_event_changes,
+    load_events_for_update,
 )
 from utils.extract_route_from_ridewithgps import extract_route_from_ridewithgps
-from utils.route_utils import classify_route_loop
+from utils.route_geometry import RouteGeometry, RoutePack, load_route_pack, route_hash
+from utils.route_utils import (
+    ROUTE_EXTENT_FIELDS,
+    annotate_route_extent,
+    canonicalize_event_route,
+    classify_route_loop,
+)
 
 _RIDEWITHGPS_PATTERN = re.compile(r"https://ridewithgps\.com/routes/\S+")
 
@@ -32,9 +39,24 @@ def _extract_ridewithgps_url(event: Dict[str, object]) -> str:
     return ""
 
 
+def _route_for_analysis(
+    event: Dict[str, object],
+    route_pack: RoutePack | None,
+) -> str | RouteGeometry:
+    """Prefer the binary geometry from the route pack when it is current."""
+
+    polyline = event.get("route_polyline") or event.get("polyline") or ""
+    if route_pack is not None and polyline:
+        key = route_pack.events.get(str(event.get("_id", "")))
+        if key and key == route_hash(polyline):
+            return route_pack.get(key) or polyline
+    return polyline
+
+
 def backfill_route_fields(events_path: Path | str = DEFAULT_EVENTS_FILE) -> None:
     path = Path(events_path)
-    events = load_events_for_runtime(path)
+    events, base_version = load_events_for_update(path, runtime=True)
+    base_events = [dict(event) for event in events]
     if not events:
         print(f"No events found in {path}")
         return
@@ -62,6 +84,8 @@ def backfill_route_fields(events_path: Path | str = DEFAULT_EVENTS_FILE) -> None
         elevation = route.get("elevation_gain_meters", 0) or 0
         map_url = route.get("route_map_url") or route.get("map_url") or ""
         polyline = route.get("route_polyline") or route.get("polyline") or ""
+        # Canonicalise on ingest; storage writes only check the format
+        polyline = canonicalize_event_route({"_id": event.get("_id"), "route_polyline": polyline})["route_polyline"]
 
         changes_made = False
         if event.get("distance_meters") != distance:
@@ -83,28 +107,40 @@ def backfill_route_fields(events_path: Path | str = DEFAULT_EVENTS_FILE) -> None
     print(f"Backfilled {successful} of {attempted} Ride with GPS events and saved to {path}")
 
     # Second pass: classify route orientation for closed-loop routes
-    updated = False
+    route_pack = load_route_pack(DEFAULT_ROUTE_PACK_FILE)
     attempted = 0
     successful = 0
     for event in events:
-        polyline = event.get("route_polyline") or event.get("polyline") or ""
+        route = _route_for_analysis(event, route_pack)
         orientation = event.get("route_orientation")
         attempted += 1
-        if not orientation and polyline:
-            _, direction = classify_route_loop(polyline)
+        if not orientation and route:
+            _, direction = classify_route_loop(route)
             if direction:
                 orientation = direction.value
                 successful += 1
         if orientation and event.get("route_orientation") != orientation:
             event["route_orientation"] = orientation
-            changes_made = True
+            updated = True
     print(f"Backfilled {successful} of {attempted} Ride with GPS events and saved to {path}")
 
+    # Third pass: recompute route extents used for map viewport culling, so a
+    # polyline rewritten by the first pass never keeps its old extent
+    extents_changed = 0
+    for event in events:
+        previous = {key: event.get(key) for key in ROUTE_EXTENT_FIELDS}
+        annotate_route_extent(event)
+        if any(event.get(key) != value for key, value in previous.items()):
+            extents_changed += 1
+            updated = True
+    print(f"Updated route extents for {extents_changed} events")
+
     if not updated:
         print("No events required backfilling.")
         return
 
-    save_events_to_storage(events, path)
+    journaled = commit_event_changes(events, base_events, base_version, path)
+    print(f"Journaled {journaled} changed events")
 
 
 if __name__ == "__main__":
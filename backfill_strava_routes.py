@@ -5,6 +5,7 @@ from utils.event_storage import (
     load_events_for_runtime,
     save_events_to_storage,
 )
+from utils.route_utils import canonicalize_event_route
 import os
 import pytz
 import requests
@@ -128,6 +129,7 @@ for event in all_events:
         'raw_event': route_details,
         'is_backfilled': True
     })
+    canonicalize_event_route(event)
 
     backfill_event_count += 1
     updated = True
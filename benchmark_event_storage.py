@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Benchmark event storage backends on a synthetic history.
+
+Real events from storage/events.json are cloned with fresh ids, times and
+groups until the requested count is reached, then each backend is timed on
+the same load-and-filter query the page builders run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.event_codec import (
+    available_json_backends,
+    decode_events,
+    dumps,
+    encode_events,
+    get_json_backend,
+    loads,
+    set_json_backend,
+)
+from utils.event_heavy_store import write_event_index
+from utils.event_index import EventIndex
+from utils.event_schema import apply_event_defaults, validate_events
+from utils.event_model import Event
+from utils.event_partitions import write_partitions
+from utils.event_snapshot_cache import runtime_cache_path_for
+from utils.event_sqlite import import_events
+from utils.html_fragment_cache import FragmentCache
+from utils.event_storage import (
+    DEFAULT_EVENTS_FILE,
+    load_events_for_runtime,
+    load_stored_events,
+    normalize_event_for_runtime,
+)
+from utils.load_html_utils import gen_div_for_events_from_list, gen_gmp_advanced_marker_for_events_from_list
+
+FILTER_GROUP_IDS = {265, 1047313}
+BASE_TIME = datetime(2020, 1, 1)
+SLIM_FIELDS = ("title", "source_group_id", "gps_coordinates", "meet_up_location")
+RENDER_SAMPLE = 2_000
+
+
+def build_synthetic_events(seed_events: List[Dict[str, Any]], count: int) -> List[Dict[str, Any]]:
+    group_ids = sorted(FILTER_GROUP_IDS) + [908336, 1115522, 59884023036, 1157973]
+    events: List[Dict[str, Any]] = []
+    for index in range(count):
+        event = copy.deepcopy(seed_events[index % len(seed_events)])
+        event["_id"] = f"bench-{index}"
+        event["source_group_id"] = {"$numberLong": str(group_ids[index % len(group_ids)])}
+        event_time = BASE_TIME + timedelta(hours=index)
+        event["event_time_utc"] = {"$date": event_time.strftime("%Y-%m-%dT%H:%M:%S.000Z")}
+        event["is_active"] = index % 10 != 0
+        events.append(event)
+    return events
+
+
+def _time_call(label: str, func: Callable[[], Any], repeat: int) -> Any:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    size = len(result) if hasattr(result, "__len__") else result
+    print(f"{label:<40} {best * 1000:>10.1f} ms  ({size} results)")
+    return result
+
+
+def run_storage_benchmarks(events: List[Dict[str, Any]], workdir: Path, repeat: int) -> None:
+    json_path = workdir / "events.json"
+    sqlite_path = workdir / "events.sqlite"
+    json_path.write_text(json.dumps(events, indent=2, ensure_ascii=False), encoding="utf-8")
+    _time_call("sqlite import", lambda: import_events(events, sqlite_path), 1)
+
+    filters = {"active_only": True, "source_group_ids": FILTER_GROUP_IDS}
+    _time_call("json load + filter", lambda: load_events_for_runtime(json_path, cache=False, **filters), repeat)
+    _time_call("sqlite load + filter", lambda: load_events_for_runtime(sqlite_path, **filters), repeat)
+
+    window = {"start": BASE_TIME + timedelta(days=365), "end": BASE_TIME + timedelta(days=395)}
+    _time_call("json load + 30-day window", lambda: load_events_for_runtime(json_path, cache=False, **window), repeat)
+    _time_call("sqlite load + 30-day window", lambda: load_events_for_runtime(sqlite_path, **window), repeat)
+
+    _time_call("write monthly partitions", lambda: write_partitions(events, json_path)["partitions"], 1)
+    _time_call("partitioned json + 30-day window", lambda: load_events_for_runtime(json_path, **window), repeat)
+
+    _time_call("write slim index + heavy store", lambda: write_event_index(events, json_path), 1)
+    _time_call("json full load, no cache", lambda: load_events_for_runtime(json_path, cache=False), repeat)
+    _time_call("slim index, fields= projection", lambda: load_events_for_runtime(json_path, fields=SLIM_FIELDS), repeat)
+    _time_call(
+        "slim index + filter + route_polyline",
+        lambda: load_events_for_runtime(json_path, fields=("route_polyline",), **filters),
+        repeat,
+    )
+
+
+def _cold_start(events_path: Path, cache: bool) -> float:
+    """Seconds for a fresh interpreter to import storage and load every event."""
+
+    script = (
+        "import sys, time; started = time.perf_counter(); "
+        "from utils.event_storage import load_events_for_runtime; "
+        f"load_events_for_runtime(__import__('pathlib').Path({str(events_path)!r}), cache={cache}); "
+        "sys.stdout.write(str(time.perf_counter() - started))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, capture_output=True, text=True, cwd=Path(__file__).parent
+    ).stdout
+    return float(output)
+
+
+def run_startup_benchmarks(events: List[Dict[str, Any]], workdir: Path, repeat: int) -> None:
+    json_path = workdir / "startup" / "events.json"
+    json_path.parent.mkdir()
+    json_path.write_text(json.dumps(events, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    _time_call("full load, json parse", lambda: load_events_for_runtime(json_path, cache=False), repeat)
+    _time_call("full load, build runtime cache", lambda: load_events_for_runtime(json_path), 1)
+    _time_call("full load, runtime cache hit", lambda: load_events_for_runtime(json_path), repeat)
+    print(f"{'runtime cache size':<40} {runtime_cache_path_for(json_path).stat().st_size / 1e6:>10.1f} MB")
+    for label, cache in (("cold start, json parse", False), ("cold start, runtime cache", True)):
+        best = min(_cold_start(json_path, cache) for _ in range(repeat))
+        print(f"{label:<40} {best * 1000:>10.1f} ms")
+
+
+def run_codec_benchmarks(events: List[Dict[str, Any]], repeat: int) -> None:
+    runtime_events = _time_call("decode_events", lambda: decode_events(events), repeat)
+    _time_call("encode_events", lambda: encode_events(runtime_events), repeat)
+    _time_call("validate_events (storage form)", lambda: validate_events(events), repeat)
+    _time_call("validate_events (runtime form)", lambda: validate_events(runtime_events), repeat)
+    selected = get_json_backend()
+    for backend in available_json_backends():
+        set_json_backend(backend)
+        text = _time_call(f"dumps ({backend})", lambda: dumps(events), repeat)
+        _time_call(f"loads ({backend})", lambda: loads(text), repeat)
+    set_json_backend(selected)
+
+
+def run_query_benchmarks(events: List[Dict[str, Any]], repeat: int) -> None:
+    runtime_events = [normalize_event_for_runtime(event) for event in events]
+    window = (BASE_TIME + timedelta(days=365), BASE_TIME + timedelta(days=395))
+    index = _time_call("build EventIndex", lambda: EventIndex(runtime_events), 1)
+
+    def linear_scan() -> List[Dict[str, Any]]:
+        return [
+            event
+            for event in runtime_events
+            if window[0] <= event["event_time_utc"] < window[1] and event["source_group_id"] in FILTER_GROUP_IDS
+        ]
+
+    _time_call("linear scan, window + groups", linear_scan, repeat)
+    _time_call("EventIndex.query, window + groups", lambda: index.query(time_range=window, group_ids=FILTER_GROUP_IDS), repeat)
+    _time_call("EventIndex.query, groups", lambda: index.query(group_ids=FILTER_GROUP_IDS), repeat)
+
+
+def _measure_memory(label: str, build: Callable[[], List[Any]]) -> List[Any]:
+    tracemalloc.start()
+    built = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {allocated / max(len(built), 1):>10.0f} B/event")
+    return built
+
+
+def _render(events: List[Any]) -> int:
+    html = gen_div_for_events_from_list(events, "past", FragmentCache())
+    markers = gen_gmp_advanced_marker_for_events_from_list(events, "past")
+    return len(html) + len(markers)
+
+
+def run_model_benchmarks(events: List[Dict[str, Any]], repeat: int) -> None:
+    dicts = _measure_memory("runtime dicts", lambda: [normalize_event_for_runtime(event) for event in events])
+    models = _measure_memory("Event models", lambda: [Event.from_storage(event) for event in events])
+
+    sample = [index for index, event in enumerate(dicts) if "description" in event][:RENDER_SAMPLE]
+    _time_call("render dicts", lambda: _render([dicts[index] for index in sample]), repeat)
+    _time_call("render Event models", lambda: _render([models[index] for index in sample]), repeat)
+
+
+def run_render_benchmarks(events: List[Dict[str, Any]], repeat: int, workers: int) -> None:
+    runtime_events = [apply_event_defaults(event) for event in decode_events(events[:RENDER_SAMPLE])]
+    _time_call("render page, cold fragment cache", lambda: _render_page(runtime_events, FragmentCache()), repeat)
+    if workers > 1:
+        _time_call(
+            f"render page, cold cache, {workers} workers",
+            lambda: _render_page(runtime_events, FragmentCache(), workers),
+            repeat,
+        )
+    warm = FragmentCache()
+    _render_page(runtime_events, warm)
+    _time_call("render page, warm fragment cache", lambda: _render_page(runtime_events, warm), repeat)
+
+    def render_with_one_change() -> int:
+        edited = list(runtime_events)
+        edited[0] = dict(edited[0], title=f"{edited[0].get('title', '')} (edited {time.perf_counter_ns()})")
+        return _render_page(edited, warm)
+
+    _time_call("render page, one event changed", render_with_one_change, repeat)
+
+
+def _render_page(events: List[Dict[str, Any]], cache: FragmentCache, workers: Optional[int] = None) -> int:
+    return len(gen_div_for_events_from_list(events, "past", cache, workers=workers))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark event storage backends.")
+    parser.add_argument("--count", type=int, default=100_000, help="Number of synthetic events (default: 100000).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement; the best is reported.")
+    parser.add_argument(
+        "--events-file",
+        type=Path,
+        default=DEFAULT_EVENTS_FILE,
+        help="Seed events (defaults to storage/events.json).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes for the parallel render benchmark (default: CPU count).",
+    )
+    args = parser.parse_args()
+
+    seed_events = load_stored_events(args.events_file)
+    if not seed_events:
+        print(f"No seed events found in {args.events_file}")
+        return
+
+    events = build_synthetic_events(seed_events, args.count)
+    print(f"Benchmarking {len(events)} synthetic events (best of {args.repeat})")
+    with tempfile.TemporaryDirectory() as tmp:
+        run_storage_benchmarks(events, Path(tmp), args.repeat)
+        run_startup_benchmarks(events, Path(tmp), args.repeat)
+    run_codec_benchmarks(events, args.repeat)
+    run_query_benchmarks(events, args.repeat)
+    run_model_benchmarks(events, args.repeat)
+    run_render_benchmarks(events, args.repeat, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Rebuild the static HTML pages whose inputs changed.
+
+Usage: python build_site.py [artifact ...] [--force] [--dry-run] [--workers N]
+
+Input hashes (events, templates, styles, renderer code) are recorded per
+output in storage/build_manifest.json; pages whose inputs are unchanged are
+left alone. Every artifact is reported as rebuilt (with the reason) or up to
+date.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from utils.site_builder import build_site, default_artifacts, print_build_report
+
+
+def main() -> None:
+    artifacts = default_artifacts()
+    names = [artifact.name for artifact in artifacts]
+    parser = argparse.ArgumentParser(description="Incrementally rebuild the static HTML pages.")
+    parser.add_argument("artifacts", nargs="*", metavar="artifact", help=f"Artifacts to build (default: all of {', '.join(names)}).")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the recorded inputs are unchanged.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be rebuilt.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for rendering event cards and pages (default: render serially).",
+    )
+    args = parser.parse_args()
+
+    unknown = sorted(set(args.artifacts) - set(names))
+    if unknown:
+        parser.error(f"unknown artifact(s) {', '.join(unknown)}; choose from {', '.join(names)}")
+    if args.artifacts:
+        artifacts = [artifact for artifact in artifacts if artifact.name in args.artifacts]
+    started = time.perf_counter()
+    results = build_site(artifacts, force=args.force, dry_run=args.dry_run, workers=args.workers)
+    print_build_report(results, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    main()
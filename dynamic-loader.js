@@ -10,6 +10,12 @@
         REMOTE_EVENTS_SOURCE,
         LOCAL_EVENTS_JSON_SOURCE
     ];
+    const REMOTE_ARCHIVE_INDEX_SOURCE = 'https://raw.githubusercontent.com/shohoku11wrj/haoqiyou/main/storage/archive/index.json';
+    const LOCAL_ARCHIVE_INDEX_SOURCE = new URL('storage/archive/index.json', BASE_URL).href;
+    const REMOTE_ROUTE_INDEX_SOURCE = 'https://raw.githubusercontent.com/shohoku11wrj/haoqiyou/main/storage/route_index.json';
+    const LOCAL_ROUTE_INDEX_SOURCE = new URL('storage/route_index.json', BASE_URL).href;
+    const REMOTE_REGIONS_SOURCE = 'https://raw.githubusercontent.com/shohoku11wrj/haoqiyou/main/storage/regions.json';
+    const LOCAL_REGIONS_SOURCE = new URL('storage/regions.json', BASE_URL).href;
     const EXTRA_EVENT_GROUP_IDS = new Set([265, 908336, 1047313]);
     const EXTRA_EVENT_GROUP_NAMES = new Set(['altovelo-a-ride']);
     const DAY_OF_WEEK_MAP = {
@@ -22,19 +28,22 @@
         Sunday: '周日'
     };
     const TIME_ZONE = 'America/Los_Angeles';
-    const GPS_OVERLAP_TOLERANCE = 0.03;
     const DAY_IN_MS = 24 * 60 * 60 * 1000;
-    const GPS_SHIFTS = [
-        [0, 0],
-        [0, -GPS_OVERLAP_TOLERANCE],
-        [GPS_OVERLAP_TOLERANCE, 0],
-        [0, GPS_OVERLAP_TOLERANCE],
-        [-GPS_OVERLAP_TOLERANCE, 0],
-        [GPS_OVERLAP_TOLERANCE, -GPS_OVERLAP_TOLERANCE],
-        [GPS_OVERLAP_TOLERANCE, GPS_OVERLAP_TOLERANCE],
-        [-GPS_OVERLAP_TOLERANCE, GPS_OVERLAP_TOLERANCE],
-        [-GPS_OVERLAP_TOLERANCE, -GPS_OVERLAP_TOLERANCE]
-    ];
+    // Past events older than the head, as fetched from storage/archive/index.json.
+    const archive = {
+        baseUrl: null,
+        chunks: [],
+        // events.json by hash, for the fallback when the archive files fail.
+        events: null,
+        loading: null,
+        observer: null
+    };
+    let pendingEventHandled = false;
+    // Display name by region code; events carry the code assigned at ingest.
+    let regionNames = {};
+    // storage/routes next to the loaded data; summaries name their route by hash.
+    let routeBaseUrl = null;
+    const routeFiles = new Map();
 
     document.addEventListener('DOMContentLoaded', () => {
         loadEvents();
@@ -51,15 +60,178 @@
             return;
         }
 
-        fetchRemoteEvents()
-            .then(processEvents)
+        loadArchivedEvents().catch((error) => {
+            console.warn('Event archive load failed, loading all events instead.', error);
+            loadRegionNames()
+                .then(fetchRemoteEvents)
+                .then(processEvents)
+                .catch((fetchError) => {
+                    console.error('Remote events fetch failed, attempting local fallback.', fetchError);
+                    loadLocalEvents();
+                });
+        });
+    }
+
+    // First paint only needs the head (upcoming, planning and the last two
+    // months of past events); older events come in chunks, newest first, as
+    // the list is scrolled.
+    async function loadArchivedEvents() {
+        let lastError = null;
+        for (const source of [REMOTE_ARCHIVE_INDEX_SOURCE, LOCAL_ARCHIVE_INDEX_SOURCE]) {
+            try {
+                const response = await fetch(withCacheBuster(source), { cache: 'no-store' });
+                if (!response.ok) {
+                    throw new Error(`Failed to load event archive index from ${source}: ${response.status}`);
+                }
+                const index = await response.json();
+                archive.baseUrl = new URL('.', source).href;
+                archive.events = index.events || null;
+                routeBaseUrl = new URL('../routes/', source).href;
+                regionNames = index.regions || {};
+                const [head, clusters] = await Promise.all([
+                    fetchArchiveFile(index.head),
+                    index.clusters ? fetchArchiveFile(index.clusters).catch(() => null) : null
+                ]);
+                // Multi-zoom marker clusters over every event, for map_scriptrs.js
+                window.markerClusters = clusters;
+                archive.chunks = (index.chunks || []).slice().reverse();
+                processEvents(head);
+                attachArchiveLoaders();
+                return;
+            } catch (error) {
+                console.warn(`Event archive load failed for ${source}`, error);
+                lastError = error;
+            }
+        }
+        throw lastError;
+    }
+
+    function fetchArchiveFile(entry) {
+        // Chunk names are stable and their hash changes with their content.
+        const url = new URL(entry.file, archive.baseUrl);
+        url.searchParams.set('v', String(entry.sha256 || '').slice(0, 12));
+        return fetch(url.href).then((response) => {
+            if (!response.ok) {
+                throw new Error(`Failed to load ${entry.file}: ${response.status}`);
+            }
+            return response.json();
+        });
+    }
+
+    function loadNextArchiveChunk() {
+        if (archive.loading) {
+            return archive.loading;
+        }
+        const entry = archive.chunks[0];
+        if (!entry) {
+            return Promise.resolve(false);
+        }
+        archive.loading = fetchArchiveFile(entry)
+            .then((rawEvents) => {
+                archive.chunks.shift();
+                appendPastEvents(rawEvents);
+                return true;
+            })
             .catch((error) => {
-                console.error('Remote events fetch failed, attempting local fallback.', error);
-                loadLocalEvents();
+                console.error(`Failed to load archived events from ${entry.file}`, error);
+                return false;
+            })
+            .finally(() => {
+                archive.loading = null;
+                updateArchiveSentinel();
             });
+        return archive.loading;
+    }
+
+    async function loadAllArchiveChunks() {
+        while (archive.chunks.length > 0 && await loadNextArchiveChunk()) {
+            // Keep going until every chunk is in.
+        }
+    }
+
+    // The map shows the last two months of past events by default, so those
+    // chunks are fetched right after the first paint.
+    function attachArchiveLoaders() {
+        const toggleOldPastMapEvents = document.getElementById('toggleOldPastMapEvents');
+        if (toggleOldPastMapEvents && toggleOldPastMapEvents.dataset.archiveLoaderAttached !== 'true') {
+            toggleOldPastMapEvents.addEventListener('change', () => {
+                if (toggleOldPastMapEvents.checked) {
+                    loadAllArchiveChunks();
+                }
+            });
+            toggleOldPastMapEvents.dataset.archiveLoaderAttached = 'true';
+        }
+
+        const pendingEventId = new URLSearchParams(window.location.search).get('id');
+        if (pendingEventId && !document.querySelector(`[data-event-id="${pendingEventId}"]`)) {
+            // A shared link to an older event: keep loading until it shows up.
+            loadAllArchiveChunks();
+        } else if (toggleOldPastMapEvents && toggleOldPastMapEvents.checked) {
+            loadAllArchiveChunks();
+        }
+        updateArchiveSentinel();
+    }
+
+    function updateArchiveSentinel() {
+        const sentinel = document.getElementById('archive-sentinel');
+        if (!sentinel) {
+            return;
+        }
+        if (archive.chunks.length === 0) {
+            if (archive.observer) {
+                archive.observer.disconnect();
+            }
+            sentinel.remove();
+            return;
+        }
+        sentinel.hidden = false;
+        if (!archive.observer && 'IntersectionObserver' in window) {
+            archive.observer = new IntersectionObserver((entries) => {
+                if (entries.some((entry) => entry.isIntersecting)) {
+                    loadNextArchiveChunk();
+                }
+            }, { rootMargin: '600px 0px' });
+            archive.observer.observe(sentinel);
+        } else if (!archive.observer) {
+            sentinel.onclick = loadNextArchiveChunk;
+        } else if (!archive.loading) {
+            // Re-observe so a sentinel still in view after a chunk triggers the next one.
+            archive.observer.unobserve(sentinel);
+            archive.observer.observe(sentinel);
+        }
+    }
+
+    function appendPastEvents(rawEvents) {
+        const pastContainer = document.querySelector('.events-container[data-event-type="past"]');
+        if (!pastContainer) {
+            return;
+        }
+        const events = rawEvents
+            .map(normalizeEvent)
+            .filter((event) => event && event.is_active && event.event_time_utc)
+            .sort((a, b) => b.event_time_utc - a.event_time_utc);
+        const htmlParts = [];
+        const markers = [];
+        for (const event of events) {
+            const parts = prepareEventParts(event, 'past');
+            if (parts.marker) {
+                markers.push(parts.marker);
+            }
+            htmlParts.push(parts.html);
+        }
+        pastContainer.insertAdjacentHTML('beforeend', htmlParts.join('\n'));
+        window.events = (window.events || []).concat(markers);
+        if (typeof initMap === 'function') {
+            initMap();
+        }
+        hydrateNewContent();
     }
 
     function fetchRemoteEvents() {
+        // Cacheable when the archive index named its hash; uncached otherwise.
+        if (archive.events && archive.baseUrl) {
+            return fetchArchiveFile(archive.events);
+        }
         const url = withCacheBuster(REMOTE_EVENTS_SOURCE);
         return fetch(url, { cache: 'no-store' }).then((response) => {
             if (!response.ok) {
@@ -140,6 +312,63 @@
         });
     }
 
+    // The archive index carries the region names; the fallback paths read
+    // them from storage/regions.json and show no area label without it.
+    async function loadRegionNames() {
+        for (const source of [REMOTE_REGIONS_SOURCE, LOCAL_REGIONS_SOURCE]) {
+            try {
+                const response = await fetch(withCacheBuster(source), { cache: 'no-store' });
+                if (!response.ok) {
+                    throw new Error(`Failed to load regions from ${source}: ${response.status}`);
+                }
+                const data = await response.json();
+                regionNames = Object.fromEntries((data.regions || []).map((region) => [region.code, region.name]));
+                return;
+            } catch (error) {
+                console.warn(`Region names fetch failed for ${source}`, error);
+            }
+        }
+    }
+
+    // Fills an event's hidden polyline element from storage/routes/<hash>.txt
+    // the first time its route is drawn; route files never change, so they
+    // are fetched without a cache-buster and shared by events on one route.
+    function ensureRoutePolyline(eventId) {
+        const element = document.querySelector(`[data-event-id="${eventId}-route-polyline"]`);
+        if (!element) {
+            return Promise.resolve(false);
+        }
+        if (element.textContent.trim()) {
+            return Promise.resolve(true);
+        }
+        const hash = element.dataset.routeHash;
+        if (!hash || !routeBaseUrl) {
+            return Promise.resolve(false);
+        }
+        if (!routeFiles.has(hash)) {
+            const request = fetch(new URL(`${hash}.txt`, routeBaseUrl).href)
+                .then((response) => (response.ok ? response.text() : ''))
+                .catch((error) => {
+                    console.warn(`Failed to load route ${hash}`, error);
+                    return '';
+                })
+                .then((polyline) => {
+                    if (!polyline) {
+                        routeFiles.delete(hash);
+                    }
+                    return polyline.trim();
+                });
+            routeFiles.set(hash, request);
+        }
+        return routeFiles.get(hash).then((polyline) => {
+            document.querySelectorAll(`[data-event-id="${eventId}-route-polyline"]`).forEach((target) => {
+                target.textContent = polyline;
+            });
+            return Boolean(polyline);
+        });
+    }
+    window.ensureRoutePolyline = ensureRoutePolyline;
+
     function withCacheBuster(source) {
         const joiner = source.includes('?') ? '&' : '?';
         return `${source}${joiner}ts=${Date.now()}`;
@@ -151,6 +380,32 @@
             .filter((event) => event && event.is_active && event.event_time_utc);
         const categorized = categorizeEvents(normalized);
         renderEventLists(categorized);
+        loadRouteIndex();
+    }
+
+    async function loadRouteIndex() {
+        if (window.LOCAL_ROUTE_INDEX && window.LOCAL_ROUTE_INDEX.cells) {
+            window.routeIndex = window.LOCAL_ROUTE_INDEX;
+        } else {
+            const sources = window.location.protocol === 'file:'
+                ? []
+                : [REMOTE_ROUTE_INDEX_SOURCE, LOCAL_ROUTE_INDEX_SOURCE];
+            for (const source of sources) {
+                try {
+                    const response = await fetch(withCacheBuster(source), { cache: 'no-store' });
+                    if (!response.ok) {
+                        throw new Error(`Failed to load route index from ${source}: ${response.status}`);
+                    }
+                    window.routeIndex = await response.json();
+                    break;
+                } catch (error) {
+                    console.warn(`Route index fetch failed for ${source}`, error);
+                }
+            }
+        }
+        if (typeof prefetchVisibleRoutes === 'function') {
+            prefetchVisibleRoutes();
+        }
     }
 
 
@@ -173,6 +428,7 @@
         event.description = raw.description || '';
         event.route_map_url = raw.route_map_url || '';
         event.route_polyline = raw.route_polyline || '';
+        event.route_hash = raw.route_hash || '';
         event.event_picture_url = raw.event_picture_url || '';
         event.event_picture_urls = Array.isArray(raw.event_picture_urls) ? raw.event_picture_urls.filter(Boolean) : [];
         event.source_url = raw.source_url || '';
@@ -288,7 +544,7 @@
         for (const section of sections) {
             const events = categories[section.type] || [];
             htmlParts.push(`        <h2>${section.title}</h2>`);
-            htmlParts.push('        <div class="events-container">');
+            htmlParts.push(`        <div class="events-container" data-event-type="${section.type}">`);
             for (const event of events) {
                 const parts = prepareEventParts(event, section.type);
                 if (parts.marker) {
@@ -298,9 +554,9 @@
             }
             htmlParts.push('        </div>');
         }
+        htmlParts.push('        <div id="archive-sentinel" class="loading-indicator" hidden>更早的活动加载中...</div>');
 
         listContainer.innerHTML = htmlParts.join('\n');
-        assignMarkerShifts(markerBuckets);
         window.events = markerBuckets.slice();
         if (typeof initMap === 'function') {
             initMap();
@@ -317,7 +573,7 @@
         const distanceStr = formatDistance(event.distance_meters);
         const elevationStr = formatElevation(event.elevation_gain_meters);
         const orientationStr = formatRouteOrientation(event.route_orientation || '');
-        const eventArea = deriveEventArea(gpsCoordinatesStr);
+        const eventArea = regionNames[event.region_code] || '';
         const routeUrl = resolveRouteUrl(event);
         const sourceEventUrl = resolveSourceEventUrl(event, routeUrl);
         const sourceGroupName = resolveSourceGroupName(event);
@@ -386,7 +642,7 @@ ${distanceBlock}${elevationBlock}${orientationBlock}${expectedBlock}${actualBloc
             </div>
             <div class="${routeSectionClass}">
                 ${event.route_map_url ? (routeUrl ? `<a href="${escapeAttribute(routeUrl)}" target="_blank" class="event-link">\n                    <img src="${escapeAttribute(event.route_map_url)}" alt="Route Image" width="100%">\n                </a>` : `<img src="${escapeAttribute(event.route_map_url)}" alt="Route Image" width="100%">`) : ''}
-                <div data-event-id="${eventId}-route-polyline" style="display: none;">${event.route_polyline || ''}</div>
+                <div data-event-id="${eventId}-route-polyline" data-route-hash="${escapeAttribute(event.route_hash)}" style="display: none;">${event.route_polyline || ''}</div>
             </div>
             <div class="event-section">
                 <div class="event-title">${escapeHtml(event.title)}</div> <br>
@@ -573,24 +829,6 @@ ${locationBlock}${distanceBlock}${elevationBlock}${orientationBlock}${expectedBl
         return normalizeText(event.gps_coordinates);
     }
 
-    function deriveEventArea(gpsCoordinatesStr) {
-        if (!gpsCoordinatesStr) {
-            return '';
-        }
-        const parts = gpsCoordinatesStr.split(',').map((value) => Number(value.trim()));
-        if (parts.length !== 2 || parts.some((value) => Number.isNaN(value))) {
-            return '';
-        }
-        const [lat, lng] = parts;
-        if (lat >= 35 && lat <= 40 && lng >= -123.3 && lng <= -119.5) {
-            return '北加';
-        }
-        if (lat >= 32 && lat <= 35 && lng >= -120 && lng <= -114) {
-            return '南加';
-        }
-        return '';
-    }
-
     function resolveRouteUrl(event) {
         if (event.route_url) {
             return event.route_url;
@@ -693,13 +931,13 @@ ${locationBlock}${distanceBlock}${elevationBlock}${orientationBlock}${expectedBl
             title: `${timeParts.monthStr} ${timeParts.dayStr}: ${event.title}`,
             date_span: { month: timeParts.monthStr, day: timeParts.dayStr },
             position: { lat, lng },
-            shift: [0, 0],
             id: `event-${event._id}`,
             icon_url: iconMap[eventType] || 'https://maps.google.com/mapfiles/ms/icons/red-dot.png',
             event_time_type: eventType,
             event_time_utc: event.event_time_utc.toISOString(),
             past_marker_bucket: eventType === 'past' ? getPastMarkerBucket(event.event_time_utc) : '',
-            is_extra_event: isExtraEvent(event)
+            is_extra_event: isExtraEvent(event),
+            route_bbox: Array.isArray(event.route_bbox) ? event.route_bbox : null
         };
         return marker;
     }
@@ -728,27 +966,6 @@ ${locationBlock}${distanceBlock}${elevationBlock}${orientationBlock}${expectedBl
         return 'past-181-plus';
     }
 
-    function assignMarkerShifts(markers) {
-        const groups = [];
-        markers
-            .filter(Boolean)
-            .forEach((marker) => {
-                const { lat, lng } = marker.position;
-                let group = groups.find((item) => Math.abs(item.lat - lat) < GPS_OVERLAP_TOLERANCE && Math.abs(item.lng - lng) < GPS_OVERLAP_TOLERANCE);
-                if (!group) {
-                    group = { lat, lng, markers: [] };
-                    groups.push(group);
-                }
-                group.markers.push(marker);
-            });
-        groups.forEach((group) => {
-            group.markers.forEach((marker, index) => {
-                const shift = GPS_SHIFTS[index % GPS_SHIFTS.length];
-                marker.shift = shift;
-            });
-        });
-    }
-
     function hydrateNewContent() {
         if (typeof loadRelateiveDateForEvents === 'function') {
             loadRelateiveDateForEvents();
@@ -770,17 +987,25 @@ ${locationBlock}${distanceBlock}${elevationBlock}${orientationBlock}${expectedBl
                 return;
             }
             const eventId = eventElement.getAttribute('data-event-id');
-            const routePolyline = typeof getRoutePolyline === 'function' ? getRoutePolyline(eventId) : null;
-            if (routePolyline) {
+            const polylineElement = document.querySelector(`[data-event-id="${eventId}-route-polyline"]`);
+            if (polylineElement && (polylineElement.textContent.trim() || polylineElement.dataset.routeHash)
+                && typeof withRoutePolyline === 'function') {
+                let routePolyline = null;
+                let hovered = false;
                 eventElement.addEventListener('mouseenter', () => {
-                    const mapInstance = window.map;
-                    if (mapInstance) {
-                        routePolyline.addTo(mapInstance);
-                    }
+                    hovered = true;
+                    withRoutePolyline(eventId, (polyline) => {
+                        routePolyline = routePolyline || polyline;
+                        const mapInstance = window.map;
+                        if (hovered && mapInstance) {
+                            routePolyline.addTo(mapInstance);
+                        }
+                    });
                 });
                 eventElement.addEventListener('mouseleave', () => {
+                    hovered = false;
                     const mapInstance = window.map;
-                    if (mapInstance && mapInstance.hasLayer(routePolyline)) {
+                    if (routePolyline && mapInstance && mapInstance.hasLayer(routePolyline)) {
                         mapInstance.removeLayer(routePolyline);
                     }
                 });
@@ -810,10 +1035,11 @@ ${locationBlock}${distanceBlock}${elevationBlock}${orientationBlock}${expectedBl
 
         const urlParams = new URLSearchParams(window.location.search);
         const pendingEventId = urlParams.get('id');
-        if (pendingEventId) {
+        if (pendingEventId && !pendingEventHandled) {
             const target = document.querySelector(`[data-event-id="${pendingEventId}"]`);
             if (target && typeof showEventDetailPopup === 'function') {
                 showEventDetailPopup(target);
+                pendingEventHandled = true;
             }
         }
     }
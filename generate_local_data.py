@@ -1,27 +1,46 @@
-import json
-from pathlib import Path
+import argparse
 
-BASE_DIR = Path(__file__).resolve().parent
-EVENTS_JSON_PATH = BASE_DIR / "storage" / "events.json"
-EVENTS_JS_PATH = BASE_DIR / "storage" / "events.js"
+from utils.event_bundle import (
+    DEFAULT_EVENTS_JS_FILE,
+    DEFAULT_ROUTE_INDEX_FILE,
+    read_bundle_version,
+    write_local_events_bundle,
+)
+from utils.event_changes import changes_since
+from utils.event_storage import DEFAULT_EVENTS_FILE, compact_events_storage, read_storage_version
 
-# To refresh local events.js, run this script:
-# python generate_local_data.py
+EVENTS_JSON_PATH = DEFAULT_EVENTS_FILE
+EVENTS_JS_PATH = DEFAULT_EVENTS_JS_FILE
+ROUTE_INDEX_PATH = DEFAULT_ROUTE_INDEX_FILE
+
+# To compact the events journal and refresh local events.js, run this script:
+# python generate_local_data.py [--force]
 def main():
+    parser = argparse.ArgumentParser(description="Compact the events journal and refresh storage/events.js.")
+    parser.add_argument("--force", action="store_true", help="Rebuild events.js even if it is already current.")
+    args = parser.parse_args()
+
     if not EVENTS_JSON_PATH.exists():
         print(f"Error: {EVENTS_JSON_PATH} not found.")
         return
 
     try:
-        with open(EVENTS_JSON_PATH, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        
-        js_content = f"window.LOCAL_EVENTS_DATA = {json.dumps(data, ensure_ascii=False, indent=2)};"
-        
-        with open(EVENTS_JS_PATH, "w", encoding="utf-8") as f:
-            f.write(js_content)
-            
+        total = compact_events_storage(EVENTS_JSON_PATH)
+        print(f"Compacted journal into {EVENTS_JSON_PATH} ({total} events)")
+        version = read_storage_version(EVENTS_JSON_PATH)
+        bundle_version = read_bundle_version(EVENTS_JS_PATH)
+        if bundle_version == version and not args.force:
+            print(f"{EVENTS_JS_PATH} is already at storage version {version}; nothing to do")
+            return
+        changes = changes_since(EVENTS_JSON_PATH, bundle_version, version) if bundle_version is not None else None
+        if changes is not None:
+            print(
+                f"Storage version {bundle_version} -> {version}: {len(changes['added'])} added, "
+                f"{len(changes['updated'])} updated, {len(changes['removed'])} removed"
+            )
+        route_index = write_local_events_bundle(EVENTS_JSON_PATH, EVENTS_JS_PATH, ROUTE_INDEX_PATH)
         print(f"Successfully generated {EVENTS_JS_PATH}")
+        print(f"Indexed routes into {len(route_index['cells'])} grid cells at {ROUTE_INDEX_PATH}")
     except Exception as e:
         print(f"Error generating events.js: {e}")
 
@@ -57,6 +57,89 @@ function getRoutePolylin(event_id) {
   return null;
 }
 
+const routePolylineCache = new Map();
+
+function getCachedRoutePolyline(eventId) {
+    if (!routePolylineCache.has(eventId)) {
+        var routePolyline = getRoutePolylin(eventId);
+        if (!routePolyline) {
+            // Not cached: the route may still be fetched (see whenRoutePolylineReady)
+            return null;
+        }
+        routePolylineCache.set(eventId, routePolyline);
+    }
+    return routePolylineCache.get(eventId);
+}
+
+// Summary bundles leave polylines out; dynamic-loader.js fetches a route
+// the first time it is drawn.
+function whenRoutePolylineReady(eventId, callback) {
+    var routePolyline = getCachedRoutePolyline(eventId);
+    if (routePolyline) {
+        callback(routePolyline);
+    } else if (typeof window.ensureRoutePolyline === 'function') {
+        window.ensureRoutePolyline(eventId).then(function(found) {
+            if (found) {
+                callback(getCachedRoutePolyline(eventId));
+            }
+        });
+    }
+}
+
+function bboxIntersectsBounds(bbox, bounds) {
+    const [minLat, minLng, maxLat, maxLng] = bbox;
+    return !(maxLat < bounds.getSouth() || minLat > bounds.getNorth()
+        || maxLng < bounds.getWest() || minLng > bounds.getEast());
+}
+
+// Look up the routes crossing the viewport from the precomputed grid index
+// (or the per-marker route_bbox), so no polyline is decoded just to cull.
+function getRouteIdsInBounds(bounds) {
+    const ids = new Set();
+    const routeIndex = window.routeIndex;
+    if (routeIndex && routeIndex.cells && routeIndex.cell_degrees) {
+        const size = routeIndex.cell_degrees;
+        const minRow = Math.floor(bounds.getSouth() / size);
+        const maxRow = Math.floor(bounds.getNorth() / size);
+        const minCol = Math.floor(bounds.getWest() / size);
+        const maxCol = Math.floor(bounds.getEast() / size);
+        const cellKeys = Object.keys(routeIndex.cells);
+        if ((maxRow - minRow + 1) * (maxCol - minCol + 1) > cellKeys.length) {
+            cellKeys.forEach(function(key) {
+                const [row, col] = key.split(',').map(Number);
+                if (row >= minRow && row <= maxRow && col >= minCol && col <= maxCol) {
+                    routeIndex.cells[key].forEach(function(id) { ids.add(id); });
+                }
+            });
+        } else {
+            for (let row = minRow; row <= maxRow; row++) {
+                for (let col = minCol; col <= maxCol; col++) {
+                    (routeIndex.cells[`${row},${col}`] || []).forEach(function(id) { ids.add(id); });
+                }
+            }
+        }
+        return ids;
+    }
+    (window.events || []).forEach(function(event) {
+        if (event && event.route_bbox && bboxIntersectsBounds(event.route_bbox, bounds)) {
+            ids.add(event.id);
+        }
+    });
+    return ids;
+}
+
+// Only fetches the route text of the visible routes; a polyline is decoded
+// when its route is drawn (whenRoutePolylineReady). Pages that embed the
+// polylines have nothing to prefetch.
+function prefetchVisibleRoutes() {
+    if (!window.map || typeof window.ensureRoutePolyline !== 'function') {
+        return;
+    }
+    getRouteIdsInBounds(window.map.getBounds()).forEach(function(eventId) {
+        window.ensureRoutePolyline(eventId);
+    });
+}
+
 function buildMarkerIconHtml(event) {
     const iconUrl = event.icon_url;
     const markerBucket = event.past_marker_bucket || '';
@@ -171,43 +254,154 @@ function getMarkerPosition(event) {
     return { lat, lng };
 }
 
-function assignVisibleMarkerShifts(visibleEvents) {
-    const tolerance = 0.03;
-    const shifts = [
-        [0, 0],
-        [0, -tolerance],
-        [tolerance, 0],
-        [0, tolerance],
-        [-tolerance, 0],
-        [tolerance, -tolerance],
-        [tolerance, tolerance],
-        [-tolerance, tolerance],
-        [-tolerance, -tolerance]
-    ];
-    const groups = [];
+// Cluster row that shows a marker at this zoom in the build-time cluster index
+// (utils/marker_clusters.py), or -1 when the marker is shown on its own.
+function getMarkerClusterAtZoom(index, markerId, zoom, memo) {
+    const clusters = index.clusters;
+    const innermost = index.points[markerId];
+    if (innermost === undefined || innermost < 0 || clusters[innermost][0] < zoom) {
+        return -1;
+    }
+    if (memo.has(innermost)) {
+        return memo.get(innermost);
+    }
+    let row = innermost;
+    while (clusters[row][4] >= 0 && clusters[clusters[row][4]][0] >= zoom) {
+        row = clusters[row][4];
+    }
+    memo.set(innermost, row);
+    return row;
+}
 
+// Group the visible markers by the cluster representing them at the current
+// zoom; a group of one is drawn as its own pin at its exact position.
+function groupVisibleMarkers(visibleEvents) {
+    const index = window.markerClusters;
+    if (!index || !index.clusters || !window.map) {
+        return visibleEvents.map(function(event) { return { row: -1, events: [event] }; });
+    }
+    const zoom = Math.min(Math.floor(window.map.getZoom()), index.max_zoom);
+    const memo = new Map();
+    const groupsByRow = new Map();
+    const groups = [];
     visibleEvents.forEach(function(event) {
-        const position = getMarkerPosition(event);
-        if (!position) {
-            event.visibleShift = [0, 0];
+        const row = getMarkerClusterAtZoom(index, event.id, zoom, memo);
+        if (row < 0) {
+            groups.push({ row: -1, events: [event] });
             return;
         }
-
-        let group = groups.find(function(item) {
-            return Math.abs(item.lat - position.lat) < tolerance && Math.abs(item.lng - position.lng) < tolerance;
-        });
+        let group = groupsByRow.get(row);
         if (!group) {
-            group = { lat: position.lat, lng: position.lng, events: [] };
+            group = { row: row, events: [] };
+            groupsByRow.set(row, group);
             groups.push(group);
         }
         group.events.push(event);
     });
+    return groups;
+}
+
+function showMarkerEventPopup(event) {
+    const eventDetails = document.getElementById(event.id).innerHTML;
+    document.getElementById('popup-content').innerHTML = eventDetails;
+    document.getElementById('popup-overlay').style.display = 'block';
+    document.getElementById('popup').style.display = 'block';
+    whenRoutePolylineReady(event.id, function() {
+        // Remove existing polyline if there is one
+        if (currentPolyline) {
+            map.removeLayer(currentPolyline);
+        }
+        currentPolyline = getRoutePolylin(event.id);
+        currentPolyline.addTo(map);
+    });
+    // Update the URL
+    history.pushState(null, '', `?id=${event.id}`);
+}
 
-    groups.forEach(function(group) {
-        group.events.forEach(function(event, index) {
-            event.visibleShift = shifts[index % shifts.length];
+function addEventMarker(event) {
+    var customIcon = L.divIcon({
+        className: 'custom-div-icon',
+        html: buildMarkerIconHtml(event),
+        iconSize: [32, 32], // Size of the icon
+        iconAnchor: [16, event.event_time_type === 'upcoming' ? 32 : 30], // Point of the icon which will correspond to marker's location
+        popupAnchor: [0, 0] // Point from which the popup should open relative to the iconAnchor
+    });
+    var marker = L.marker([event.position.lat, event.position.lng], { icon: customIcon }).addTo(window.eventMapLayerGroup);
+    var hovered = false;
+    marker.on('mouseover', function() {
+        hovered = true;
+        whenRoutePolylineReady(event.id, function(routePolyline) {
+            if (!hovered) {
+                return;
+            }
+            window.currentHoveredRoutePolyline = routePolyline;
+            routePolyline.addTo(map);
         });
     });
+    marker.on('mouseout', function() {
+        hovered = false;
+        var routePolyline = getCachedRoutePolyline(event.id);
+        if (!routePolyline) {
+            return;
+        }
+        if (map.hasLayer(routePolyline)) {
+            map.removeLayer(routePolyline);
+        }
+        if (window.currentHoveredRoutePolyline === routePolyline) {
+            window.currentHoveredRoutePolyline = null;
+        }
+    });
+    marker.bindTooltip(event.title, { className: 'custom-tooltip' });  //.openTooltip(); // by default, the tooltip is open
+    marker.on('click', function() {
+        showMarkerEventPopup(event);
+    });
+}
+
+function escapeMarkerText(value) {
+    return String(value || '').replace(/[&<>"']/g, function(char) {
+        return '&#' + char.charCodeAt(0) + ';';
+    });
+}
+
+function addClusterMarker(group) {
+    const index = window.markerClusters;
+    const [clusterZoom, lat, lng] = index.clusters[group.row];
+    const hasUpcoming = group.events.some(function(event) { return event.event_time_type === 'upcoming'; });
+    const icon = L.divIcon({
+        className: 'custom-div-icon',
+        html: `<div class="marker-cluster-icon${hasUpcoming ? ' marker-cluster-icon-upcoming' : ''}">${group.events.length}</div>`,
+        iconSize: [36, 36],
+        iconAnchor: [18, 18]
+    });
+    const marker = L.marker([lat, lng], { icon: icon }).addTo(window.eventMapLayerGroup);
+    const titles = group.events.slice(0, 5).map(function(event) { return escapeMarkerText(event.title); });
+    if (group.events.length > titles.length) {
+        titles.push(`+${group.events.length - titles.length}`);
+    }
+    marker.bindTooltip(titles.join('<br>'), { className: 'custom-tooltip' });
+    marker.on('click', function() {
+        if (clusterZoom < index.max_zoom) {
+            // Zoom to where the cluster splits up
+            window.map.setView([lat, lng], clusterZoom + 1);
+            return;
+        }
+        // Markers this close never split, so list them instead
+        const list = document.createElement('ul');
+        list.className = 'marker-cluster-list';
+        group.events.forEach(function(event) {
+            const item = document.createElement('li');
+            const link = document.createElement('a');
+            link.textContent = event.title;
+            link.addEventListener('click', function() {
+                window.map.closePopup();
+                showMarkerEventPopup(event);
+            });
+            item.appendChild(link);
+            list.appendChild(item);
+        });
+        marker.unbindTooltip();
+        marker.bindPopup(list).openPopup();
+    });
 }
 
 function renderEventMarkers() {
@@ -224,78 +418,13 @@ function renderEventMarkers() {
     window.eventMapLayerGroup.clearLayers();
 
     const visibleEvents = events.filter(function(event) {
-        return !shouldHideMapEvent(event);
+        return !shouldHideMapEvent(event) && getMarkerPosition(event);
     });
-    assignVisibleMarkerShifts(visibleEvents);
-
-    visibleEvents.map(event=>{
-        var customIcon = null;
-        customIcon = L.divIcon({
-            className: 'custom-div-icon',
-            html: buildMarkerIconHtml(event),
-            iconSize: [32, 32], // Size of the icon
-            iconAnchor: [16, event.event_time_type === 'upcoming' ? 32 : 30], // Point of the icon which will correspond to marker's location
-            popupAnchor: [0, 0] // Point from which the popup should open relative to the iconAnchor
-        });
-        if (event.position) {
-          const shift = event.visibleShift || event.shift || [0, 0];
-          var marker = L.marker([event.position.lat + shift[0], event.position.lng + shift[1]],
-                                { icon: customIcon }).addTo(window.eventMapLayerGroup);
-          var routePolyline = getRoutePolylin(event.id);
-          if (routePolyline) {
-              marker.on('mouseover', function() {
-                window.currentHoveredRoutePolyline = routePolyline;
-                routePolyline.addTo(map);
-              });
-
-              marker.on('mouseout', function() {
-                if (map.hasLayer(routePolyline)) {
-                    map.removeLayer(routePolyline);
-                }
-                if (window.currentHoveredRoutePolyline === routePolyline) {
-                    window.currentHoveredRoutePolyline = null;
-                }
-              });
-          }
-          marker.bindTooltip(event.title, { className: 'custom-tooltip' });  //.openTooltip(); // by default, the tooltip is open
-          marker.on('click', function() {
-              const eventDetails = document.getElementById(event.id).innerHTML;
-              document.getElementById('popup-content').innerHTML = eventDetails;
-              document.getElementById('popup-overlay').style.display = 'block';
-              document.getElementById('popup').style.display = 'block';
-              var routePolyline = getRoutePolylin(event.id);
-              if (routePolyline) {
-                  // Remove existing polyline if there is one
-                  if (currentPolyline) {
-                      map.removeLayer(currentPolyline);
-                  }
-                  currentPolyline = routePolyline;
-                  currentPolyline.addTo(map);
-              }
-              // Update the URL
-              history.pushState(null, '', `?id=${event.id}`);
-          });
-          if (shift[0] != 0 || shift[1] != 0) {
-              // Add a red dot at the original position
-              var dot = L.circleMarker([event.position.lat, event.position.lng], {
-                  radius: 5,
-                  fillColor: "#ff0000",
-                  color: "#ff0000",
-                  weight: 1,
-                  opacity: 1,
-                  fillOpacity: 1
-              }).addTo(window.eventMapLayerGroup);
-
-              // Add a red line from the original position to the shifted position
-              var line = L.polyline([
-                  [event.position.lat, event.position.lng],
-                  [event.position.lat + shift[0], event.position.lng + shift[1]]
-              ], {
-                  color: "#ff0000",
-                  weight: 3,
-                  opacity: 0.5
-              }).addTo(window.eventMapLayerGroup);
-          }
+    groupVisibleMarkers(visibleEvents).forEach(function(group) {
+        if (group.events.length === 1) {
+            addEventMarker(group.events[0]);
+        } else {
+            addClusterMarker(group);
         }
     });
 }
@@ -308,6 +437,8 @@ function initMap() {
             maxZoom: 19,
             attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a>'
         }).addTo(map);
+        window.map.on('moveend', prefetchVisibleRoutes);
+        window.map.on('zoomend', renderEventMarkers);
     }
     initMapFilterToggles();
     renderEventMarkers();
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""One-time migration that stores ``region_code`` on events written before regions.
+
+New writes are tagged on the way in (see ``utils.event_storage``); this
+journals an upsert for every stored event whose code is missing or stale, so
+the storage version moves and events.js and the archive rebuild from the
+change set like after any other write.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+from utils.atomic_io import file_lock
+from utils.event_journal import upsert_op
+from utils.event_storage import DEFAULT_EVENTS_FILE, load_stored_events, read_storage_version, record_event_changes
+from utils.region_index import RegionIndex, default_region_index
+
+
+def region_operations(events: List[Dict[str, Any]], index: RegionIndex) -> List[Dict[str, Any]]:
+    """Upserts for the stored events whose ``region_code`` is missing or stale."""
+
+    operations = []
+    for event in events:
+        code = index.code_for_gps(event.get("gps_coordinates"))
+        if event.get("region_code") != code:
+            operations.append(upsert_op(dict(event, region_code=code)))
+    return operations
+
+
+def migrate_regions(events_file: Path, *, dry_run: bool = False) -> int:
+    """Journal the missing region codes; returns the operations written."""
+
+    # Hold the write lock from read to write so no ingest lands in between
+    with file_lock(events_file):
+        events = load_stored_events(events_file)
+        operations = region_operations(events, default_region_index())
+
+        regions = Counter(operation["event"]["region_code"] or "(none)" for operation in operations)
+        print(f"Checked {len(events)} events; {len(operations)} need a region code.")
+        for code, count in sorted(regions.items()):
+            print(f"  {code}: {count}")
+
+        if dry_run or not operations:
+            return 0
+        written = record_event_changes(operations, events_file, current_events=events)
+    print(f"Journaled {written} region codes for {events_file} (storage version {read_storage_version(events_file)}).")
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Store region codes on events written before regions existed.")
+    parser.add_argument(
+        "--events-file",
+        type=Path,
+        default=DEFAULT_EVENTS_FILE,
+        help="Path to storage/events.json (defaults to project storage).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the events that need a region code without writing anything.",
+    )
+    args = parser.parse_args()
+    migrate_regions(args.events_file, dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""One-time migration that rewrites stored route polylines into canonical form.
+
+Every ``route_polyline`` in storage/events.json is normalised to a plain
+Google polyline at precision 5 (see ``utils.route_utils.normalize_route_polyline``).
+A validation report lists what was rewritten and which routes could not be
+read; unreadable routes are cleared so readers never need to sniff formats.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+from utils.constants import PolylineFormat
+from utils.event_storage import DEFAULT_EVENTS_FILE, commit_event_changes, load_events_for_update
+from utils.route_utils import normalize_route_polyline
+
+
+def migrate_events(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Canonicalise routes in place and return the validation report."""
+
+    formats: Counter[str] = Counter()
+    rewritten: List[Dict[str, str]] = []
+    invalid: List[Dict[str, str]] = []
+
+    for event in events:
+        if "route_polyline" not in event:
+            continue
+        event_id = str(event.get("_id", "unknown"))
+        original = event["route_polyline"]
+        try:
+            canonical, source_format = normalize_route_polyline(original)
+        except ValueError as exc:
+            formats["invalid"] += 1
+            invalid.append({"_id": event_id, "error": str(exc)})
+            event["route_polyline"] = ""
+            continue
+
+        formats[source_format.value] += 1
+        if canonical != original:
+            event["route_polyline"] = canonical
+            rewritten.append({"_id": event_id, "from": source_format.value})
+
+    return {
+        "total_events": len(events),
+        "formats": dict(formats),
+        "rewritten": rewritten,
+        "invalid": invalid,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rewrite stored route polylines into canonical form.")
+    parser.add_argument(
+        "--events-file",
+        type=Path,
+        default=DEFAULT_EVENTS_FILE,
+        help="Path to storage/events.json (defaults to project storage).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the validation report without modifying the file.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Optional path to write the validation report as JSON.",
+    )
+    args = parser.parse_args()
+
+    events_file: Path = args.events_file
+    events, base_version = load_events_for_update(events_file)
+    base_events = copy.deepcopy(events)
+
+    report = migrate_events(events)
+
+    print(f"Checked {report['total_events']} events.")
+    for name, count in sorted(report["formats"].items()):
+        print(f"  {name}: {count}")
+    for entry in report["rewritten"]:
+        print(f"REWRITE {entry['_id']} (from {entry['from']})")
+    for entry in report["invalid"]:
+        print(f"INVALID {entry['_id']}: {entry['error']}")
+
+    if args.report:
+        args.report.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote validation report to {args.report}.")
+
+    if args.dry_run:
+        print("Dry run complete; no changes were written.")
+        return
+
+    if not report["rewritten"] and not report["invalid"]:
+        print(f"All routes are already {PolylineFormat.GOOGLE.value} polylines; nothing to write.")
+        return
+
+    journaled = commit_event_changes(events, base_events, base_version, events_file)
+    print(f"Journaled {journaled} canonical routes for {events_file}.")
+
+
+if __name__ == "__main__":
+    main()
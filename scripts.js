@@ -288,6 +288,21 @@ function getRoutePolyline(eventId) {
     return null;
 }
 
+// Pages built from summary bundles fetch the polyline on first use
+// (ensureRoutePolyline in dynamic-loader.js); static pages embed it.
+function withRoutePolyline(eventId, callback) {
+    var routePolyline = getRoutePolyline(eventId);
+    if (routePolyline) {
+        callback(routePolyline);
+    } else if (typeof window.ensureRoutePolyline === 'function') {
+        window.ensureRoutePolyline(eventId).then(function(found) {
+            if (found) {
+                callback(getRoutePolyline(eventId));
+            }
+        });
+    }
+}
+
 function decodePolyline(str, precision) {
     var index = 0,
         lat = 0,
@@ -356,15 +371,14 @@ function showEventDetailPopup(eventElement) {
     // Reset currentSlideIndex to 0 and update slides
     currentSlideIndex = 0;
     
-    var routePolyline = getRoutePolyline(eventId);
-    if (routePolyline) {
+    withRoutePolyline(eventId, function(routePolyline) {
         // Remove existing polyline if there is one
         if (currentPolyline) {
             map.removeLayer(currentPolyline);
         }
         currentPolyline = routePolyline;
         currentPolyline.addTo(map);
-    }
+    });
     // Update the URL
     history.pushState(null, '', `?id=${eventId}`);
 }
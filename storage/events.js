@@ -1,3 +1,4 @@
+window.LOCAL_EVENTS_VERSION = 0;
 window.LOCAL_EVENTS_DATA = [
   {
     "_id": "wechat-202509210830001",
@@ -2219,4 +2220,5 @@ window.LOCAL_EVENTS_DATA = [
     "source_url": "https://www.strava.com/clubs/1263183/group_events/1732636",
     "route_orientation": "clockwise"
   }
-];
\ No newline at end of file
+];
+window.LOCAL_ROUTE_INDEX = {"cell_degrees":0.25,"cells":{"150,-489":["event-wechat-202509210830001","event-strava-1157973-3408821466738446112","event-strava-1157973-3421275497983005184","event-strava-1157973-3450964483403078066","event-webpage-2026-04-09-3fdf6bf8","event-webpage-2026-04-16-9fc19408","event-webpage-2026-04-26-8f91839a","event-strava-1157973-3484407584245830288","event-wechat-202605090900001","event-strava-1157973-3497733786885626518","event-webpage-2026-06-07-d6a534c9","event-strava-1157973-3497736917575640676","event-webpage-2026-07-01-5f4f8b7e","event-webpage-2026-08-15-6bae7c03"],"151,-489":["event-wechat-202509210830001","event-webpage-2026-04-16-9fc19408","event-strava-1157973-3521980025796316386"],"148,-488":["event-strava-1157973-3405981448879735622","event-strava-1157973-3413724955580646124","event-strava-1157973-3416626834567319768","event-strava-1157973-3453454333581572758","event-webpage-2026-04-04-0cc7ac02","event-webpage-2026-04-25-2bc65772","event-webpage-2026-05-20-35b1d941","event-strava-1157973-3492407627033749942","event-webpage-2026-06-20-09b93ded","event-strava-1157973-3501388990906880506","event-webpage-2026-07-01-5f4f8b7e","event-webpage-2026-07-09-ed0a8b66","event-strava-1157973-3517994191174008902","event-strava-265-3525406098392304014","event-strava-265-3525409191807321818"],"148,-487":["event-strava-1157973-3405981448879735622","event-strava-1157973-3413724955580646124","event-strava-1157973-3453454333581572758","event-webpage-2026-04-04-0cc7ac02","event-webpage-2026-07-09-ed0a8b66"],"149,-488":["event-strava-1157973-3405981448879735622","event-wechat-202509280830001","event-strava-1157973-3408821466738446112","event-wechat-202510050900001","event-strava-1157973-3416626834567319768","event-strava-1157973-3471736552276889010","event-strava-1157973-3472281694416867788","event-webpage-2026-04-09-3fdf6bf8","event-webpage-2026-04-16-9fc19408","event-webpage-2026-04-25-2bc65772","event-strava-1157973-3484407584245830288","event-strava-1157973-3486956997003630902","event-wechat-202605090900001","event-webpage-2026-05-20-35b1d941","event-strava-1157973-3492407627033749942","event-webpage-2026-06-20-09b93ded","event-webpage-2026-07-01-5f4f8b7e","event-webpage-2026-07-09-ed0a8b66","event-strava-1157973-3517994191174008902","event-strava-265-3525406098392304014","event-strava-1157973-3525608753683445428"],"149,-487":["event-strava-1157973-3405981448879735622","event-wechat-202509280830001","event-wechat-202510050900001","event-strava-1157973-3471736552276889010","event-strava-1157973-3486956997003630902","event-webpage-2026-07-09-ed0a8b66"],"149,-489":["event-strava-1157973-3408821466738446112","event-strava-1157973-3403968626241162420","event-strava-1157973-3416626834567319768","event-strava-1263183-3415556203490171012","event-strava-1157973-2143574","event-strava-1157973-3421275497983005184","event-strava-1157973-3438769674616915752","event-strava-1157973-3448879589495090612","event-strava-1157973-3450964483403078066","event-strava-1157973-3452881763025829446","event-strava-1157973-3468729185577568456","event-webpage-2026-04-05-522b72b1","event-webpage-2026-04-09-3fdf6bf8","event-webpage-2026-04-16-9fc19408","event-strava-1157973-3481744602739649054","event-webpage-2026-04-25-2bc65772","event-webpage-2026-04-26-8f91839a","event-webpage-2026-04-29-30890d69","event-strava-1157973-3484407584245830288","event-webpage-2026-05-03-3b90bbe4","event-wechat-202605090900001","event-webpage-2026-05-09-67610411","event-webpage-2026-05-10-e758b0d8","event-webpage-2026-05-16-d214d529","event-webpage-2026-05-20-35b1d941","event-strava-1157973-3493775392528470130","event-webpage-2026-05-28-8cda4b92","event-strava-1157973-3492407627033749942","event-webpage-2026-05-31-9d9a0c6d","event-strava-1157973-3497733786885626518","event-webpage-2026-06-07-d6a534c9","event-strava-1157973-3497736917575640676","event-webpage-2026-06-12-8c987c79","event-webpage-2026-06-14-ca37fcaf","event-webpage-2026-06-20-09b93ded","event-webpage-2026-06-28-973bacdc","event-webpage-2026-07-01-5f4f8b7e","event-webpage-2026-07-02-b04abe1a","event-webpage-2026-07-09-ed0a8b66","event-strava-1157973-3512282071423063646","event-webpage-2026-07-19-f2736183","event-webpage-2026-07-25-50918cd3","event-webpage-2026-07-26-56745a7c","event-strava-1157973-3517994191174008902","event-webpage-2026-08-01-743342bb","event-webpage-2026-08-02-63ad6ef9","event-webpage-2026-08-08-f08378cb","event-webpage-2026-08-15-6bae7c03","event-strava-265-3525406098392304014","event-strava-1157973-3525608753683445428","event-strava-1263183-1732636"],"150,-488":["event-strava-1157973-3408821466738446112","event-wechat-202510050900001","event-webpage-2026-04-09-3fdf6bf8","event-webpage-2026-04-16-9fc19408","event-strava-1157973-3484407584245830288","event-wechat-202605090900001","event-webpage-2026-07-01-5f4f8b7e"],"149,-486":["event-wechat-202510050900001","event-strava-1157973-3471736552276889010","event-strava-1157973-3486956997003630902"],"150,-487":["event-wechat-202510050900001"],"150,-486":["event-wechat-202510050900001"],"149,-490":["event-strava-1157973-3403968626241162420","event-strava-1157973-2143574","event-strava-1157973-3421275497983005184","event-strava-1157973-3438769674616915752","event-strava-1157973-3448879589495090612","event-strava-1157973-3450964483403078066","event-strava-1157973-3452881763025829446","event-strava-1157973-3468729185577568456","event-webpage-2026-04-16-9fc19408","event-strava-1157973-3481744602739649054","event-webpage-2026-04-25-2bc65772","event-webpage-2026-04-26-8f91839a","event-webpage-2026-04-29-30890d69","event-webpage-2026-05-09-67610411","event-webpage-2026-05-10-e758b0d8","event-strava-1157973-3493775392528470130","event-webpage-2026-05-28-8cda4b92","event-strava-1157973-3497733786885626518","event-webpage-2026-06-07-d6a534c9","event-strava-1157973-3497736917575640676","event-webpage-2026-06-12-8c987c79","event-webpage-2026-06-28-973bacdc","event-webpage-2026-07-01-5f4f8b7e","event-webpage-2026-07-02-b04abe1a","event-webpage-2026-07-09-ed0a8b66","event-strava-1157973-3512282071423063646","event-webpage-2026-07-25-50918cd3","event-webpage-2026-07-26-56745a7c","event-webpage-2026-08-01-743342bb","event-webpage-2026-08-02-63ad6ef9","event-webpage-2026-08-08-f08378cb","event-webpage-2026-08-15-6bae7c03","event-strava-1263183-1732636"],"150,-490":["event-wechat-202510120930001","event-strava-1157973-3421275497983005184","event-strava-1157973-3450964483403078066","event-webpage-2026-04-16-9fc19408","event-webpage-2026-04-26-8f91839a","event-strava-1157973-3497733786885626518","event-webpage-2026-06-07-d6a534c9","event-strava-1157973-3497736917575640676","event-webpage-2026-07-01-5f4f8b7e","event-webpage-2026-08-15-6bae7c03"],"151,-490":["event-wechat-202510120930001","event-strava-1157973-3428108844839590894","event-strava-1157973-3433321270825961364","event-strava-1157973-3446340527498095572","event-strava-1157973-3452884827214030960","event-strava-1157973-3466596824258936542","event-strava-1157973-3475022933852906224","event-webpage-2026-04-16-9fc19408","event-strava-1157973-3510188562470612626","event-webpage-2026-08-16-15396561"],"148,-489":["event-strava-1157973-3416626834567319768","event-strava-1157973-3468729185577568456","event-webpage-2026-04-05-522b72b1","event-webpage-2026-04-25-2bc65772","event-webpage-2026-04-29-30890d69","event-webpage-2026-05-03-3b90bbe4","event-webpage-2026-05-10-e758b0d8","event-webpage-2026-05-16-d214d529","event-webpage-2026-05-20-35b1d941","event-webpage-2026-05-28-8cda4b92","event-strava-1157973-3492407627033749942","event-webpage-2026-05-31-9d9a0c6d","event-strava-1157973-3497733786885626518","event-webpage-2026-06-12-8c987c79","event-webpage-2026-06-14-ca37fcaf","event-webpage-2026-06-20-09b93ded","event-strava-1157973-3501388990906880506","event-webpage-2026-06-28-973bacdc","event-webpage-2026-07-01-5f4f8b7e","event-webpage-2026-07-09-ed0a8b66","event-webpage-2026-07-19-f2736183","event-webpage-2026-07-25-50918cd3","event-strava-1157973-3517994191174008902","event-webpage-2026-08-08-f08378cb","event-webpage-2026-08-15-6bae7c03","event-strava-265-3525406098392304014","event-strava-1263183-1732636"],"153,-490":["event-wechat-202511230930001","event-strava-1157973-3413728775589330668"],"153,-489":["event-wechat-202511230930001","event-strava-1157973-3413728775589330668"],"154,-490":["event-wechat-202511230930001","event-strava-1157973-3413728775589330668"],"154,-489":["event-wechat-202511230930001","event-strava-1157973-3413728775589330668"],"151,-491":["event-strava-1157973-3428108844839590894","event-strava-1157973-3433321270825961364","event-strava-1157973-3446340527498095572","event-strava-1157973-3452884827214030960","event-strava-1157973-3466596824258936542","event-strava-1157973-3475022933852906224","event-webpage-2026-04-16-9fc19408","event-strava-1157973-3510188562470612626","event-strava-1157973-3519871448883837838","event-webpage-2026-08-16-15396561"],"152,-491":["event-strava-1157973-3428108844839590894","event-strava-1157973-3452884827214030960","event-strava-1157973-3519871448883837838"],"152,-490":["event-strava-1157973-3428108844839590894","event-strava-1157973-3452884827214030960"],"148,-490":["event-strava-1157973-3468729185577568456","event-webpage-2026-04-25-2bc65772","event-webpage-2026-04-29-30890d69","event-webpage-2026-05-10-e758b0d8","event-webpage-2026-05-28-8cda4b92","event-strava-1157973-3497733786885626518","event-webpage-2026-06-12-8c987c79","event-webpage-2026-06-28-973bacdc","event-webpage-2026-07-01-5f4f8b7e","event-webpage-2026-07-09-ed0a8b66","event-webpage-2026-07-25-50918cd3","event-webpage-2026-08-08-f08378cb","event-webpage-2026-08-15-6bae7c03","event-strava-1263183-1732636"],"149,-491":["event-webpage-2026-04-16-9fc19408","event-webpage-2026-04-26-8f91839a","event-webpage-2026-07-01-5f4f8b7e"],"150,-491":["event-webpage-2026-04-16-9fc19408","event-webpage-2026-04-26-8f91839a","event-webpage-2026-07-01-5f4f8b7e"],"151,-488":["event-webpage-2026-04-16-9fc19408","event-strava-1157973-3521980025796316386"],"147,-491":["event-webpage-2026-07-01-5f4f8b7e"],"147,-490":["event-webpage-2026-07-01-5f4f8b7e"],"147,-489":["event-webpage-2026-07-01-5f4f8b7e"],"147,-488":["event-webpage-2026-07-01-5f4f8b7e"],"148,-491":["event-webpage-2026-07-01-5f4f8b7e"],"151,-493":["event-strava-1157973-3519871448883837838"],"151,-492":["event-strava-1157973-3519871448883837838"],"152,-493":["event-strava-1157973-3519871448883837838"],"152,-492":["event-strava-1157973-3519871448883837838"]}};
\ No newline at end of file
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Copy events between storage/events.json and the optional SQLite backend.
+
+``import`` loads events.json (plus any pending journal) into a database;
+``export`` writes the database back out as events.json for the static site.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from utils.event_sqlite import export_events, import_events
+from utils.event_storage import DEFAULT_EVENTS_FILE, load_stored_events, save_events_to_storage
+
+DEFAULT_SQLITE_FILE = DEFAULT_EVENTS_FILE.with_suffix(".sqlite")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import or export events between JSON and SQLite storage.")
+    parser.add_argument("command", choices=("import", "export"))
+    parser.add_argument(
+        "--events-file",
+        type=Path,
+        default=DEFAULT_EVENTS_FILE,
+        help="Path to storage/events.json (defaults to project storage).",
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=DEFAULT_SQLITE_FILE,
+        help="Path to the SQLite database (defaults to storage/events.sqlite).",
+    )
+    args = parser.parse_args()
+
+    if args.command == "import":
+        count = import_events(load_stored_events(args.events_file), args.db)
+        print(f"Imported {count} events from {args.events_file} into {args.db}.")
+        return
+
+    events = export_events(args.db)
+    save_events_to_storage(events, args.events_file)
+    print(f"Exported {len(events)} events from {args.db} to {args.events_file}.")
+
+
+if __name__ == "__main__":
+    main()
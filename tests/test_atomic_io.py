@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.atomic_io import file_lock
+
+
+class FileLockTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self._tmp.name) / "events.json"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_nested_acquisitions_are_reentrant(self) -> None:
+        with file_lock(self.path):
+            with file_lock(self.path):
+                pass
+            with file_lock(self.path, shared=True):
+                pass
+        with file_lock(self.path, shared=True):
+            with file_lock(self.path, shared=True):
+                pass
+
+    def test_shared_lock_is_not_upgraded(self) -> None:
+        with file_lock(self.path, shared=True):
+            with self.assertRaises(RuntimeError):
+                with file_lock(self.path):
+                    pass
+        # The failed upgrade left the lock usable
+        with file_lock(self.path):
+            pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import backfill_routes_of_event
+from utils.event_storage import load_stored_events, save_events_to_storage
+from utils.route_utils import compute_route_extent
+
+OLD_POLYLINE = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+NEW_POLYLINE = "_ibE_seK_seK_seK"
+
+
+class BackfillRoutesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        event = {
+            "_id": "a",
+            "title": "Ride a",
+            "source_type": "strava",
+            "source_group_id": {"$numberLong": "265"},
+            "source_url": "https://ridewithgps.com/routes/1",
+            "event_time_utc": {"$date": "2025-01-01T16:00:00.000Z"},
+            "route_polyline": OLD_POLYLINE,
+            "is_active": True,
+        }
+        event.update(compute_route_extent(OLD_POLYLINE))
+        save_events_to_storage([event], self.events_path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_rewritten_polyline_gets_a_new_extent(self) -> None:
+        route = {"distance_meters": 1000, "elevation_gain_meters": 10, "route_polyline": NEW_POLYLINE}
+        with mock.patch.object(backfill_routes_of_event, "extract_route_from_ridewithgps", return_value=route):
+            backfill_routes_of_event.backfill_route_fields(self.events_path)
+
+        stored = load_stored_events(self.events_path)[0]
+        self.assertEqual(stored["route_polyline"], NEW_POLYLINE)
+        self.assertEqual(stored["route_bbox"], compute_route_extent(NEW_POLYLINE)["route_bbox"])
+
+
+if __name__ == "__main__":
+    unittest.main()
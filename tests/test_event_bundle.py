@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils.event_bundle import read_bundle_version, write_local_events_bundle
+from utils.event_storage import read_storage_version, save_event_changes, save_events_to_storage
+from utils.route_geometry import RouteGeometry, route_hash
+
+POLYLINE = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+def _stored_event(event_id: str, date: str) -> dict:
+    return {
+        "_id": event_id,
+        "title": f"Ride {event_id}",
+        "source_type": "strava",
+        "source_group_id": {"$numberLong": "265"},
+        "event_time_utc": {"$date": f"{date}T16:00:00.000Z"},
+        "gps_coordinates": "37.4, -122.1",
+        "is_active": True,
+    }
+
+
+class EventBundleTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage = Path(self._tmp.name)
+        self.events_path = self.storage / "events.json"
+        self.routes_dir = self.storage / "routes"
+        self.events = [
+            _stored_event("a", "2025-01-01"),
+            _stored_event("b", "2025-02-20"),
+            _stored_event("c", "2025-03-05"),
+        ]
+        save_events_to_storage(self.events, self.events_path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write(self) -> None:
+        write_local_events_bundle(
+            self.events_path,
+            self.storage / "events.js",
+            self.storage / "route_index.json",
+            self.storage / "routes.pack",
+            self.routes_dir,
+        )
+
+    def test_events_js_is_minified_and_versioned(self) -> None:
+        self._write()
+
+        content = (self.storage / "events.js").read_text(encoding="utf-8")
+        self.assertNotIn("\n  ", content)
+        self.assertEqual(read_bundle_version(self.storage / "events.js"), read_storage_version(self.events_path))
+
+    def test_polylines_are_written_to_per_route_files(self) -> None:
+        save_event_changes(
+            [self.events[0], dict(self.events[1], route_polyline=POLYLINE), dict(self.events[2], route_polyline=POLYLINE)],
+            self.events_path,
+        )
+        # Stored polylines are already canonical: nothing is re-encoded
+        with mock.patch.object(RouteGeometry, "to_polyline") as to_polyline:
+            self._write()
+        to_polyline.assert_not_called()
+
+        self.assertEqual([path.name for path in self.routes_dir.iterdir()], [f"{route_hash(POLYLINE)}.txt"])
+        self.assertEqual((self.routes_dir / f"{route_hash(POLYLINE)}.txt").read_text(encoding="utf-8"), POLYLINE)
+        # The local events.js still embeds the polylines
+        self.assertIn(POLYLINE, (self.storage / "events.js").read_text(encoding="utf-8"))
+
+        save_event_changes(self.events, self.events_path)
+        self._write()
+        self.assertEqual(list(self.routes_dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import event_changes
+from utils.event_changes import change_set_path, changes_since, load_change_set
+from utils.event_storage import (
+    commit_event_changes,
+    delete_events_from_storage,
+    load_events_for_update,
+    read_storage_version,
+    save_event_changes,
+    save_events_to_storage,
+)
+
+
+def _stored_event(event_id: str, title: str = "ride") -> dict:
+    return {
+        "_id": event_id,
+        "title": title,
+        "event_time_utc": {"$date": "2025-01-01T16:00:00.000Z"},
+        "source_url": "",
+    }
+
+
+class ChangeFeedTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        save_events_to_storage([_stored_event("a"), _stored_event("b")], self.events_path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_each_commit_writes_a_change_set(self) -> None:
+        first = load_change_set(self.events_path, 1)
+        self.assertEqual((first["version"], first["added"]), (1, ["a", "b"]))
+
+        save_event_changes([_stored_event("a", "renamed"), _stored_event("b"), _stored_event("c")], self.events_path)
+        second = load_change_set(self.events_path, read_storage_version(self.events_path))
+        self.assertEqual(second["previous_version"], 1)
+        self.assertEqual(second["added"], ["c"])
+        self.assertEqual(second["updated"], {"a": ["title"]})
+        self.assertEqual(second["removed"], [])
+
+        delete_events_from_storage(["b", "missing"], self.events_path)
+        self.assertEqual(load_change_set(self.events_path, 3)["removed"], ["b"])
+
+    def test_rebased_commit_reports_changes_against_current_storage(self) -> None:
+        events, version = load_events_for_update(self.events_path)
+        save_event_changes([_stored_event("a", "other writer"), _stored_event("b")], self.events_path)
+
+        commit_event_changes(events + [_stored_event("c")], events, version, self.events_path)
+
+        self.assertEqual(load_change_set(self.events_path, 3)["added"], ["c"])
+        self.assertEqual(load_change_set(self.events_path, 3)["updated"], {})
+
+    def test_changes_since_merges_versions(self) -> None:
+        save_event_changes([_stored_event("a", "v2"), _stored_event("b"), _stored_event("c")], self.events_path)
+        save_event_changes([_stored_event("a", "v2"), _stored_event("c", "v3")], self.events_path)
+
+        merged = changes_since(self.events_path, 1, 3)
+        self.assertEqual(merged["added"], ["c"])
+        self.assertEqual(merged["updated"], {"a": ["title"]})
+        self.assertEqual(merged["removed"], ["b"])
+        self.assertEqual(changes_since(self.events_path, 3, 3)["added"], [])
+
+    def test_missing_change_set_forces_full_rebuild(self) -> None:
+        with mock.patch.object(event_changes, "MAX_CHANGE_SETS", 2):
+            for title in ("x", "y", "z"):
+                save_event_changes([_stored_event("a", title), _stored_event("b")], self.events_path)
+
+        self.assertFalse(change_set_path(self.events_path, 2).exists())
+        self.assertIsNone(changes_since(self.events_path, 1, 4))
+        self.assertIsNotNone(changes_since(self.events_path, 2, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from utils.event_codec import (
+    available_json_backends,
+    decode_event,
+    decode_events,
+    dumps,
+    encode_event,
+    encode_events,
+    get_json_backend,
+    loads,
+    set_json_backend,
+)
+from utils.event_storage import DEFAULT_EVENTS_FILE
+
+SAMPLE_DOCUMENT = {
+    "_id": "webpage-2025-03-01-abc",
+    "title": "Café ride — \"quoted\" \\ slash\ttab",
+    "distance_meters": 80467.2,
+    "elevation_gain_meters": 1200,
+    "source_group_id": {"$numberLong": "59884023036"},
+    "event_picture_urls": [],
+    "extra": {},
+    "flags": [True, False, None],
+}
+
+
+class EventCodecTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._backend = get_json_backend()
+
+    def tearDown(self) -> None:
+        set_json_backend(self._backend)
+
+    def test_committed_events_round_trip_byte_identical(self) -> None:
+        raw = DEFAULT_EVENTS_FILE.read_bytes()
+        for backend in available_json_backends():
+            with self.subTest(backend=backend):
+                set_json_backend(backend)
+                stored = loads(raw)
+                self.assertEqual((dumps(stored) + "\n").encode("utf-8"), raw)
+                rewritten = encode_events(decode_events(stored))
+                self.assertEqual((dumps(rewritten) + "\n").encode("utf-8"), raw)
+
+    def test_backends_write_identical_bytes(self) -> None:
+        # Floats both backends would otherwise print differently
+        document = encode_event(
+            dict(SAMPLE_DOCUMENT, route_bbox=[1e-05, -3.5e-05, 1e16, 37.123456789], route_length_meters=2.5e16)
+        )
+        self.assertEqual(document["route_bbox"], [0.0, 0.0, 10**16, 37.123457])
+        outputs = set()
+        for backend in available_json_backends():
+            set_json_backend(backend)
+            outputs.add((dumps(document), dumps(document, pretty=False)))
+            self.assertEqual(loads(dumps(document)), document)
+        self.assertEqual(len(outputs), 1)
+
+    def test_encode_rejects_non_finite_numbers(self) -> None:
+        for value in (float("nan"), float("inf"), float("-inf")):
+            with self.subTest(value=value):
+                with self.assertRaisesRegex(ValueError, "distance_meters"):
+                    encode_event(dict(SAMPLE_DOCUMENT, distance_meters=value))
+                with self.assertRaises(ValueError):
+                    encode_event(dict(SAMPLE_DOCUMENT, route_bbox=[0.0, value]))
+
+    def test_encode_canonicalises_dates_and_ids(self) -> None:
+        variants = [
+            "2025-03-01T16:00:00+00:00",
+            {"$date": "2025-03-01T16:00:00.000000Z"},
+            {"$date": "2025-03-01T08:00:00-08:00"},
+            datetime(2025, 3, 1, 16, 0),
+        ]
+        for value in variants:
+            with self.subTest(value=value):
+                encoded = encode_event({"_id": "a", "event_time_utc": value, "source_event_id": 42, "raw_event": {}})
+                self.assertEqual(encoded["event_time_utc"], {"$date": "2025-03-01T16:00:00.000Z"})
+                self.assertEqual(encoded["source_event_id"], {"$numberLong": "42"})
+                self.assertNotIn("raw_event", encoded)
+                self.assertEqual(encode_event(decode_event(encoded)), encoded)
+
+    def test_encode_leaves_canonical_routes_alone(self) -> None:
+        event = {"_id": "a", "route_polyline": "_p~iF~ps|U_ulLnnqC_mqNvxq`@"}
+        with mock.patch("utils.route_utils.normalize_route_polyline") as normalize:
+            self.assertEqual(encode_event(event)["route_polyline"], event["route_polyline"])
+        normalize.assert_not_called()
+
+        wrapped = {"_id": "b", "route_polyline": "X3B+aUZ+cHN8VV91bExubnFDX21xTnZ4cWBA"}
+        self.assertEqual(encode_event(wrapped)["route_polyline"], event["route_polyline"])
+
+    def test_decode_drops_events_without_time(self) -> None:
+        self.assertEqual(decode_events([{"_id": "a"}, {"_id": "b", "event_time_utc": "nope"}]), [])
+
+    def test_unknown_backend_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            set_json_backend("yaml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.event_heavy_store import heavy_path_for, index_path_for, load_event_index
+from utils.event_storage import (
+    load_event_heavy_fields,
+    load_events_for_runtime,
+    save_event_changes,
+    save_events_to_storage,
+)
+
+
+def _stored_event(event_id: str, date: str, group_id: int) -> dict:
+    return {
+        "_id": event_id,
+        "title": event_id,
+        "source_group_id": {"$numberLong": str(group_id)},
+        "event_time_utc": {"$date": f"{date}T16:00:00.000Z"},
+        "description": f"{event_id} description",
+        "route_polyline": "_p~iF~ps|U_ulLnnqC_mqNvxq`@",
+        "event_picture_urls": [f"https://example.com/{event_id}.jpg"],
+        "source_url": "",
+    }
+
+
+class HeavyStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        self.events = [
+            _stored_event("a", "2025-01-01", 265),
+            _stored_event("b", "2025-01-02", 908336),
+            _stored_event("c", "2025-01-03", 265),
+        ]
+        save_events_to_storage(self.events, self.events_path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_slim_index_excludes_heavy_fields(self) -> None:
+        slim_events, store = load_event_index(self.events_path)
+
+        self.assertTrue(index_path_for(self.events_path).exists())
+        self.assertTrue(heavy_path_for(self.events_path).exists())
+        self.assertNotIn("description", slim_events[0])
+        self.assertEqual(store.get("b")["description"], "b description")
+
+    def test_projection_matches_full_load(self) -> None:
+        full = load_events_for_runtime(self.events_path, source_group_ids={265})
+        projected = load_events_for_runtime(self.events_path, source_group_ids={265}, fields=("title", "description"))
+
+        self.assertEqual(
+            projected,
+            [{key: event[key] for key in ("_id", "title", "event_time_utc", "description")} for event in full],
+        )
+
+    def test_projection_without_heavy_fields_skips_store(self) -> None:
+        heavy_path_for(self.events_path).unlink()
+
+        events = load_events_for_runtime(self.events_path, fields=("title",))
+
+        self.assertEqual([sorted(event) for event in events], [["_id", "event_time_utc", "title"]] * 3)
+
+    def test_stale_index_falls_back_to_snapshot_and_journal(self) -> None:
+        updated = [dict(self.events[0], description="changed")] + self.events[1:]
+        save_event_changes(updated, self.events_path)
+
+        self.assertIsNone(load_event_index(self.events_path))
+        self.assertEqual(load_event_heavy_fields("a", self.events_path)["description"], "changed")
+        events = load_events_for_runtime(self.events_path, fields=("description",))
+        self.assertEqual(events[0]["description"], "changed")
+
+
+if __name__ == "__main__":
+    unittest.main()
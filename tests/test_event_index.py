@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from utils.event_index import EventIndex
+from utils.event_storage import load_events_for_runtime, query, save_events_to_storage
+
+
+def _stored_event(event_id: str, date: str, group_id: int, source_type: str = "strava", **extra) -> dict:
+    return {
+        "_id": event_id,
+        "title": event_id,
+        "source_type": source_type,
+        "source_group_id": {"$numberLong": str(group_id)},
+        "event_time_utc": {"$date": f"{date}T16:00:00.000Z"},
+        "gps_coordinates": "37.4, -122.1",
+        **extra,
+    }
+
+
+class EventIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        save_events_to_storage(
+            [
+                _stored_event("c", "2025-03-01", 265),
+                _stored_event("a", "2025-01-01", 265, is_active=False),
+                _stored_event("b", "2025-02-01", 908336, "wechat", gps_coordinates="47.6, -122.3"),
+                _stored_event("d", "2025-04-01", 1157973),
+            ],
+            self.events_path,
+        )
+        self.index = EventIndex(load_events_for_runtime(self.events_path))
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _ids(self, events) -> list:
+        return [event["_id"] for event in events]
+
+    def test_time_range_is_half_open_and_sorted(self) -> None:
+        self.assertEqual(self._ids(self.index.query()), ["a", "b", "c", "d"])
+        window = (datetime(2025, 2, 1, 16), datetime(2025, 4, 1, 16))
+        self.assertEqual(self._ids(self.index.query(time_range=window)), ["b", "c"])
+        self.assertEqual(self._ids(self.index.query(time_range=(None, datetime(2025, 2, 1)))), ["a"])
+
+    def test_filters_combine(self) -> None:
+        self.assertEqual(self._ids(self.index.query(group_ids={265}, active=True)), ["c"])
+        self.assertEqual(self._ids(self.index.query(source_types={"strava"}, ids=["d", "b"])), ["d"])
+        self.assertEqual(self._ids(self.index.query(bbox=(47.0, -123.0, 48.0, -122.0))), ["b"])
+        self.assertEqual(self.index.query(group_ids={1}), [])
+
+    def test_matches_linear_scan(self) -> None:
+        for group_ids in ({265}, {265, 908336}, None):
+            for active in (True, False, None):
+                expected = [
+                    event
+                    for event in self.index.events
+                    if (group_ids is None or event["source_group_id"] in group_ids)
+                    and (active is None or event.get("is_active", True) is active)
+                ]
+                self.assertEqual(self.index.query(group_ids=group_ids, active=active), expected)
+
+    def test_union_deduplicates(self) -> None:
+        merged = EventIndex.union(self.index.query(ids=["c", "a"]), self.index.query(group_ids={265}))
+        self.assertEqual(self._ids(merged), ["a", "c"])
+
+    def test_storage_query(self) -> None:
+        events = query(self.events_path, time_range=(datetime(2025, 2, 1), None), source_types={"strava"}, model=True)
+        self.assertEqual(self._ids(events), ["c", "d"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.event_journal import (
+    delete_op,
+    diff_events,
+    journal_path_for,
+    read_operations,
+    replay_operations,
+    upsert_op,
+)
+from utils.event_storage import (
+    commit_event_changes,
+    compact_events_storage,
+    delete_events_from_storage,
+    load_events_for_update,
+    load_stored_events,
+    read_storage_version,
+    save_event_changes,
+)
+
+
+def _stored_event(event_id: str, date: str, title: str = "Ride") -> dict:
+    return {
+        "_id": event_id,
+        "title": title,
+        "event_time_utc": {"$date": f"{date}T16:00:00.000Z"},
+        "event_picture_urls": [],
+        "source_url": "",
+    }
+
+
+class ReplayTest(unittest.TestCase):
+    def test_replay_is_idempotent_per_id(self) -> None:
+        snapshot = [_stored_event("a", "2025-01-01"), _stored_event("b", "2025-01-02")]
+        operations = [
+            upsert_op(_stored_event("a", "2025-01-01", "Renamed")),
+            upsert_op(_stored_event("c", "2025-01-03")),
+            delete_op("b"),
+        ]
+
+        once = replay_operations(snapshot, operations)
+        twice = replay_operations(once, operations)
+
+        self.assertEqual([event["_id"] for event in once], ["a", "c"])
+        self.assertEqual(once[0]["title"], "Renamed")
+        self.assertEqual(once, twice)
+
+    def test_diff_only_emits_changed_records(self) -> None:
+        current = [_stored_event("a", "2025-01-01"), _stored_event("b", "2025-01-02")]
+        updated = [_stored_event("a", "2025-01-01"), _stored_event("c", "2025-01-03")]
+
+        operations = diff_events(current, updated)
+
+        self.assertEqual([(op["op"], op["_id"]) for op in operations], [("upsert", "c"), ("delete", "b")])
+
+
+class JournalStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        snapshot = [_stored_event(f"e{index}", f"2025-01-{index + 1:02d}") for index in range(20)]
+        self.events_path.write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_writers_append_changes_and_readers_replay(self) -> None:
+        events = load_stored_events(self.events_path)
+        snapshot_text = self.events_path.read_text(encoding="utf-8")
+        events[0]["title"] = "Updated"
+
+        written = save_event_changes(events, self.events_path)
+        delete_events_from_storage(["e1"], self.events_path)
+
+        self.assertEqual(written, 1)
+        self.assertEqual(self.events_path.read_text(encoding="utf-8"), snapshot_text)
+        self.assertEqual(len(read_operations(journal_path_for(self.events_path))), 2)
+        reloaded = load_stored_events(self.events_path)
+        self.assertEqual(reloaded[0]["title"], "Updated")
+        self.assertNotIn("e1", [event["_id"] for event in reloaded])
+
+    def test_compaction_materialises_snapshot_and_drops_journal(self) -> None:
+        events = load_stored_events(self.events_path)
+        events.insert(0, _stored_event("late", "2025-02-01"))
+        save_event_changes(events, self.events_path)
+
+        total = compact_events_storage(self.events_path)
+
+        self.assertEqual(total, 21)
+        self.assertFalse(journal_path_for(self.events_path).exists())
+        stored = json.loads(self.events_path.read_text(encoding="utf-8"))
+        self.assertEqual(stored[-1]["_id"], "late")
+
+    def test_truncated_journal_line_is_skipped(self) -> None:
+        journal_path = journal_path_for(self.events_path)
+        journal_path.write_text(
+            json.dumps(delete_op("e0")) + "\n" + '{"op":"upsert","_id":"e2","ev',
+            encoding="utf-8",
+        )
+
+        events = load_stored_events(self.events_path)
+
+        self.assertEqual(len(events), 19)
+
+
+class ConcurrentCommitTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        snapshot = [_stored_event("a", "2025-01-01"), _stored_event("b", "2025-01-02")]
+        self.events_path.write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_stale_writer_merges_fields_instead_of_overwriting(self) -> None:
+        first, first_version = load_events_for_update(self.events_path)
+        second, second_version = load_events_for_update(self.events_path)
+        base_first = [dict(event) for event in first]
+        base_second = [dict(event) for event in second]
+
+        first[0]["title"] = "Renamed"
+        second[0]["distance_meters"] = 42_000
+        second.append(_stored_event("c", "2025-01-03"))
+
+        commit_event_changes(first, base_first, first_version, self.events_path)
+        commit_event_changes(second, base_second, second_version, self.events_path)
+
+        stored = {event["_id"]: event for event in load_stored_events(self.events_path)}
+        self.assertEqual(stored["a"]["title"], "Renamed")
+        self.assertEqual(stored["a"]["distance_meters"], 42_000)
+        self.assertEqual(sorted(stored), ["a", "b", "c"])
+        self.assertEqual(read_storage_version(self.events_path), 2)
+
+    def test_stale_writer_does_not_delete_records_added_concurrently(self) -> None:
+        events, version = load_events_for_update(self.events_path)
+        base = [dict(event) for event in events]
+        save_event_changes(events + [_stored_event("new", "2025-01-05")], self.events_path)
+
+        events[1]["title"] = "Updated"
+        commit_event_changes(events, base, version, self.events_path)
+
+        self.assertEqual([event["_id"] for event in load_stored_events(self.events_path)], ["a", "b", "new"])
+
+    def test_compaction_replaces_snapshot_without_leftover_temp_files(self) -> None:
+        save_event_changes([_stored_event("a", "2025-01-01", "Renamed")], self.events_path)
+
+        compact_events_storage(self.events_path)
+
+        leftovers = [path.name for path in self.events_path.parent.iterdir() if path.name.endswith(".tmp")]
+        self.assertEqual(leftovers, [])
+        self.assertEqual(len(json.loads(self.events_path.read_text(encoding="utf-8"))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+
+from utils.event_model import Event
+from utils.event_storage import normalize_event_for_runtime, rehydrate_event_for_storage
+
+STORED_EVENT = {
+    "_id": "strava-265-1",
+    "source_type": "strava",
+    "source_group_id": {"$numberLong": "265"},
+    "source_event_id": {"$numberLong": "1"},
+    "source_group_name": "Los Gatos Bicycle Racing Club",
+    "event_time_utc": {"$date": "2025-09-13T15:30:00.000Z"},
+    "gps_coordinates": "37.2266, -121.9747",
+    "distance_meters": "80467.2",
+    "elevation_gain_meters": 1200,
+    "title": "Saturday ride",
+    "is_active": True,
+    "event_picture_urls": [],
+    "source_url": "https://www.strava.com/clubs/265/group_events/1",
+    "route_orientation": "clockwise",
+}
+
+
+class EventModelTest(unittest.TestCase):
+    def test_values_are_parsed_once(self) -> None:
+        event = Event.from_storage(STORED_EVENT)
+
+        self.assertEqual(event["source_group_id"], 265)
+        self.assertEqual(event.coordinates, (37.2266, -121.9747))
+        self.assertEqual(event["distance_meters"], 80467.2)
+        self.assertEqual(event.start_time, datetime(2025, 9, 13, 15, 30, tzinfo=timezone.utc))
+        self.assertNotIn("__dict__", dir(event))
+
+    def test_behaves_like_runtime_dict(self) -> None:
+        event = Event.from_storage(STORED_EVENT)
+        runtime = normalize_event_for_runtime(STORED_EVENT)
+        runtime["distance_meters"] = 80467.2
+
+        self.assertEqual(dict(event), runtime)
+        self.assertEqual(event.get("route_orientation"), "clockwise")
+        self.assertIsNone(event.get("description"))
+        self.assertNotIn("description", event)
+        with self.assertRaises(KeyError):
+            event["description"]
+
+    def test_round_trips_to_storage_form(self) -> None:
+        event = Event.from_storage(STORED_EVENT)
+        expected = rehydrate_event_for_storage(dict(STORED_EVENT, distance_meters=80467.2))
+
+        self.assertEqual(event.to_storage_dict(), expected)
+
+    def test_rejects_events_without_time(self) -> None:
+        self.assertIsNone(Event.from_storage({"_id": "x", "title": "No time"}))
+
+    def test_updating_gps_refreshes_coordinates(self) -> None:
+        event = Event.from_storage(STORED_EVENT)
+
+        event["gps_coordinates"] = ""
+        self.assertIsNone(event.coordinates)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from utils import event_partitions
+from utils.event_partitions import fresh_manifest, partitions_dir_for, write_partitions
+from utils.event_storage import load_events_for_runtime, save_event_changes, save_events_to_storage
+
+
+def _stored_event(event_id: str, date: str) -> dict:
+    return {
+        "_id": event_id,
+        "title": event_id,
+        "event_time_utc": {"$date": f"{date}T16:00:00.000Z"},
+        "event_picture_urls": [],
+        "source_url": "",
+    }
+
+
+class PartitionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        self.events = [
+            _stored_event("jan", "2025-01-10"),
+            _stored_event("feb", "2025-02-10"),
+            _stored_event("mar-1", "2025-03-01"),
+            _stored_event("mar-2", "2025-03-20"),
+        ]
+        save_events_to_storage(self.events, self.events_path)
+        write_partitions(self.events, self.events_path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_snapshot_write_leaves_partitions_alone(self) -> None:
+        save_events_to_storage(self.events[:2], self.events_path)
+
+        self.assertIsNone(fresh_manifest(self.events_path))
+        self.assertTrue((partitions_dir_for(self.events_path) / "events_202503.json").exists())
+
+    def test_monthly_partitions_and_manifest(self) -> None:
+        manifest = fresh_manifest(self.events_path)
+
+        self.assertIsNotNone(manifest)
+        self.assertEqual([entry["key"] for entry in manifest["partitions"]], ["202501", "202502", "202503"])
+        march = manifest["partitions"][2]
+        self.assertEqual((march["count"], march["start"], march["end"]), (2, "2025-03-01T16:00:00.000Z", "2025-03-20T16:00:00.000Z"))
+        stored = json.loads((partitions_dir_for(self.events_path) / "events_202503.json").read_text(encoding="utf-8"))
+        self.assertEqual([event["_id"] for event in stored], ["mar-1", "mar-2"])
+
+    def test_window_only_opens_overlapping_partitions(self) -> None:
+        opened = []
+        real_open = Path.open
+
+        def tracking_open(path: Path, *args, **kwargs):
+            opened.append(path.name)
+            return real_open(path, *args, **kwargs)
+
+        with mock.patch.object(Path, "open", tracking_open):
+            events = load_events_for_runtime(self.events_path, start=datetime(2025, 2, 15), end=datetime(2025, 3, 10))
+
+        self.assertEqual([event["_id"] for event in events], ["mar-1"])
+        self.assertIn("events_202503.json", opened)
+        self.assertNotIn("events_202501.json", opened)
+        self.assertNotIn("events.json", opened)
+
+    def test_pending_journal_falls_back_to_full_load(self) -> None:
+        save_event_changes(self.events + [_stored_event("apr", "2025-04-02")], self.events_path)
+
+        self.assertIsNone(fresh_manifest(self.events_path))
+        events = load_events_for_runtime(self.events_path, start=datetime(2025, 4, 1))
+        self.assertEqual([event["_id"] for event in events], ["apr"])
+
+    def test_fingerprint_survives_mtime_change_but_not_content_change(self) -> None:
+        manifest = fresh_manifest(self.events_path)
+        source = dict(manifest["source"], mtime_ns=0)
+
+        self.assertTrue(event_partitions.fingerprint_matches(self.events_path, source))
+        self.assertFalse(event_partitions.fingerprint_matches(self.events_path, dict(source, sha256="0" * 64)))
+
+    def test_rewrite_refreshes_the_fingerprint(self) -> None:
+        # Same content with a new mtime, as after a checkout
+        self.events_path.write_bytes(self.events_path.read_bytes())
+        write_partitions(self.events, self.events_path)
+
+        source = fresh_manifest(self.events_path)["source"]
+        self.assertEqual(source["mtime_ns"], self.events_path.stat().st_mtime_ns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.event_codec import decode_events
+from utils.event_schema import (
+    EventValidationError,
+    compile_schema,
+    validate_event,
+    validate_events,
+)
+from utils.event_storage import (
+    DEFAULT_EVENTS_FILE,
+    load_events_for_runtime,
+    load_stored_events,
+    save_event_changes,
+    save_events_to_storage,
+)
+
+
+def _stored_event(event_id: str, **overrides) -> dict:
+    event = {
+        "_id": event_id,
+        "title": event_id,
+        "source_group_id": {"$numberLong": "265"},
+        "event_time_utc": {"$date": "2025-01-01T16:00:00.000Z"},
+        "gps_coordinates": "37.4, -122.1",
+        "distance_meters": 50000,
+    }
+    event.update(overrides)
+    return {key: value for key, value in event.items() if value is not None}
+
+
+class EventSchemaTest(unittest.TestCase):
+    def test_committed_events_are_valid_in_both_forms(self) -> None:
+        stored = load_stored_events(DEFAULT_EVENTS_FILE)
+        self.assertEqual(validate_events(stored), {})
+        self.assertEqual(validate_events(decode_events(stored)), {})
+
+    def test_errors_are_reported_per_record(self) -> None:
+        errors = validate_events(
+            [
+                _stored_event("ok"),
+                _stored_event("no-time", event_time_utc=None),
+                _stored_event("bad-distance", distance_meters="12 km"),
+                _stored_event("negative", distance_meters=-5, gps_coordinates="north"),
+                _stored_event("", source_group_id={"$numberLong": "abc"}),
+            ]
+        )
+
+        self.assertEqual(list(errors), ["no-time", "bad-distance", "negative", "#4"])
+        self.assertEqual(errors["no-time"], ["event_time_utc: missing"])
+        self.assertIn("distance_meters", errors["bad-distance"][0])
+        self.assertEqual(len(errors["negative"]), 2)
+
+    def test_unknown_schema_type_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            compile_schema({"title": {"type": "text"}})
+        self.assertEqual(validate_event({"_id": "x", "event_time_utc": "2025-01-01T00:00:00Z", "extra": 1}), [])
+
+
+class StorageValidationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        save_events_to_storage([_stored_event("a")], self.events_path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_full_save_rejects_invalid_events_without_writing(self) -> None:
+        with self.assertRaises(EventValidationError) as raised:
+            save_events_to_storage([_stored_event("b"), _stored_event("c", distance_meters="far")], self.events_path)
+
+        self.assertEqual(list(raised.exception.errors), ["c"])
+        self.assertEqual([event["_id"] for event in load_stored_events(self.events_path)], ["a"])
+
+    def test_journaled_commit_keeps_valid_changes(self) -> None:
+        written = save_event_changes(
+            [_stored_event("a"), _stored_event("b"), _stored_event("c", is_active="yes")],
+            self.events_path,
+        )
+
+        self.assertEqual(written, 1)
+        self.assertEqual([event["_id"] for event in load_stored_events(self.events_path)], ["a", "b"])
+
+    def test_validated_load_fills_render_defaults(self) -> None:
+        event = load_events_for_runtime(self.events_path, validate=True)[0]
+
+        self.assertEqual(event["description"], "")
+        self.assertEqual(event["elevation_gain_meters"], 0)
+        self.assertNotIn("description", load_events_for_runtime(self.events_path)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
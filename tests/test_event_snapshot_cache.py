@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.event_model import Event
+from utils.event_snapshot_cache import load_runtime_cache, runtime_cache_path_for
+from utils.event_storage import load_events_for_runtime, save_event_changes, save_events_to_storage
+
+
+def _stored_event(event_id: str, date: str, group_id: int) -> dict:
+    return {
+        "_id": event_id,
+        "title": event_id,
+        "source_group_id": {"$numberLong": str(group_id)},
+        "event_time_utc": {"$date": f"{date}T16:00:00.000Z"},
+        "gps_coordinates": "37.4, -122.1",
+        "is_active": True,
+    }
+
+
+class RuntimeCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        self.events = [_stored_event("a", "2025-01-01", 265), _stored_event("b", "2025-01-02", 908336)]
+        save_events_to_storage(self.events, self.events_path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_cache_hit_matches_json_load(self) -> None:
+        uncached = load_events_for_runtime(self.events_path, cache=False)
+        self.assertFalse(runtime_cache_path_for(self.events_path).exists())
+
+        first = load_events_for_runtime(self.events_path)
+        self.assertIsNotNone(load_runtime_cache(self.events_path))
+        second = load_events_for_runtime(self.events_path, source_group_ids={265})
+
+        self.assertEqual(first, uncached)
+        self.assertEqual(second, uncached[:1])
+        models = load_events_for_runtime(self.events_path, model=True)
+        self.assertIsInstance(models[0], Event)
+        self.assertEqual([dict(event) for event in models], uncached)
+
+    def test_cache_invalidated_when_snapshot_changes(self) -> None:
+        load_events_for_runtime(self.events_path)
+        save_events_to_storage(self.events + [_stored_event("c", "2025-01-03", 265)], self.events_path)
+
+        self.assertIsNone(load_runtime_cache(self.events_path))
+        self.assertEqual([event["_id"] for event in load_events_for_runtime(self.events_path)], ["a", "b", "c"])
+
+    def test_cache_bypassed_while_journal_pending(self) -> None:
+        load_events_for_runtime(self.events_path)
+        save_event_changes([dict(self.events[0], title="renamed"), self.events[1]], self.events_path)
+
+        self.assertIsNone(load_runtime_cache(self.events_path))
+        self.assertEqual(load_events_for_runtime(self.events_path)[0]["title"], "renamed")
+
+    def test_unreadable_cache_is_rebuilt(self) -> None:
+        runtime_cache_path_for(self.events_path).write_bytes(b"not a pickle")
+
+        self.assertEqual(len(load_events_for_runtime(self.events_path)), 2)
+        self.assertIsNotNone(load_runtime_cache(self.events_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
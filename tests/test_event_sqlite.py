@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from utils.event_sqlite import export_events, import_events, query_events
+from utils.event_storage import load_events_for_runtime, save_event_changes, save_events_to_storage
+
+
+def _stored_event(event_id: str, date: str, group_id: int, **extra: object) -> dict:
+    event = {
+        "_id": event_id,
+        "source_type": "strava",
+        "source_group_id": {"$numberLong": str(group_id)},
+        "title": event_id,
+        "event_time_utc": {"$date": f"{date}T16:00:00.000Z"},
+        "route_polyline": "_p~iF~ps|U_ulLnnqC_mqNvxq`@",
+        "description": "Long ride",
+        "is_active": True,
+        "event_picture_urls": [],
+        "source_url": "",
+    }
+    event.update(extra)
+    return event
+
+
+class SqliteBackendTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db_path = Path(self._tmp.name) / "events.sqlite"
+        self.events = [
+            _stored_event("a", "2025-01-03", 265),
+            _stored_event("b", "2025-01-01", 908336),
+            _stored_event("c", "2025-01-02", 265, is_active=False),
+        ]
+        import_events(self.events, self.db_path)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_export_round_trips_documents_in_time_order(self) -> None:
+        exported = export_events(self.db_path)
+
+        self.assertEqual([event["_id"] for event in exported], ["b", "c", "a"])
+        self.assertEqual(exported[2], self.events[0])
+        self.assertEqual(list(exported[2]), list(self.events[0]))
+
+    def test_heavy_fields_are_only_loaded_on_request(self) -> None:
+        slim = query_events(self.db_path, include_heavy=False)
+
+        self.assertTrue(all("route_polyline" not in event for event in slim))
+        self.assertTrue(all("description" not in event for event in slim))
+        self.assertTrue(all("event_picture_urls" not in event for event in slim))
+
+    def test_projections_match_the_json_backend(self) -> None:
+        json_path = Path(self._tmp.name) / "events.json"
+        save_events_to_storage(self.events, json_path)
+
+        for fields in (["title"], ["title", "event_picture_urls"]):
+            with self.subTest(fields=fields):
+                from_sqlite = load_events_for_runtime(self.db_path, fields=fields)
+                from_json = load_events_for_runtime(json_path, fields=fields)
+                self.assertEqual(
+                    {event["_id"]: event for event in from_sqlite},
+                    {event["_id"]: event for event in from_json},
+                )
+
+    def test_validate_drops_invalid_events(self) -> None:
+        import_events(self.events + [_stored_event("d", "2025-01-04", 265, title=7)], self.db_path)
+
+        events = load_events_for_runtime(self.db_path, validate=True)
+
+        self.assertEqual([event["_id"] for event in events], ["b", "c", "a"])
+
+    def test_rows_written_before_picture_urls_were_heavy_still_load(self) -> None:
+        with sqlite3.connect(str(self.db_path)) as connection:
+            connection.execute("UPDATE events SET document = json_set(document, '$.event_picture_urls', json('[\"x.jpg\"]'))")
+            connection.execute("UPDATE event_blobs SET event_picture_urls = NULL")
+
+        self.assertEqual(export_events(self.db_path)[0]["event_picture_urls"], ["x.jpg"])
+
+    def test_runtime_filters_match_json_semantics(self) -> None:
+        events = load_events_for_runtime(
+            self.db_path,
+            active_only=True,
+            source_group_ids={265},
+            start=datetime(2025, 1, 1),
+        )
+
+        self.assertEqual([event["_id"] for event in events], ["a"])
+        self.assertEqual(events[0]["source_group_id"], 265)
+
+    def test_journaled_writes_apply_to_database(self) -> None:
+        events = load_events_for_runtime(self.db_path)
+        events = [event for event in events if event["_id"] != "b"]
+        events[0]["title"] = "Renamed"
+
+        written = save_event_changes(events, self.db_path)
+
+        self.assertEqual(written, 2)
+        self.assertEqual([event["title"] for event in export_events(self.db_path)], ["Renamed", "a"])
+
+
+if __name__ == "__main__":
+    unittest.main()
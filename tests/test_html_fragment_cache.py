@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from utils import html_fragment_cache, load_html_utils
+from utils.event_model import Event
+from utils.html_fragment_cache import FragmentCache, event_content_hash
+from utils.load_html_utils import gen_div_for_events_from_list, render_event_fragment
+
+
+def _runtime_event(event_id: str, day: int, **fields) -> dict:
+    event = {
+        "_id": event_id,
+        "source_type": "strava",
+        "source_group_id": 265,
+        "source_group_name": "Club",
+        "event_time_utc": datetime(2025, 1, day, 16, 0),
+        "gps_coordinates": "37.4, -122.1",
+        "meet_up_location": "Park",
+        "distance_meters": 50000,
+        "elevation_gain_meters": 600,
+        "organizer": "Alice",
+        "title": f"Ride {event_id}",
+        "description": "See https://example.com",
+        "route_map_url": "https://example.com/map.png",
+        "event_picture_urls": [],
+    }
+    event.update(fields)
+    return event
+
+
+class FragmentCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.events = [_runtime_event(event_id, day) for day, event_id in enumerate("abc", start=1)]
+
+    def test_cached_render_matches_fresh_render(self) -> None:
+        cache = FragmentCache()
+        expected = "".join(render_event_fragment(event, "upcoming", datetime.now().year) for event in self.events)
+
+        self.assertEqual(gen_div_for_events_from_list(self.events, "upcoming", cache), expected)
+        self.assertEqual(gen_div_for_events_from_list(self.events, "upcoming", cache), expected)
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+        models = [Event(event) for event in self.events]
+        self.assertEqual(gen_div_for_events_from_list(models, "upcoming", FragmentCache()), expected)
+
+    def test_only_changed_event_is_rerendered(self) -> None:
+        cache = FragmentCache()
+        gen_div_for_events_from_list(self.events, "past", cache)
+        self.events[1] = dict(self.events[1], title="Renamed")
+
+        html = gen_div_for_events_from_list(self.events, "past", cache)
+
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        self.assertIn("Renamed", html)
+        gen_div_for_events_from_list(self.events, "upcoming", cache)
+        self.assertEqual(cache.misses, 7)
+
+    def test_content_hash_ignores_field_order(self) -> None:
+        event = self.events[0]
+        reordered = dict(reversed(list(event.items())))
+        self.assertEqual(event_content_hash(event), event_content_hash(reordered))
+        self.assertNotEqual(event_content_hash(event), event_content_hash(dict(event, title="x")))
+
+    def test_saved_fragments_reused_by_next_build(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "html_fragments.pickle"
+            first = FragmentCache()
+            gen_div_for_events_from_list(self.events[:1], "past", first)
+            first.save(path)
+
+            second = FragmentCache()
+            self.assertEqual(second.load(path), 1)
+            gen_div_for_events_from_list(self.events, "past", second)
+            self.assertEqual((second.hits, second.misses), (1, 2))
+            self.assertEqual(FragmentCache().load(Path(tmp) / "missing.pickle"), 0)
+
+    def test_saved_fragments_dropped_when_renderer_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "html_fragments.pickle"
+            regions = Path(tmp) / "regions.json"
+            regions.write_text('{"regions": []}', encoding="utf-8")
+            with mock.patch.object(html_fragment_cache, "RENDERER_INPUTS", (regions,)):
+                first = FragmentCache()
+                gen_div_for_events_from_list(self.events, "past", first)
+                first.save(path)
+                self.assertEqual(FragmentCache().load(path), 3)
+
+                regions.write_text('{"regions": [{"code": "norcal"}]}', encoding="utf-8")
+                second = FragmentCache()
+                self.assertEqual(second.load(path), 0)
+                gen_div_for_events_from_list(self.events, "past", second)
+                self.assertEqual((second.hits, second.misses), (0, 3))
+
+    # Lowered so the pool runs on a small list
+    @mock.patch.object(load_html_utils, "PARALLEL_RENDER_THRESHOLD", 64)
+    def test_parallel_render_matches_serial_render(self) -> None:
+        events = [_runtime_event(f"e{number}", number % 28 + 1) for number in range(70)]
+        events = [Event(event) if number % 2 else event for number, event in enumerate(events)]
+        serial = gen_div_for_events_from_list(events, "past", FragmentCache())
+
+        cache = FragmentCache()
+        gen_div_for_events_from_list(events[3:5], "past", cache)
+        self.assertEqual(gen_div_for_events_from_list(events, "past", cache, workers=2), serial)
+        self.assertEqual((cache.hits, cache.misses), (2, len(events)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+import unittest
+from datetime import datetime
+
+from utils.load_html_utils import gen_gmp_advanced_marker_for_events_from_list, serialize_event_markers_to_json
+
+
+def _runtime_event(event_id: str, title: str) -> dict:
+    return {
+        "_id": event_id,
+        "title": title,
+        "source_group_id": 265,
+        "event_time_utc": datetime(2025, 1, 1, 16, 0),
+        "gps_coordinates": "37.4, -122.1",
+        "distance_meters": 50000,
+    }
+
+
+class MarkerSerializationTest(unittest.TestCase):
+    def test_markers_are_escaped_compact_json(self) -> None:
+        title = 'Ride "quoted" </script><script>alert(1)</script> & more\u2028'
+        markers = gen_gmp_advanced_marker_for_events_from_list([_runtime_event("a", title)], "past")
+
+        content = serialize_event_markers_to_json(markers)
+
+        self.assertNotIn("<", content)
+        self.assertNotIn("\u2028", content)
+        self.assertNotIn("\n", content)
+        decoded = json.loads(content)
+        self.assertEqual(decoded[0]["title"], f"JAN 01: {title}")
+        self.assertEqual(decoded[0]["position"], {"lat": 37.4, "lng": -122.1})
+        self.assertEqual(decoded[0]["date_span"], {"month": "JAN", "day": "01"})
+        self.assertEqual(decoded[0]["id"], "event-a")
+        self.assertEqual(serialize_event_markers_to_json([]), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from utils.marker_clusters import MAX_ZOOM, build_marker_clusters, cluster_at_zoom
+
+# Two rides from the same park, one a few km away and one in LA
+POINTS = [
+    ("event-a", 37.44, -122.16),
+    ("event-b", 37.44, -122.16),
+    ("event-c", 37.47, -122.13),
+    ("event-d", 34.05, -118.24),
+]
+
+
+class MarkerClustersTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = build_marker_clusters(POINTS)
+
+    def _groups(self, zoom: int) -> list:
+        groups: dict = {}
+        for marker_id, _, _ in POINTS:
+            row = cluster_at_zoom(self.index, marker_id, zoom)
+            groups.setdefault(marker_id if row is None else row, []).append(marker_id)
+        return sorted(groups.values())
+
+    def test_markers_split_as_the_map_zooms_in(self) -> None:
+        self.assertEqual(self._groups(0), [["event-a", "event-b", "event-c", "event-d"]])
+        self.assertEqual(self._groups(8), [["event-a", "event-b", "event-c"], ["event-d"]])
+        self.assertEqual(self._groups(14), [["event-a", "event-b"], ["event-c"], ["event-d"]])
+        # Markers at the same spot stay clustered past the last clustered zoom
+        self.assertEqual(self._groups(MAX_ZOOM + 3), self._groups(MAX_ZOOM))
+
+    def test_clusters_record_centroid_count_and_parent(self) -> None:
+        clusters = self.index["clusters"]
+        pair = clusters[self.index["points"]["event-a"]]
+        self.assertEqual(pair[:4], [MAX_ZOOM, 37.44, -122.16, 2])
+        for row in clusters:
+            zoom, _, _, count, parent = row
+            if parent >= 0:
+                self.assertLess(clusters[parent][0], zoom)
+                self.assertGreater(clusters[parent][3], count)
+        self.assertEqual(max(row[3] for row in clusters), len(POINTS))
+        json.dumps(self.index)
+
+    def test_lone_marker_is_never_clustered(self) -> None:
+        index = build_marker_clusters(POINTS[:1])
+        self.assertEqual((index["points"], index["clusters"]), ({"event-a": -1}, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
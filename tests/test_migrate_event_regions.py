@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from migrate_event_regions import migrate_regions
+from utils.event_changes import changes_since
+from utils.event_codec import dumps, encode_event
+from utils.event_storage import compact_events_storage, load_stored_events, read_storage_version
+
+
+def _stored_event(event_id: str, gps: str) -> dict:
+    return encode_event(
+        {
+            "_id": event_id,
+            "title": f"Ride {event_id}",
+            "event_time_utc": {"$date": "2025-01-01T16:00:00.000Z"},
+            "gps_coordinates": gps,
+        }
+    )
+
+
+class MigrateEventRegionsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.events_path = Path(self._tmp.name) / "events.json"
+        # A snapshot written before events carried a region_code
+        events = [_stored_event("a", "37.4, -122.1"), _stored_event("b", "34.05, -118.24"), _stored_event("c", "")]
+        self.events_path.write_text(dumps(events) + "\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _regions(self) -> dict:
+        return {event["_id"]: event.get("region_code") for event in load_stored_events(self.events_path)}
+
+    def test_compaction_leaves_content_alone(self) -> None:
+        compact_events_storage(self.events_path)
+
+        self.assertEqual(self._regions(), {"a": None, "b": None, "c": None})
+        self.assertEqual(read_storage_version(self.events_path), 0)
+
+    def test_migration_goes_through_a_change_set(self) -> None:
+        self.assertEqual(migrate_regions(self.events_path, dry_run=True), 0)
+        self.assertEqual(read_storage_version(self.events_path), 0)
+
+        self.assertEqual(migrate_regions(self.events_path), 3)
+
+        self.assertEqual(self._regions(), {"a": "norcal", "b": "socal", "c": ""})
+        self.assertEqual(read_storage_version(self.events_path), 1)
+        changes = changes_since(self.events_path, 0, 1)
+        updated = {event_id: sorted(fields) for event_id, fields in changes["updated"].items()}
+        self.assertEqual(updated, {"a": ["region_code"], "b": ["region_code"], "c": ["region_code"]})
+        # Already tagged: nothing left to write
+        self.assertEqual(migrate_regions(self.events_path), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
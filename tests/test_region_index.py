@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import unittest
+
+from utils.region_index import RegionIndex, default_region_index, region_name, tag_event_regions
+
+# A triangle over a square: the first region listed wins where they overlap
+REGIONS = {
+    "cell_degrees": 1.0,
+    "regions": [
+        {"code": "tri", "name": "Triangle", "polygon": [[0, 0], [0, 4], [4, 0]]},
+        {"code": "box", "name": "Box", "polygon": [[0, 0], [0, 6], [6, 6], [6, 0]]},
+    ],
+}
+
+
+class RegionIndexTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.index = RegionIndex.from_dict(REGIONS)
+
+    def test_first_containing_region_wins(self) -> None:
+        self.assertEqual(self.index.code_for_gps("1, 1"), "tri")
+        self.assertEqual(self.index.code_for_gps("3.5, 3.5"), "box")
+        self.assertEqual(self.index.code_for_gps("7, 1"), "")
+        self.assertEqual(self.index.code_for_gps(""), "")
+
+    def test_points_on_an_edge_are_inside(self) -> None:
+        self.assertEqual(self.index.code_for_gps("2, 2"), "tri")
+        self.assertEqual(self.index.code_for_gps("6, 6"), "box")
+        self.assertEqual(self.index.code_for_gps("0, 5"), "box")
+
+    def test_cells_inside_a_polygon_skip_the_polygon_test(self) -> None:
+        covers = {(cell, region.code): whole for cell, entries in self.index.cells.items() for region, whole in entries}
+        self.assertTrue(covers[((0, 0), "tri")])
+        # The diagonal edge runs through this cell
+        self.assertFalse(covers[((1, 2), "tri")])
+        self.assertTrue(covers[((1, 2), "box")])
+
+    def test_default_regions_match_the_area_labels(self) -> None:
+        events = [
+            {"gps_coordinates": "37.4, -122.1"},
+            {"gps_coordinates": "34.05, -118.24"},
+            {"gps_coordinates": "47.6, -122.3"},
+        ]
+        tag_event_regions(events)
+
+        self.assertEqual([event["region_code"] for event in events], ["norcal", "socal", ""])
+        self.assertEqual([region_name(event) for event in events], ["北加", "南加", ""])
+        # Events stored before tagging are looked up
+        self.assertEqual(region_name({"gps_coordinates": "35, -120"}), "北加")
+        self.assertEqual(default_region_index().names(), {"norcal": "北加", "socal": "南加"})
+
+
+if __name__ == "__main__":
+    unittest.main()
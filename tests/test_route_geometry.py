@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import unittest
+
+from utils.route_geometry import RouteGeometry, RoutePack, build_route_pack, route_hash
+from utils.route_utils import classify_route_loop, decode_polyline
+
+
+SAMPLE_POLYLINE = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+SQUARE_LOOP = [(37.0, -122.0), (37.0, -121.99), (37.01, -121.99), (37.01, -122.0), (37.0, -122.0)]
+
+
+class RouteGeometryTest(unittest.TestCase):
+    def test_polyline_round_trip(self) -> None:
+        geometry = RouteGeometry.from_polyline(SAMPLE_POLYLINE)
+
+        self.assertEqual(len(geometry), 3)
+        self.assertEqual(geometry.to_polyline(), SAMPLE_POLYLINE)
+        self.assertEqual(geometry.coordinates(), decode_polyline(SAMPLE_POLYLINE))
+
+    def test_bytes_round_trip_with_and_without_compression(self) -> None:
+        geometry = RouteGeometry.from_coordinates(SQUARE_LOOP)
+
+        for compress in (False, True):
+            restored = RouteGeometry.from_bytes(geometry.to_bytes(compress=compress))
+            self.assertEqual(restored.coordinates(), geometry.coordinates())
+
+    def test_uncompressed_load_is_a_view_of_the_buffer(self) -> None:
+        buffer = bytearray(RouteGeometry.from_coordinates(SQUARE_LOOP).to_bytes())
+
+        restored = RouteGeometry.from_bytes(buffer)
+
+        self.assertIsInstance(restored.deltas, memoryview)
+        self.assertEqual(restored.deltas.obj, buffer)
+
+    def test_pack_deduplicates_routes_and_feeds_analytics(self) -> None:
+        loop = RouteGeometry.from_coordinates(SQUARE_LOOP).to_polyline()
+        events = [
+            {"_id": "a", "route_polyline": loop},
+            {"_id": "b", "route_polyline": loop},
+            {"_id": "c", "route_polyline": ""},
+        ]
+
+        pack = RoutePack(build_route_pack(events))
+
+        self.assertEqual(len(pack), 1)
+        self.assertEqual(pack.events, {"a": route_hash(loop), "b": route_hash(loop)})
+        self.assertEqual(classify_route_loop(pack.for_event("a")), classify_route_loop(loop))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import base64
+import json
+import unittest
+
+from utils.constants import PolylineFormat
+from utils.route_utils import (
+    annotate_route_extent,
+    build_route_grid_index,
+    canonicalize_event_route,
+    compute_route_extent,
+    decode_polyline,
+    encode_polyline,
+    is_canonical_polyline,
+    normalize_route_polyline,
+)
+
+
+# Google's reference polyline: (38.5, -120.2), (40.7, -120.95), (43.252, -126.453)
+SAMPLE_POLYLINE = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+
+
+class RouteExtentTest(unittest.TestCase):
+    def test_computes_bbox_centroid_and_length(self) -> None:
+        extent = compute_route_extent(SAMPLE_POLYLINE)
+
+        self.assertEqual(extent["route_bbox"], [38.5, -126.453, 43.252, -120.2])
+        self.assertEqual(extent["route_centroid"], [40.81733, -122.53433])
+        self.assertAlmostEqual(extent["route_length_meters"], 790_000, delta=10_000)
+
+    def test_invalid_polyline_yields_no_extent(self) -> None:
+        self.assertEqual(compute_route_extent(""), {})
+        self.assertEqual(compute_route_extent("_p~iF~ps|U_ulL"), {})
+
+    def test_annotate_clears_stale_extent(self) -> None:
+        event = {"route_polyline": "", "route_bbox": [0, 0, 1, 1]}
+
+        annotate_route_extent(event)
+
+        self.assertNotIn("route_bbox", event)
+
+    def test_grid_index_registers_every_touched_cell(self) -> None:
+        events = [
+            {"_id": "a", "route_bbox": [37.1, -122.4, 37.3, -122.1]},
+            {"_id": "b", "route_polyline": ""},
+        ]
+
+        index = build_route_grid_index(events, cell_degrees=0.25)
+
+        self.assertEqual(index["cell_degrees"], 0.25)
+        self.assertEqual(
+            set(index["cells"]),
+            {"148,-490", "148,-489", "149,-490", "149,-489"},
+        )
+        self.assertEqual(index["cells"]["148,-490"], ["event-a"])
+
+
+class NormalizeRoutePolylineTest(unittest.TestCase):
+    def test_plain_polyline_is_already_canonical(self) -> None:
+        self.assertEqual(
+            normalize_route_polyline(SAMPLE_POLYLINE),
+            (SAMPLE_POLYLINE, PolylineFormat.GOOGLE),
+        )
+
+    def test_unwraps_base64_polylines(self) -> None:
+        wrapped = base64.b64encode(SAMPLE_POLYLINE.encode("utf-8")).decode("ascii")
+
+        self.assertEqual(
+            normalize_route_polyline(wrapped),
+            (SAMPLE_POLYLINE, PolylineFormat.BASE64),
+        )
+
+    def test_letters_only_polylines_are_not_read_as_base64(self) -> None:
+        # Also valid base64 text, which decodes to bytes outside the alphabet
+        self.assertEqual(normalize_route_polyline("XkhcFjEK")[1], PolylineFormat.GOOGLE)
+        self.assertEqual(decode_polyline(normalize_route_polyline("XkhcFjEK")[0]), decode_polyline("XkhcFjEK"))
+
+    def test_format_check_does_not_decode(self) -> None:
+        self.assertTrue(is_canonical_polyline(SAMPLE_POLYLINE))
+        self.assertTrue(is_canonical_polyline(""))
+        self.assertFalse(is_canonical_polyline(base64.b64encode(SAMPLE_POLYLINE.encode("utf-8")).decode("ascii")))
+        self.assertFalse(is_canonical_polyline(SAMPLE_POLYLINE[:-1]))
+        self.assertFalse(is_canonical_polyline([[38.5, -120.2]]))
+
+    def test_rescales_precision6_polylines(self) -> None:
+        points = decode_polyline(SAMPLE_POLYLINE)
+
+        self.assertEqual(
+            normalize_route_polyline(encode_polyline(points, precision=6)),
+            (SAMPLE_POLYLINE, PolylineFormat.PRECISION6),
+        )
+
+    def test_encodes_garmin_geo_polyline_payloads(self) -> None:
+        payload = {"polyline": [{"lat": lat, "lon": lng} for lat, lng in decode_polyline(SAMPLE_POLYLINE)]}
+
+        self.assertEqual(
+            normalize_route_polyline(json.dumps(payload)),
+            (SAMPLE_POLYLINE, PolylineFormat.GARMIN),
+        )
+
+    def test_ingest_guard_drops_unreadable_routes(self) -> None:
+        event = {"_id": "bad", "route_polyline": "_p~iF~ps|U_ulL"}
+
+        canonicalize_event_route(event)
+
+        self.assertEqual(event["route_polyline"], "")
+
+
+if __name__ == "__main__":
+    unittest.main()
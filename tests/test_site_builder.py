@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from utils.event_archive import ARCHIVE_DIR_NAME
+from utils.event_codec import loads
+from utils.event_pages import event_page_name
+from utils.event_storage import BASE_DIR, save_event_changes, save_events_to_storage
+from utils.route_geometry import route_hash
+from utils.site_builder import (
+    Artifact,
+    BuildContext,
+    EventArchive,
+    EventPages,
+    RegionPages,
+    build_site,
+    default_artifacts,
+    render_main_page,
+    select_archive,
+    select_event_pages,
+    select_norcal_page,
+    select_region_page,
+    select_regions,
+)
+
+NOW = datetime(2025, 1, 10, 12, 0)
+
+
+def _stored_event(event_id: str, date: str, group_id: int) -> dict:
+    return {
+        "_id": event_id,
+        "title": f"Ride {event_id}",
+        "source_type": "strava",
+        "source_group_id": {"$numberLong": str(group_id)},
+        "source_group_name": "Club",
+        "event_time_utc": {"$date": f"{date}T16:00:00.000Z"},
+        "gps_coordinates": "37.4, -122.1",
+        "is_active": True,
+    }
+
+
+def _select_group_265(context) -> dict:
+    return {"past": context.events().query(group_ids={265})}
+
+
+def _render_titles(context, template: str, selection: dict) -> str:
+    return template.replace("{{titles}}", ", ".join(event["title"] for event in selection["past"]))
+
+
+class SiteBuilderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.events_path = self.root / "storage" / "events.json"
+        self.manifest_path = self.root / "storage" / "build_manifest.json"
+        self.events = [_stored_event("a", "2025-01-01", 265), _stored_event("b", "2025-01-02", 908336)]
+        save_events_to_storage(self.events, self.events_path)
+        (self.root / "page_template.html").write_text("<p>{{titles}}</p>", encoding="utf-8")
+        (self.root / "styles.css").write_text("p {}", encoding="utf-8")
+        self.artifact = Artifact("page", "page.html", "page_template.html", ["styles.css"], _select_group_265, _render_titles)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _build(self, artifacts=None, **kwargs):
+        return build_site(
+            artifacts or [self.artifact],
+            root=self.root,
+            events_path=self.events_path,
+            manifest_path=self.manifest_path,
+            now=NOW,
+            **kwargs,
+        )
+
+    def test_rebuilds_only_when_inputs_change(self) -> None:
+        first = self._build()
+        self.assertEqual(first[0].reasons, ["no previous build recorded"])
+        self.assertEqual((self.root / "page.html").read_text(encoding="utf-8"), "<p>Ride a</p>")
+
+        second = self._build()
+        self.assertEqual((second[0].reasons, second[0].written), ([], False))
+
+        # Event b is not on the page, so changing it does not rebuild it
+        save_event_changes([self.events[0], dict(self.events[1], title="Other")], self.events_path)
+        self.assertEqual(self._build()[0].reasons, [])
+
+        save_event_changes([dict(self.events[0], title="Renamed"), self.events[1]], self.events_path)
+        self.assertEqual(self._build()[0].reasons, ["events changed"])
+        self.assertEqual((self.root / "page.html").read_text(encoding="utf-8"), "<p>Renamed</p>")
+
+        (self.root / "styles.css").write_text("p { color: red; }", encoding="utf-8")
+        (self.root / "page_template.html").write_text("<div>{{titles}}</div>", encoding="utf-8")
+        self.assertEqual(self._build()[0].reasons, ["page_template.html changed", "styles.css changed"])
+
+    def test_missing_or_edited_output_is_rebuilt(self) -> None:
+        self._build()
+        (self.root / "page.html").write_text("edited", encoding="utf-8")
+        self.assertEqual(self._build()[0].reasons, ["output modified since the last build"])
+        (self.root / "page.html").unlink()
+        self.assertEqual(self._build()[0].reasons, ["output missing"])
+        self.assertEqual(self._build(force=True)[0].reasons, ["forced"])
+
+    def test_dry_run_writes_nothing(self) -> None:
+        results = self._build(dry_run=True)
+        self.assertEqual((results[0].reasons, results[0].written), (["no previous build recorded"], False))
+        self.assertFalse((self.root / "page.html").exists())
+        self.assertFalse(self.manifest_path.exists())
+
+    def test_default_pages_render(self) -> None:
+        for artifact in default_artifacts():
+            if not hasattr(artifact, "template"):
+                continue
+            target = self.root / artifact.template
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(BASE_DIR / artifact.template, target)
+
+        # Rides from months ago stay on the main page for the map's past-event toggle
+        save_event_changes(self.events + [_stored_event("c", "2024-09-01", 265)], self.events_path)
+        results = self._build(default_artifacts())
+
+        self.assertTrue(all(result.written for result in results))
+        main_page = (self.root / "deprecated" / "index.html").read_text(encoding="utf-8")
+        self.assertIn('data-event-id="event-a"', main_page)
+        self.assertIn('data-event-id="event-b"', main_page)
+        self.assertIn('data-event-id="event-c"', main_page)
+        self.assertNotIn("{{list_content}}", main_page)
+        self.assertTrue(all(not result.reasons for result in self._build(default_artifacts())))
+
+    def test_norcal_page_lists_every_norcal_ride(self) -> None:
+        # Rides years ago and still to come are listed, not only the past year
+        save_event_changes(
+            self.events + [_stored_event("old", "2023-06-01", 1157973), _stored_event("next", "2025-03-01", 1157973)],
+            self.events_path,
+        )
+        selection = select_norcal_page(BuildContext(self.root, self.events_path, NOW))
+
+        self.assertEqual([event["_id"] for event in selection["past"]], ["next", "old"])
+
+    def test_event_pages_rebuilt_per_event(self) -> None:
+        shutil.copy(BASE_DIR / "event_page_template.html", self.root / "event_page_template.html")
+        pages = EventPages("event-pages", "events", "event_page_template.html", [], select_event_pages)
+        page_a = self.root / "events" / event_page_name("a")
+
+        first = self._build([pages])
+        self.assertEqual(first[0].reasons, ["no previous build recorded", "2 of 2 page(s) written"])
+        html = page_a.read_text(encoding="utf-8")
+        self.assertIn('<meta property="og:title" content="Ride a">', html)
+        self.assertIn('<meta property="og:url" content="https://haoqiyou.net/events/event-a.html">', html)
+        self.assertIn('<div id="event-a">', html)
+        self.assertEqual(self._build([pages])[0].reasons, [])
+
+        save_event_changes([dict(self.events[0], title="Renamed"), self.events[1]], self.events_path)
+        self.assertEqual(self._build([pages])[0].reasons, ["1 changed page(s)", "1 of 2 page(s) written"])
+        self.assertIn("Renamed", page_a.read_text(encoding="utf-8"))
+
+        save_event_changes([dict(self.events[0], is_active=False), self.events[1]], self.events_path)
+        self.assertEqual(self._build([pages])[0].reasons, ["1 removed page(s)", "0 of 1 page(s) written"])
+        self.assertFalse(page_a.exists())
+
+    def test_event_archive_chunks_past_events(self) -> None:
+        # Five older events fill one chunk of three plus a newer partial chunk;
+        # the recent past event stays in the head with the upcoming one
+        past = [_stored_event(f"p{day}", f"2024-10-0{day}", 265) for day in range(1, 6)]
+        past[3]["route_polyline"] = "_p~iF~ps|U_ulLnnqC_mqNvxq`@"
+        hot = [_stored_event("r", "2025-01-05", 265), _stored_event("u", "2025-01-12", 265)]
+        save_events_to_storage(past + hot, self.events_path)
+        archive = EventArchive("event-archive", ARCHIVE_DIR_NAME, select_archive, chunk_size=3)
+        archive_dir = self.root / ARCHIVE_DIR_NAME
+
+        self.assertEqual(self._build([archive])[0].reasons, ["no previous build recorded"])
+        index = loads((archive_dir / "index.json").read_text(encoding="utf-8"))
+        self.assertEqual([chunk["count"] for chunk in index["chunks"]], [3, 2])
+        self.assertEqual((index["head"]["file"], index["head"]["count"]), ("head.json", 2))
+        newest = loads((archive_dir / index["chunks"][-1]["file"]).read_text(encoding="utf-8"))
+        self.assertEqual([event["_id"] for event in newest], ["p4", "p5"])
+        self.assertEqual(newest[0]["event_time_utc"], {"$date": "2024-10-04T16:00:00.000Z"})
+        # Polylines are fetched per route, by hash
+        self.assertEqual(newest[0]["route_hash"], route_hash(past[3]["route_polyline"]))
+        self.assertNotIn("route_polyline", newest[0])
+        # Precompressed siblings, and events.json named by hash for the fallback
+        chunk_path = archive_dir / index["chunks"][-1]["file"]
+        self.assertEqual(gzip.decompress(chunk_path.with_name(chunk_path.name + ".gz").read_bytes()), chunk_path.read_bytes())
+        self.assertEqual(index["events"]["sha256"], hashlib.sha256(self.events_path.read_bytes()).hexdigest())
+        self.assertEqual(self._build([archive])[0].reasons, [])
+        chunk_path.with_name(chunk_path.name + ".gz").unlink()
+        self.assertEqual(self._build([archive])[0].reasons, ["1 of 5 file(s) changed"])
+
+        # New history only rewrites the newest chunk, the map clusters and the index
+        save_event_changes(past + [_stored_event("p6", "2024-10-06", 265)] + hot, self.events_path)
+        self.assertEqual(self._build([archive])[0].reasons, ["3 of 5 file(s) changed"])
+
+    def test_region_pages_and_bundles_per_region(self) -> None:
+        (self.root / "page_template.html").write_text("{{list_content}}", encoding="utf-8")
+        regions = RegionPages(
+            "regions", "regions", "page_template.html", [], select_regions, select_region_page, render_main_page
+        )
+        socal = dict(_stored_event("la", "2025-01-12", 265), gps_coordinates="34.05, -118.24")
+        save_events_to_storage(self.events + [socal], self.events_path)
+        regions_dir = self.root / "regions"
+
+        self.assertEqual(self._build([regions])[0].reasons, ["no previous build recorded"])
+        self.assertEqual(sorted(path.name for path in regions_dir.iterdir()), ["norcal.html", "norcal.json", "socal.html", "socal.json"])
+        norcal_page = (regions_dir / "norcal.html").read_text(encoding="utf-8")
+        self.assertIn('data-event-id="event-a"', norcal_page)
+        self.assertNotIn('data-event-id="event-la"', norcal_page)
+        bundle = loads((regions_dir / "socal.json").read_text(encoding="utf-8"))
+        self.assertEqual([(event["_id"], event["region_code"]) for event in bundle], [("la", "socal")])
+        self.assertEqual(self._build([regions])[0].reasons, [])
+
+        # Only the region whose events changed is rebuilt
+        save_event_changes([dict(self.events[0], title="Renamed"), self.events[1], socal], self.events_path)
+        self.assertEqual(self._build([regions])[0].reasons, ["1 of 2 page(s) changed", "1 of 2 bundle(s) changed"])
+
+        # Regions left without events are removed
+        save_event_changes([dict(self.events[0], title="Renamed"), self.events[1]], self.events_path)
+        self.assertEqual(self._build([regions])[0].reasons, ["2 removed file(s)"])
+        self.assertFalse((regions_dir / "socal.html").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
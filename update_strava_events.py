@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from dotenv import load_dotenv
 import datetime
-import json
 import os
 from pathlib import Path
 import re
@@ -10,7 +9,10 @@ from typing import Any, Dict, List, Optional
 import pytz
 import requests
 
+from utils.event_codec import encode_event
+from utils.event_storage import commit_event_changes, load_events_for_update
 from utils.extract_route_from_ridewithgps import extract_route_from_ridewithgps
+from utils.route_utils import canonicalize_event_route, compute_route_extent
 
 # Load environment variables from .env file
 load_dotenv()
@@ -29,52 +31,6 @@ STRAVA_REFRESH_TOKEN = os.getenv('STRAVA_REFRESH_TOKEN')
 access_token = None
 
 
-def wrap_number_long(value: Any) -> Dict[str, str] | None:
-    """Wrap numeric identifiers using Mongo Extended JSON style."""
-    if value is None:
-        return None
-    if isinstance(value, dict) and "$numberLong" in value:
-        return value
-    return {"$numberLong": str(value)}
-
-
-def isoformat_datetime(value: datetime.datetime) -> str:
-    """Return an ISO-8601 string including milliseconds when absent."""
-    iso_value = value.isoformat()
-    if value.microsecond == 0 and "." not in iso_value:
-        if iso_value.endswith("Z"):
-            return f"{iso_value[:-1]}.000Z"
-        for tz_sep in ("+", "-"):
-            idx = iso_value.rfind(tz_sep)
-            if idx > 10:
-                base = iso_value[:idx]
-                suffix = iso_value[idx + 1:]
-                return f"{base}.000{tz_sep}{suffix}"
-        return f"{iso_value}.000"
-    return iso_value
-
-
-def wrap_date(value: Any) -> Dict[str, str] | None:
-    """Encapsulate datetime strings using Mongo Extended JSON $date."""
-    if value is None:
-        return None
-    if isinstance(value, dict) and "$date" in value:
-        return value
-    if isinstance(value, datetime.datetime):
-        iso_value = isoformat_datetime(value)
-    else:
-        iso_value = str(value)
-    return {"$date": iso_value}
-
-
-def ensure_list_of_strings(value: Any) -> List[str]:
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return [str(item) for item in value if item]
-    return [str(value)]
-
-
 def _is_empty_value(value: Any) -> bool:
     if value is None:
         return True
@@ -158,58 +114,6 @@ def _extract_route_polyline_from_garmin_url(course_url: str) -> str:
     return polyline if isinstance(polyline, str) else ""
 
 
-def clean_dict(data: Dict[str, Any]) -> Dict[str, Any]:
-    cleaned: Dict[str, Any] = {}
-    for key, value in data.items():
-        if value is None:
-            continue
-        if isinstance(value, dict):
-            nested = clean_dict(value)
-            if nested:
-                cleaned[key] = nested
-            continue
-        if isinstance(value, list):
-            cleaned_list = [item for item in value if item not in (None, "")]
-            cleaned[key] = cleaned_list
-            continue
-        cleaned[key] = value
-    return cleaned
-
-
-def dehydrate_event_document(event_document: Dict[str, Any]) -> Dict[str, Any]:
-    dehydrated = {k: v for k, v in event_document.items() if k != 'raw_event'}
-
-    dehydrated['source_event_id'] = wrap_number_long(dehydrated.get('source_event_id'))
-    dehydrated['source_group_id'] = wrap_number_long(dehydrated.get('source_group_id'))
-    dehydrated['event_time_utc'] = wrap_date(dehydrated.get('event_time_utc'))
-
-    if 'event_picture_urls' in dehydrated:
-        dehydrated['event_picture_urls'] = ensure_list_of_strings(dehydrated['event_picture_urls'])
-    elif 'event_picture_url' in dehydrated:
-        dehydrated['event_picture_urls'] = ensure_list_of_strings(dehydrated['event_picture_url'])
-        dehydrated.pop('event_picture_url', None)
-    else:
-        dehydrated['event_picture_urls'] = []
-
-    if not dehydrated.get('source_url'):
-        dehydrated['source_url'] = dehydrated.get('strava_url', '')
-
-    return clean_dict(dehydrated)
-
-
-def _load_existing_events(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists():
-        return []
-    try:
-        with path.open('r', encoding='utf-8') as fh:
-            data = json.load(fh)
-            if isinstance(data, list):
-                return data
-    except (json.JSONDecodeError, OSError) as exc:
-        print(f"Warning: unable to read existing events from {path}: {exc}")
-    return []
-
-
 def _strava_event_key(event: Dict[str, Any]) -> Optional[str]:
     if event.get('source_type') != 'strava':
         return None
@@ -520,18 +424,18 @@ for club_id, event_id, event in all_events_list:
         'is_active': True,
         'raw_event': event
     }
+    canonicalize_event_route(event_document)
+    event_document.update(compute_route_extent(event_document['route_polyline']))
 
     # DEBUG: print event_document without raw_event
     # print({k: v for k, v in event_document.items() if k != 'raw_event'})
-    event_documents.append(dehydrate_event_document(event_document))
+    event_documents.append(encode_event(event_document))
 
-existing_events = _load_existing_events(EVENTS_FILE_PATH)
+existing_events, base_version = load_events_for_update(EVENTS_FILE_PATH)
 merged_events = _merge_events(existing_events, event_documents)
-
-EVENTS_FILE_PATH.parent.mkdir(parents=True, exist_ok=True)
-with EVENTS_FILE_PATH.open('w', encoding='utf-8') as events_file:
-    json.dump(merged_events, events_file, indent=2)
+journaled = commit_event_changes(merged_events, existing_events, base_version, EVENTS_FILE_PATH)
 
 print(
-    f"Stored {len(event_documents)} Strava events (total records: {len(merged_events)}) in {EVENTS_FILE_PATH}"
+    f"Stored {len(event_documents)} Strava events (total records: {len(merged_events)}, "
+    f"{journaled} journaled changes) in {EVENTS_FILE_PATH}"
 )
@@ -28,12 +28,15 @@ if str(UTILS_DIR) not in sys.path:
 from extract_route_from_garmin import extract_route_from_garmin
 from extract_route_from_ridewithgps import extract_route_from_ridewithgps
 from extract_route_from_strava import extract_route_from_strava
+from event_bundle import write_local_events_bundle
+from event_codec import wrap_date
 from event_storage import (
     DEFAULT_EVENTS_FILE,
-    load_events_for_runtime,
+    commit_event_changes,
+    load_events_for_update,
     normalize_event_for_runtime,
-    save_events_to_storage,
 )
+from route_utils import annotate_route_extent, canonicalize_event_route
 
 
 ALTOVELO_EVENTS_URL = "https://www.altovelo.org/a-ride"
@@ -563,8 +566,7 @@ def _format_event_time(event_date: str, start_time: str) -> Optional[Dict[str, s
         return None
     time_obj = _parse_start_time_to_time(start_time)
     local_dt = PACIFIC_TZ.localize(datetime.combine(date_obj, time_obj))
-    utc_dt = local_dt.astimezone(pytz.utc)
-    return {"$date": utc_dt.strftime("%Y-%m-%dT%H:%M:%S.%fZ")}
+    return wrap_date(local_dt)
 
 
 def _generate_event_id(event_date: str) -> str:
@@ -641,7 +643,7 @@ def build_event_record(event_summary: Dict[str, str], detail: Dict[str, object])
         "event_picture_urls": [],
         "source_url": event_summary.get("event_url", ""),
     }
-    return record
+    return annotate_route_extent(canonicalize_event_route(record))
 
 
 def _event_merge_key(event: Dict[str, object]) -> str:
@@ -690,11 +692,7 @@ def _merge_webpage_events(
 
 
 def _refresh_local_events_bundle(events_path: Path = DEFAULT_EVENTS_FILE) -> None:
-    with events_path.open("r", encoding="utf-8") as infile:
-        data = json.load(infile)
-
-    js_content = f"window.LOCAL_EVENTS_DATA = {json.dumps(data, ensure_ascii=False, indent=2)};"
-    EVENTS_JS_PATH.write_text(js_content, encoding="utf-8")
+    write_local_events_bundle(events_path, EVENTS_JS_PATH)
 
 
 def main() -> None:
@@ -724,16 +722,16 @@ def main() -> None:
         print("No recent Alto Velo webpage events were extracted.")
         return
 
-    existing_events = load_events_for_runtime(DEFAULT_EVENTS_FILE)
+    existing_events, base_version = load_events_for_update(DEFAULT_EVENTS_FILE, runtime=True)
     merged_events, added_count, updated_count = _merge_webpage_events(
         existing_events,
         detailed_events,
     )
-    save_events_to_storage(merged_events, DEFAULT_EVENTS_FILE)
+    journaled = commit_event_changes(merged_events, existing_events, base_version, DEFAULT_EVENTS_FILE)
     _refresh_local_events_bundle(DEFAULT_EVENTS_FILE)
     print(
         "Saved Alto Velo webpage events directly to "
-        f"{DEFAULT_EVENTS_FILE} ({added_count} added, {updated_count} updated)"
+        f"{DEFAULT_EVENTS_FILE} ({added_count} added, {updated_count} updated, {journaled} journaled)"
     )
     print(f"Refreshed local events bundle at {EVENTS_JS_PATH}")
 
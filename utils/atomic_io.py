@@ -0,0 +1,94 @@
+"""Crash-safe file replacement and advisory locks for files under storage/."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+try:  # fcntl is POSIX-only; elsewhere locks degrade to in-process only.
+    import fcntl
+except ImportError:  # pragma: no cover - exercised on Windows
+    fcntl = None
+
+DEFAULT_FILE_MODE = 0o644
+
+# Lock file -> (nesting depth, held shared)
+_held_locks: Dict[str, Tuple[int, bool]] = {}
+_held_locks_guard = threading.RLock()
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` via a synced temp file and ``os.replace``.
+
+    Readers see either the old file or the new one, never a truncated write.
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mkstemp creates 0600 files; keep the mode the replaced file had.
+    mode = path.stat().st_mode & 0o777 if path.exists() else DEFAULT_FILE_MODE
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as outfile:
+            outfile.write(data)
+            outfile.flush()
+            os.fsync(outfile.fileno())
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8") -> None:
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def lock_path_for(path: Path) -> Path:
+    return path.with_name(path.stem + ".lock")
+
+
+@contextmanager
+def file_lock(path: Path, *, shared: bool = False) -> Iterator[None]:
+    """Hold an advisory lock on ``path``'s lock file for the ``with`` block.
+
+    Nested acquisitions of the same lock in one process are no-ops, so helpers
+    that lock can call each other. Asking for the exclusive lock while only
+    the shared one is held raises ``RuntimeError``: flock cannot upgrade
+    atomically, and a silent no-op would let the caller race with writers.
+    """
+
+    lock_path = lock_path_for(path)
+    key = str(lock_path.resolve())
+    with _held_locks_guard:
+        held = _held_locks.get(key)
+        if held is not None:
+            depth, held_shared = held
+            if held_shared and not shared:
+                raise RuntimeError(f"Cannot upgrade the shared lock on {lock_path} to an exclusive lock")
+            _held_locks[key] = (depth + 1, held_shared)
+    if held is not None:
+        try:
+            yield
+        finally:
+            with _held_locks_guard:
+                depth, held_shared = _held_locks[key]
+                _held_locks[key] = (depth - 1, held_shared)
+        return
+
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        with _held_locks_guard:
+            _held_locks[key] = (1, shared)
+        try:
+            yield
+        finally:
+            with _held_locks_guard:
+                _held_locks.pop(key, None)
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
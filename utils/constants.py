@@ -10,3 +10,13 @@ class RouteOrientation(str, Enum):
 
     CLOCKWISE = "clockwise"
     COUNTERCLOCKWISE = "counterclockwise"
+
+
+class PolylineFormat(str, Enum):
+    """Encodings that stored route polylines have been found in."""
+
+    EMPTY = "empty"
+    GOOGLE = "google"
+    BASE64 = "base64"
+    PRECISION6 = "precision6"
+    GARMIN = "garmin"
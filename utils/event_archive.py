@@ -0,0 +1,168 @@
+"""Past events as fixed-size, time-ordered chunks for lazy loading.
+
+The main page used to download every event in events.json before its
+first paint. ``storage/archive`` splits the same storage-form events into
+``head.json``, the hot set (the upcoming and planning lists at build time
+plus the last ``HOT_PAST_DAYS`` of past events, which the page and map
+show by default), and ``past-NNNN.json`` chunks of ``ARCHIVE_CHUNK_SIZE``
+older events each, numbered from the oldest. Filling
+chunks from the oldest keeps them stable: new history only touches the
+newest chunk, so older chunks keep their hash and stay cached. ``index.json``
+lists the head and the chunks with their time range, count and hash; the
+page renders the head first and fetches older chunks as the user scrolls.
+``clusters.json`` is the map's multi-zoom cluster index over every event,
+so markers cluster the same way however many chunks are loaded, and
+``regions`` in the index names the events' ``region_code`` values.
+Route polylines are left out of every file in favour of a ``route_hash``;
+the map fetches a route from storage/routes when it draws it.
+
+Only the index is fetched uncached. Every other file, and events.json for
+the page's fallback path, is requested as ``<file>?v=<sha256 prefix>`` from
+its index entry, so browsers cache it until its content changes. Each file
+is written with precompressed siblings (``.gz``, and ``.br`` when the
+brotli package is installed) for servers that serve them directly.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from utils.atomic_io import atomic_write_bytes, atomic_write_text
+from utils.event_codec import dumps, encode_event, isoformat_datetime
+from utils.event_model import parse_gps_coordinates
+from utils.marker_clusters import build_marker_clusters
+from utils.region_index import default_region_index, event_region_code
+from utils.route_geometry import strip_route_polyline
+
+try:  # Optional; without it only the .gz siblings are written.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+ARCHIVE_FORMAT = 1
+ARCHIVE_DIR_NAME = "storage/archive"
+ARCHIVE_INDEX_FILE_NAME = "index.json"
+HEAD_FILE_NAME = "head.json"
+CLUSTERS_FILE_NAME = "clusters.json"
+CHUNK_FILE_TEMPLATE = "past-{number:04d}.json"
+# About 90 kB of events.json per chunk.
+ARCHIVE_CHUNK_SIZE = 25
+# Ongoing events that started in the last 6 hours still count as upcoming.
+UPCOMING_GRACE = timedelta(hours=6)
+# Past events the head carries: the two months shown before the ">2 months" toggle.
+HOT_PAST_DAYS = 62
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def archive_cutoff(now: datetime) -> datetime:
+    """Start of the head: the oldest past event the page shows by default."""
+
+    return now - UPCOMING_GRACE - timedelta(days=HOT_PAST_DAYS)
+
+
+def _entry(file_name: str, content: str, events: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    entry: Dict[str, Any] = {
+        "file": file_name,
+        "count": len(events),
+        "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+    }
+    if events:
+        entry["start"] = isoformat_datetime(events[0]["event_time_utc"])
+        entry["end"] = isoformat_datetime(events[-1]["event_time_utc"])
+    return entry
+
+
+def dump_events(events: Sequence[Mapping[str, Any]]) -> str:
+    """Compact storage-form JSON for ``events``.
+
+    Each event gets its ``region_code`` and a ``route_hash`` in place of the
+    polyline.
+    """
+
+    summaries = []
+    for event in events:
+        stored = encode_event(dict(event.items()))
+        stored["region_code"] = event_region_code(stored)
+        summaries.append(strip_route_polyline(stored))
+    return dumps(summaries, pretty=False) + "\n"
+
+
+def precompress(content: str) -> Dict[str, bytes]:
+    """Compressed copies of ``content`` by file suffix.
+
+    The gzip header carries no timestamp, so unchanged content compresses
+    to unchanged bytes.
+    """
+
+    data = content.encode("utf-8")
+    compressed = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed[".br"] = brotli.compress(data)
+    return compressed
+
+
+def write_archive_file(path: Path, content: str) -> None:
+    """Write ``content`` and its precompressed siblings."""
+
+    atomic_write_text(path, content)
+    for suffix, data in precompress(content).items():
+        atomic_write_bytes(path.with_name(path.name + suffix), data)
+
+
+def remove_archive_file(path: Path) -> None:
+    path.unlink(missing_ok=True)
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def build_archive(
+    events: Sequence[Mapping[str, Any]],
+    now: datetime,
+    chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    events_sha256: Optional[str] = None,
+) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """Split runtime ``events`` into the archive index and its files.
+
+    Returns the index and a mapping of file name to content, index included.
+    ``events`` must be sorted by time, as ``EventIndex`` keeps them.
+    ``events_sha256`` is the digest of storage/events.json, recorded so the
+    page's fallback can fetch it cacheably.
+    """
+
+    cutoff = archive_cutoff(now)
+    split = next((position for position, event in enumerate(events) if event["event_time_utc"] >= cutoff), len(events))
+    past, head = events[:split], events[split:]
+
+    files: Dict[str, str] = {HEAD_FILE_NAME: dump_events(head)}
+    chunks: List[Dict[str, Any]] = []
+    for number, start in enumerate(range(0, len(past), chunk_size)):
+        chunk = past[start : start + chunk_size]
+        file_name = CHUNK_FILE_TEMPLATE.format(number=number)
+        files[file_name] = dump_events(chunk)
+        chunks.append(_entry(file_name, files[file_name], chunk))
+
+    # Marker ids as dynamic-loader.js builds them
+    points = []
+    for event in events:
+        lat, lng = parse_gps_coordinates(event.get("gps_coordinates"))
+        if lat is not None:
+            points.append((f"event-{event['_id']}", lat, lng))
+    files[CLUSTERS_FILE_NAME] = dumps(build_marker_clusters(points), pretty=False) + "\n"
+
+    index = {
+        "format": ARCHIVE_FORMAT,
+        "chunk_size": chunk_size,
+        "head": _entry(HEAD_FILE_NAME, files[HEAD_FILE_NAME], head),
+        "clusters": _entry(CLUSTERS_FILE_NAME, files[CLUSTERS_FILE_NAME], []),
+        "regions": default_region_index().names(),
+        # Oldest first; the page loads them from the end.
+        "chunks": chunks,
+    }
+    if events_sha256:
+        index["events"] = {"file": "../events.json", "sha256": events_sha256}
+    files[ARCHIVE_INDEX_FILE_NAME] = dumps(index) + "\n"
+    return index, files
@@ -0,0 +1,108 @@
+"""Helpers for writing the client-side event bundles under storage/.
+
+storage/events.js is written minified for pages opened from disk. Every
+route is also written once to storage/routes/<route_hash>.txt: the lazily
+loaded storage/archive files name routes by hash, and the map fetches a
+route from there when it draws it.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.atomic_io import atomic_write_bytes, atomic_write_text
+from utils.event_storage import DEFAULT_EVENTS_FILE, load_events_for_update
+from utils.route_geometry import build_route_pack, route_hash
+from utils.route_utils import build_route_grid_index
+
+DEFAULT_EVENTS_JS_FILE = DEFAULT_EVENTS_FILE.parent / "events.js"
+DEFAULT_ROUTE_INDEX_FILE = DEFAULT_EVENTS_FILE.parent / "route_index.json"
+DEFAULT_ROUTE_PACK_FILE = DEFAULT_EVENTS_FILE.parent / "routes.pack"
+DEFAULT_ROUTES_DIR = DEFAULT_EVENTS_FILE.parent / "routes"
+ROUTE_FILE_SUFFIX = ".txt"
+_BUNDLE_VERSION_PATTERN = re.compile(r"^window\.LOCAL_EVENTS_VERSION = (\d+);$", re.MULTILINE)
+
+
+def read_bundle_version(js_path: Optional[Path] = None) -> Optional[int]:
+    """Storage version the events.js bundle was built from, if it records one."""
+
+    try:
+        match = _BUNDLE_VERSION_PATTERN.search((js_path or DEFAULT_EVENTS_JS_FILE).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    return int(match.group(1)) if match else None
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_route_files(events: List[Dict[str, Any]], routes_dir: Path) -> int:
+    """Write each distinct route of ``events`` to ``<route_hash>.txt``.
+
+    Stored polylines are canonical since ingest, so they are written as
+    they are. Files are content-addressed, so existing ones are left alone
+    and files of routes no event uses any more are deleted. Returns the
+    number written.
+    """
+
+    routes: Dict[str, str] = {}
+    for event in events:
+        polyline = event.get("route_polyline")
+        if polyline:
+            routes.setdefault(route_hash(polyline), polyline)
+
+    written = 0
+    for key, polyline in routes.items():
+        path = routes_dir / f"{key}{ROUTE_FILE_SUFFIX}"
+        if path.exists():
+            continue
+        atomic_write_text(path, polyline)
+        written += 1
+    if routes_dir.exists():
+        for path in routes_dir.glob(f"*{ROUTE_FILE_SUFFIX}"):
+            if path.stem not in routes:
+                path.unlink(missing_ok=True)
+    return written
+
+
+def write_local_events_bundle(
+    events_path: Optional[Path] = None,
+    js_path: Optional[Path] = None,
+    route_index_path: Optional[Path] = None,
+    route_pack_path: Optional[Path] = None,
+    routes_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Write storage/events.js, route_index.json and routes.pack from stored events.
+
+    The binary route pack is what the Python analytics read; the bundle
+    carries the stored encoded polylines unchanged. events.js records
+    the storage version as ``LOCAL_EVENTS_VERSION`` so clients can catch up
+    from storage/changes. Routes are also written to ``routes_dir``.
+    Returns the route grid index so callers can report on it.
+    """
+
+    events_path = events_path or DEFAULT_EVENTS_FILE
+    js_path = js_path or DEFAULT_EVENTS_JS_FILE
+    route_index_path = route_index_path or DEFAULT_ROUTE_INDEX_FILE
+    route_pack_path = route_pack_path or DEFAULT_ROUTE_PACK_FILE
+    routes_dir = routes_dir or DEFAULT_ROUTES_DIR
+
+    data, version = load_events_for_update(events_path)
+    atomic_write_bytes(route_pack_path, build_route_pack(data))
+    write_route_files(data, routes_dir)
+    route_index = build_route_grid_index(data)
+
+    events_json = _compact_json(data)
+    js_content = (
+        f"window.LOCAL_EVENTS_VERSION = {version};\n"
+        f"window.LOCAL_EVENTS_DATA = {events_json};\n"
+        f"window.LOCAL_ROUTE_INDEX = {_compact_json(route_index)};"
+    )
+    atomic_write_text(js_path, js_content)
+    atomic_write_text(route_index_path, json.dumps(route_index, separators=(",", ":")) + "\n")
+
+    return route_index
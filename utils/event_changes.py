@@ -0,0 +1,148 @@
+"""Per-version change sets describing what each storage commit changed.
+
+Every commit that bumps the storage version also writes
+``storage/changes/v<version>.json``:
+
+    {"version": 7, "previous_version": 6, "committed_at": "...",
+     "added": ["id", ...], "updated": {"id": ["field", ...]}, "removed": ["id", ...]}
+
+Added records are new to the reader and fetched whole; updated ones list the
+top-level fields that changed. Builders and clients that last saw version N
+read the change sets N+1..M (``changes_since``) instead of rebuilding
+everything. When a change set in
+that range is missing, for example after pruning, they fall back to a full
+rebuild.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.atomic_io import atomic_write_text
+from utils.event_codec import UTC, dumps, isoformat_datetime, loads
+from utils.event_journal import OP_DELETE, OP_UPSERT, diff_events
+
+CHANGES_DIR_NAME = "changes"
+CHANGE_SET_TEMPLATE = "v{version:08d}.json"
+# Older change sets are pruned; readers further behind rebuild from scratch.
+MAX_CHANGE_SETS = 200
+
+
+def changes_dir_for(events_path: Path) -> Path:
+    return events_path.parent / CHANGES_DIR_NAME
+
+
+def change_set_path(events_path: Path, version: int) -> Path:
+    return changes_dir_for(events_path) / CHANGE_SET_TEMPLATE.format(version=version)
+
+
+def _changed_fields(before: Dict[str, Any], after: Dict[str, Any]) -> List[str]:
+    return sorted(key for key in before.keys() | after.keys() if before.get(key) != after.get(key))
+
+
+def build_change_set(
+    operations: Iterable[Dict[str, Any]],
+    current_events: Iterable[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Summarise journal ``operations`` applied on top of ``current_events``."""
+
+    current_by_id = {str(event["_id"]): event for event in current_events if event.get("_id")}
+    added: Dict[str, None] = {}
+    updated: Dict[str, List[str]] = {}
+    removed: Dict[str, None] = {}
+    for operation in operations:
+        event_id = operation["_id"]
+        before = current_by_id.get(event_id)
+        if operation["op"] == OP_UPSERT:
+            after = operation["event"]
+            if before is None:
+                added[event_id] = None
+            else:
+                fields = _changed_fields(before, after)
+                if fields:
+                    updated[event_id] = sorted(set(updated.get(event_id, [])) | set(fields))
+            current_by_id[event_id] = after
+        elif operation["op"] == OP_DELETE and before is not None:
+            if event_id in added:
+                del added[event_id]
+            else:
+                removed[event_id] = None
+            updated.pop(event_id, None)
+            del current_by_id[event_id]
+    return {"added": list(added), "updated": updated, "removed": list(removed)}
+
+
+def diff_change_set(
+    current_events: Iterable[Dict[str, Any]],
+    updated_events: Iterable[Dict[str, Any]],
+) -> Dict[str, Any]:
+    """Change set between two complete storage-form event lists."""
+
+    current_events = list(current_events)
+    return build_change_set(diff_events(current_events, updated_events), current_events)
+
+
+def write_change_set(events_path: Path, version: int, change_set: Dict[str, Any]) -> Path:
+    """Write the change set for ``version`` and prune the oldest ones."""
+
+    document = {
+        "version": version,
+        "previous_version": version - 1,
+        "committed_at": isoformat_datetime(datetime.now(UTC)),
+        **change_set,
+    }
+    path = change_set_path(events_path, version)
+    atomic_write_text(path, dumps(document) + "\n")
+    for stale in sorted(path.parent.glob("v*.json"))[:-MAX_CHANGE_SETS]:
+        stale.unlink(missing_ok=True)
+    return path
+
+
+def load_change_set(events_path: Path, version: int) -> Optional[Dict[str, Any]]:
+    try:
+        return loads(change_set_path(events_path, version).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def changes_since(events_path: Path, since_version: int, until_version: int) -> Optional[Dict[str, Any]]:
+    """Merge the change sets after ``since_version`` up to ``until_version``.
+
+    Returns None when any change set in the range is missing, in which case
+    the caller has to rebuild from the full snapshot.
+    """
+
+    added: Dict[str, None] = {}
+    updated: Dict[str, set] = {}
+    removed: Dict[str, None] = {}
+    for version in range(since_version + 1, until_version + 1):
+        change_set = load_change_set(events_path, version)
+        if change_set is None:
+            return None
+        for event_id in change_set["added"]:
+            # Removed then re-added counts as added: consumers refetch the record.
+            removed.pop(event_id, None)
+            updated.pop(event_id, None)
+            added[event_id] = None
+        for event_id, fields in change_set["updated"].items():
+            if event_id not in added:
+                updated.setdefault(event_id, set()).update(fields)
+        for event_id in change_set["removed"]:
+            updated.pop(event_id, None)
+            if event_id in added:
+                del added[event_id]
+            else:
+                removed[event_id] = None
+    return {
+        "from_version": since_version,
+        "to_version": until_version,
+        "added": list(added),
+        "updated": {event_id: sorted(fields) for event_id, fields in updated.items()},
+        "removed": list(removed),
+    }
+
+
+def is_empty_change_set(change_set: Dict[str, Any]) -> bool:
+    return not (change_set["added"] or change_set["updated"] or change_set["removed"])
@@ -0,0 +1,296 @@
+"""The one codec between runtime events and their storage form.
+
+Storage form is MongoDB Extended JSON: ids are ``{"$numberLong": "..."}``
+and times are ``{"$date": "YYYY-MM-DDTHH:MM:SS.mmmZ"}``. Runtime form holds
+plain ids and naive UTC datetimes. Every writer goes through
+``encode_event``, so a record rewritten without changes serialises to the
+same bytes.
+
+JSON text goes through a pluggable backend: orjson when it is installed,
+otherwise the stdlib. Set ``EVENTS_JSON_BACKEND=stdlib`` (or call
+``set_json_backend``) to force one. Both backends write identical bytes for
+encoded events: the backends only disagree on floats printed in exponent
+form (``1e-05`` vs ``0.00001``) and on NaN/Infinity, so ``encode_event``
+rounds floats to ``FLOAT_DIGITS`` decimals inside the range both print
+positionally and rejects non-finite ones.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import pytz
+
+from utils.route_utils import canonicalize_event_route, is_canonical_polyline
+
+try:  # Optional speed-up; the stdlib backend is always available.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+UTC = pytz.utc
+JSON_BACKEND_ENV = "EVENTS_JSON_BACKEND"
+# Fields that only exist while an event is being ingested.
+TRANSIENT_FIELDS = ("raw_event",)
+# Decimals kept on stored floats: 0.1 m on coordinates, far below a metre elsewhere.
+FLOAT_DIGITS = 6
+# Both JSON backends print floats in [1e-4, 1e16) positionally.
+_SMALLEST_FLOAT = 1e-4
+_LARGEST_FLOAT = 1e16
+# Large fields the slim index and the SQLite backend keep out of line.
+HEAVY_FIELDS = ("route_polyline", "description", "event_picture_urls")
+
+
+def unwrap_number_long(value: Any) -> Any:
+    """Return the numeric value stored in a MongoDB $numberLong wrapper."""
+    if isinstance(value, dict):
+        raw_value = value.get("$numberLong") or value.get("$oid")
+        if raw_value is not None:
+            try:
+                return int(raw_value)
+            except (TypeError, ValueError):
+                return raw_value
+    return value
+
+
+def coerce_datetime(value: Any) -> Optional[datetime]:
+    """Parse a datetime, ISO string or ``$date`` wrapper into naive UTC."""
+    if isinstance(value, dict):
+        value = value.get("$date")
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, str):
+        try:
+            if value.endswith("Z"):
+                # Stored times are already UTC; skip the timezone round-trip
+                dt = datetime.fromisoformat(value[:-1])
+                if dt.tzinfo is None:
+                    return dt
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC).replace(tzinfo=None)
+
+
+def isoformat_datetime(value: datetime) -> str:
+    """Format as UTC ISO 8601 with a ``Z`` suffix and at least milliseconds."""
+    dt = value
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    dt = dt.astimezone(UTC)
+    iso_value = dt.isoformat().replace("+00:00", "Z")
+    if dt.microsecond == 0 and "." not in iso_value:
+        iso_value = iso_value.replace("Z", ".000Z")
+    return iso_value
+
+
+def wrap_number_long(value: Any) -> Optional[Dict[str, str]]:
+    if value is None:
+        return None
+    if isinstance(value, dict) and "$numberLong" in value:
+        return value
+    return {"$numberLong": str(value)}
+
+
+def wrap_date(value: Any) -> Optional[Dict[str, str]]:
+    """Return a canonical ``$date`` wrapper, re-formatting wrapped strings too."""
+    if value is None:
+        return None
+    dt = coerce_datetime(value)
+    if dt is None:
+        return value if isinstance(value, dict) and "$date" in value else None
+    return {"$date": isoformat_datetime(dt)}
+
+
+def ensure_list_of_strings(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(item) for item in value if item not in (None, "")]
+    return [str(value)]
+
+
+def clean_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop None values and empty nested dicts, and blank list items."""
+    cleaned: Dict[str, Any] = {}
+    for key, value in data.items():
+        if value is None:
+            continue
+        if isinstance(value, dict):
+            nested = clean_dict(value)
+            if nested:
+                cleaned[key] = nested
+            continue
+        if isinstance(value, list):
+            cleaned[key] = [item for item in value if item not in (None, "")]
+            continue
+        cleaned[key] = value
+    return cleaned
+
+
+def canonical_float(value: float) -> Any:
+    """Round ``value`` so every JSON backend prints it the same way.
+
+    Raises ``ValueError`` for NaN and infinities, which are not JSON.
+    """
+    if not math.isfinite(value):
+        raise ValueError(f"non-finite number {value!r}")
+    rounded = round(value, FLOAT_DIGITS)
+    if abs(rounded) < _SMALLEST_FLOAT:
+        return 0.0
+    if abs(rounded) >= _LARGEST_FLOAT:
+        return int(rounded)
+    return rounded
+
+
+def _canonical_numbers(value: Any) -> Any:
+    if isinstance(value, float):
+        return canonical_float(value)
+    if isinstance(value, list):
+        return [_canonical_numbers(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _canonical_numbers(item) for key, item in value.items()}
+    return value
+
+
+def _check_route(event: Dict[str, Any]) -> None:
+    # Routes are canonicalised once at ingest; only stray formats are
+    # converted here, so well-formed polylines are never decoded on encode.
+    if "route_polyline" in event and not is_canonical_polyline(event["route_polyline"]):
+        canonicalize_event_route(event)
+
+
+def decode_event(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Storage (or runtime) event to runtime form; None without a readable time."""
+    normalised = dict(event)
+    if "source_group_id" in normalised:
+        normalised["source_group_id"] = unwrap_number_long(normalised["source_group_id"])
+    if "source_event_id" in normalised:
+        normalised["source_event_id"] = unwrap_number_long(normalised["source_event_id"])
+
+    event_time = coerce_datetime(normalised.get("event_time_utc"))
+    if event_time is None:
+        return None
+    normalised["event_time_utc"] = event_time
+
+    if not normalised.get("_id"):
+        normalised["_id"] = (
+            f"{normalised.get('source_type', 'event')}"
+            f"-{normalised.get('source_group_id', 'unknown')}"
+            f"-{normalised.get('source_event_id', 'unknown')}"
+        )
+
+    return normalised
+
+
+def encode_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Runtime (or storage) event to canonical storage form.
+
+    Raises ``ValueError`` if a field holds NaN or an infinity.
+    """
+    hydrated: Dict[str, Any] = {}
+    for key, value in event.items():
+        if key in TRANSIENT_FIELDS:
+            continue
+        try:
+            hydrated[key] = _canonical_numbers(value)
+        except ValueError as exc:
+            raise ValueError(f"event {event.get('_id')!r} field {key!r}: {exc}") from None
+
+    if "source_event_id" in hydrated:
+        hydrated["source_event_id"] = wrap_number_long(hydrated["source_event_id"])
+    if "source_group_id" in hydrated:
+        hydrated["source_group_id"] = wrap_number_long(hydrated["source_group_id"])
+
+    if "event_time_utc" in hydrated:
+        event_time = wrap_date(hydrated["event_time_utc"])
+        if event_time is not None:
+            hydrated["event_time_utc"] = event_time
+        else:
+            hydrated.pop("event_time_utc")
+
+    if "event_picture_urls" in hydrated:
+        hydrated["event_picture_urls"] = ensure_list_of_strings(hydrated["event_picture_urls"])
+    elif "event_picture_url" in hydrated:
+        hydrated["event_picture_urls"] = ensure_list_of_strings(hydrated.pop("event_picture_url"))
+    else:
+        hydrated["event_picture_urls"] = []
+
+    if not hydrated.get("source_url"):
+        hydrated["source_url"] = hydrated.get("strava_url", "")
+
+    _check_route(hydrated)
+
+    return clean_dict(hydrated)
+
+
+def decode_events(events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Bulk ``decode_event`` that drops events without a readable time."""
+    return [decoded for decoded in map(decode_event, events) if decoded is not None]
+
+
+def encode_events(events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return list(map(encode_event, events))
+
+
+def _stdlib_dumps(value: Any, pretty: bool) -> str:
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _orjson_dumps(value: Any, pretty: bool) -> str:
+    try:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 if pretty else 0).decode("utf-8")
+    except TypeError:
+        # Integers beyond 64 bits or non-string keys: orjson refuses them.
+        return _stdlib_dumps(value, pretty)
+
+
+_BACKENDS: Dict[str, tuple] = {"stdlib": (json.loads, _stdlib_dumps)}
+if orjson is not None:
+    _BACKENDS["orjson"] = (orjson.loads, _orjson_dumps)
+
+_loads: Callable[[Any], Any]
+_dumps: Callable[[Any, bool], str]
+
+
+def available_json_backends() -> List[str]:
+    return list(_BACKENDS)
+
+
+def set_json_backend(name: Optional[str] = None) -> str:
+    """Select the JSON backend; ``None`` or ``"auto"`` picks the fastest installed."""
+    global _loads, _dumps
+
+    if name in (None, "", "auto"):
+        name = "orjson" if "orjson" in _BACKENDS else "stdlib"
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown or unavailable JSON backend {name!r}; choose from {available_json_backends()}")
+    _loads, _dumps = _BACKENDS[name]
+    return name
+
+
+def get_json_backend() -> str:
+    return next(name for name, backend in _BACKENDS.items() if backend[0] is _loads)
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON text or UTF-8 bytes."""
+    return _loads(data)
+
+
+def dumps(value: Any, *, pretty: bool = True) -> str:
+    """Serialise ``value``: two-space indented by default, compact otherwise."""
+    return _dumps(value, pretty)
+
+
+set_json_backend(os.environ.get(JSON_BACKEND_ENV))
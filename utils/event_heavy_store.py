@@ -0,0 +1,113 @@
+"""Slim event index plus an on-demand store for heavy event fields.
+
+Alongside each events.json snapshot two derived files are written:
+
+* ``events.index.json`` - every event without its heavy fields, plus the
+  byte range of each event's heavy record;
+* ``events.heavy.jsonl`` - one ``{"_id": ..., <heavy fields>}`` line per event.
+
+Loads that only need time, location, group or title parse the slim index;
+heavy fields are read by ``_id`` with a seek into the side store.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.atomic_io import atomic_write_bytes, atomic_write_text
+from utils.event_codec import HEAVY_FIELDS, dumps, loads
+from utils.event_partitions import file_fingerprint, snapshot_is_current
+
+INDEX_SUFFIX = ".index.json"
+HEAVY_SUFFIX = ".heavy.jsonl"
+
+
+def index_path_for(events_path: Path) -> Path:
+    return events_path.with_name(events_path.stem + INDEX_SUFFIX)
+
+
+def heavy_path_for(events_path: Path) -> Path:
+    return events_path.with_name(events_path.stem + HEAVY_SUFFIX)
+
+
+def split_event(event: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Return ``(slim, heavy)`` halves of a stored event."""
+
+    slim: Dict[str, Any] = {}
+    heavy: Dict[str, Any] = {}
+    for key, value in event.items():
+        (heavy if key in HEAVY_FIELDS else slim)[key] = value
+    return slim, heavy
+
+
+class HeavyFieldStore:
+    """Random access to heavy fields by event ``_id``."""
+
+    __slots__ = ("path", "offsets")
+
+    def __init__(self, path: Path, offsets: Dict[str, List[int]]) -> None:
+        self.path = path
+        self.offsets = offsets
+
+    def __contains__(self, event_id: str) -> bool:
+        return event_id in self.offsets
+
+    def get(self, event_id: str) -> Dict[str, Any]:
+        return self.get_many([event_id]).get(event_id, {})
+
+    def get_many(self, event_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Read heavy fields for ``event_ids`` in file order with one open."""
+
+        spans = sorted(
+            (self.offsets[event_id], event_id) for event_id in set(event_ids) if event_id in self.offsets
+        )
+        found: Dict[str, Dict[str, Any]] = {}
+        if not spans:
+            return found
+        with self.path.open("rb") as infile:
+            for (offset, length), event_id in spans:
+                infile.seek(offset)
+                record = loads(infile.read(length))
+                record.pop("_id", None)
+                found[event_id] = record
+        return found
+
+
+def write_event_index(stored_events: List[Dict[str, Any]], events_path: Path) -> int:
+    """Write the slim index and heavy store for ``stored_events``."""
+
+    slim_events: List[Dict[str, Any]] = []
+    offsets: Dict[str, List[int]] = {}
+    lines: List[bytes] = []
+    offset = 0
+    for event in stored_events:
+        slim, heavy = split_event(event)
+        slim_events.append(slim)
+        if not heavy or not event.get("_id"):
+            continue
+        event_id = str(event["_id"])
+        line = (dumps({"_id": event_id, **heavy}, pretty=False) + "\n").encode("utf-8")
+        offsets[event_id] = [offset, len(line)]
+        lines.append(line)
+        offset += len(line)
+
+    atomic_write_bytes(heavy_path_for(events_path), b"".join(lines))
+    index = {"source": file_fingerprint(events_path), "heavy_offsets": offsets, "events": slim_events}
+    atomic_write_text(index_path_for(events_path), dumps(index, pretty=False) + "\n")
+    return len(slim_events)
+
+
+def load_event_index(events_path: Path) -> Optional[Tuple[List[Dict[str, Any]], HeavyFieldStore]]:
+    """Return the slim events and heavy store, or None if they are stale."""
+
+    index_path = index_path_for(events_path)
+    try:
+        with index_path.open("r", encoding="utf-8") as infile:
+            index = loads(infile.read())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if not snapshot_is_current(events_path, index.get("source")):
+        return None
+    return index["events"], HeavyFieldStore(heavy_path_for(events_path), index["heavy_offsets"])
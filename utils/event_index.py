@@ -0,0 +1,127 @@
+"""In-memory indexes over runtime events for repeated filtered queries.
+
+``EventIndex`` sorts the events by ``event_time_utc`` once and keeps hash
+indexes by ``_id``, group and source type. A query bisects the time range,
+starts from the smallest matching hash bucket and checks the remaining
+predicates only on those candidates.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.event_codec import coerce_datetime
+from utils.event_model import parse_gps_coordinates
+
+# (south, west, north, east) in degrees, edges inclusive.
+BoundingBox = Tuple[float, float, float, float]
+TimeRange = Tuple[Optional[datetime], Optional[datetime]]
+
+
+class EventIndex:
+    """Time-sorted runtime events with hash indexes for ``query``."""
+
+    __slots__ = ("events", "times", "coordinates", "by_id", "by_group", "by_type")
+
+    def __init__(self, events: Iterable[Dict[str, Any]]) -> None:
+        self.events: List[Dict[str, Any]] = sorted(events, key=lambda event: event["event_time_utc"])
+        self.times: List[datetime] = [event["event_time_utc"] for event in self.events]
+        self.coordinates: List[Tuple[Optional[float], Optional[float]]] = []
+        self.by_id: Dict[str, int] = {}
+        self.by_group: Dict[Any, List[int]] = {}
+        self.by_type: Dict[Any, List[int]] = {}
+        for position, event in enumerate(self.events):
+            self.by_id[str(event.get("_id"))] = position
+            self.by_group.setdefault(event.get("source_group_id"), []).append(position)
+            self.by_type.setdefault(event.get("source_type"), []).append(position)
+            self.coordinates.append(parse_gps_coordinates(event.get("gps_coordinates")))
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def query(
+        self,
+        *,
+        time_range: Optional[TimeRange] = None,
+        group_ids: Optional[Iterable[Any]] = None,
+        source_types: Optional[Iterable[str]] = None,
+        ids: Optional[Iterable[Any]] = None,
+        bbox: Optional[BoundingBox] = None,
+        active: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """Events matching every given filter, in time order.
+
+        ``time_range`` is ``(start, end)`` with ``start`` inclusive and ``end``
+        exclusive; either may be None. ``active`` matches ``is_active``
+        (missing counts as active).
+        """
+
+        low, high = 0, len(self.events)
+        if time_range is not None:
+            start, end = (coerce_datetime(bound) for bound in time_range)
+            if start is not None:
+                low = bisect_left(self.times, start)
+            if end is not None:
+                high = bisect_left(self.times, end, low)
+        if low >= high:
+            return []
+
+        buckets: List[Sequence[int]] = []
+        id_set = set(map(str, ids)) if ids is not None else None
+        if id_set is not None:
+            buckets.append(sorted(self.by_id[key] for key in id_set if key in self.by_id))
+        group_set = set(group_ids) if group_ids is not None else None
+        if group_set is not None:
+            buckets.append(_merge_buckets(self.by_group, group_set))
+        type_set = set(source_types) if source_types is not None else None
+        if type_set is not None:
+            buckets.append(_merge_buckets(self.by_type, type_set))
+
+        if buckets:
+            smallest = min(buckets, key=len)
+            candidates: Iterable[int] = smallest[bisect_left(smallest, low) : bisect_left(smallest, high)]
+        else:
+            candidates = range(low, high)
+
+        matches: List[Dict[str, Any]] = []
+        for position in candidates:
+            event = self.events[position]
+            if id_set is not None and str(event.get("_id")) not in id_set:
+                continue
+            if group_set is not None and event.get("source_group_id") not in group_set:
+                continue
+            if type_set is not None and event.get("source_type") not in type_set:
+                continue
+            if active is not None and bool(event.get("is_active", True)) is not active:
+                continue
+            if bbox is not None and not _in_bbox(self.coordinates[position], bbox):
+                continue
+            matches.append(event)
+        return matches
+
+    @staticmethod
+    def union(*results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Merge query results, dropping duplicates, in time order."""
+
+        merged: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            for event in result:
+                merged.setdefault(str(event.get("_id")), event)
+        return sorted(merged.values(), key=lambda event: event["event_time_utc"])
+
+
+def _merge_buckets(index: Dict[Any, List[int]], keys: Iterable[Any]) -> List[int]:
+    buckets = [index[key] for key in keys if key in index]
+    if len(buckets) == 1:
+        return buckets[0]
+    return sorted(position for bucket in buckets for position in bucket)
+
+
+def _in_bbox(coordinates: Tuple[Optional[float], Optional[float]], bbox: BoundingBox) -> bool:
+    lat, lng = coordinates
+    if lat is None or lng is None:
+        return False
+    south, west, north, east = bbox
+    return south <= lat <= north and west <= lng <= east
@@ -0,0 +1,182 @@
+"""Append-only journal of event changes kept next to storage/events.json.
+
+``events.json`` is the compacted snapshot. Writers append one JSON operation
+per line to ``events.journal.jsonl`` instead of rewriting the snapshot::
+
+    {"op":"upsert","_id":"strava-1-2","event":{...storage form...}}
+    {"op":"delete","_id":"strava-1-2"}
+
+Readers replay the journal over the snapshot. Replay is idempotent per
+``_id``, so re-applying operations that already reached the snapshot (for
+example after an interrupted compaction) leaves the result unchanged.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.event_codec import dumps, loads
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+_MISSING = object()
+
+
+def journal_path_for(events_path: Path) -> Path:
+    """Return the journal file that belongs to ``events_path``."""
+
+    return events_path.with_name(events_path.stem + JOURNAL_SUFFIX)
+
+
+def upsert_op(event: Dict[str, Any]) -> Dict[str, Any]:
+    return {"op": OP_UPSERT, "_id": str(event["_id"]), "event": event}
+
+
+def delete_op(event_id: Any) -> Dict[str, Any]:
+    return {"op": OP_DELETE, "_id": str(event_id)}
+
+
+def append_operations(journal_path: Path, operations: Iterable[Dict[str, Any]]) -> int:
+    """Append ``operations`` to the journal and return how many were written."""
+
+    lines = [dumps(op, pretty=False) for op in operations]
+    if not lines:
+        return 0
+    journal_path.parent.mkdir(parents=True, exist_ok=True)
+    with journal_path.open("a", encoding="utf-8") as outfile:
+        outfile.write("\n".join(lines) + "\n")
+        outfile.flush()
+        os.fsync(outfile.fileno())
+    return len(lines)
+
+
+def read_operations(journal_path: Path) -> List[Dict[str, Any]]:
+    """Read journal operations, skipping lines left half-written by a crash."""
+
+    if not journal_path.exists():
+        return []
+
+    operations: List[Dict[str, Any]] = []
+    with journal_path.open("r", encoding="utf-8") as infile:
+        for line_number, line in enumerate(infile, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                operation = loads(line)
+            except json.JSONDecodeError:
+                print(f"Warning: skipping unreadable journal line {line_number} in {journal_path}")
+                continue
+            if operation.get("op") not in (OP_UPSERT, OP_DELETE) or not operation.get("_id"):
+                print(f"Warning: skipping malformed journal line {line_number} in {journal_path}")
+                continue
+            operations.append(operation)
+    return operations
+
+
+def replay_operations(
+    events: Iterable[Dict[str, Any]],
+    operations: Iterable[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Apply journal ``operations`` to snapshot ``events``.
+
+    Upserts replace an event in place or append it; deletes drop it.
+    """
+
+    replayed: List[Optional[Dict[str, Any]]] = list(events)
+    index_by_id = {str(event["_id"]): index for index, event in enumerate(replayed) if event.get("_id")}
+
+    for operation in operations:
+        event_id = operation["_id"]
+        if operation["op"] == OP_UPSERT:
+            index = index_by_id.get(event_id)
+            if index is None:
+                index_by_id[event_id] = len(replayed)
+                replayed.append(operation["event"])
+            else:
+                replayed[index] = operation["event"]
+        else:
+            index = index_by_id.pop(event_id, None)
+            if index is not None:
+                replayed[index] = None
+
+    return [event for event in replayed if event is not None]
+
+
+def diff_events(
+    current_events: Iterable[Dict[str, Any]],
+    updated_events: Iterable[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Return the operations that turn ``current_events`` into ``updated_events``.
+
+    Both lists are in storage form and matched on ``_id``; unchanged records
+    produce no operation.
+    """
+
+    current_by_id = {str(event["_id"]): event for event in current_events if event.get("_id")}
+    operations: List[Dict[str, Any]] = []
+    seen_ids = set()
+    for event in updated_events:
+        if not event.get("_id"):
+            print(f"Warning: not journaling event without _id: {event.get('title', 'unknown')}")
+            continue
+        event_id = str(event["_id"])
+        seen_ids.add(event_id)
+        if current_by_id.get(event_id) != event:
+            operations.append(upsert_op(event))
+
+    for event_id in current_by_id:
+        if event_id not in seen_ids:
+            operations.append(delete_op(event_id))
+    return operations
+
+
+def rebase_operations(
+    operations: Iterable[Dict[str, Any]],
+    base_events: Iterable[Dict[str, Any]],
+    current_events: Iterable[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Rebase ``operations`` diffed against ``base_events`` onto ``current_events``.
+
+    Used when another writer committed in between. Upserts only carry the
+    fields this writer changed, applied on top of the current record, so
+    concurrent edits to other fields survive. An update to a record that was
+    deleted in the meantime is dropped.
+    """
+
+    base_by_id = {str(event["_id"]): event for event in base_events if event.get("_id")}
+    current_by_id = {str(event["_id"]): event for event in current_events if event.get("_id")}
+    rebased: List[Dict[str, Any]] = []
+
+    for operation in operations:
+        event_id = operation["_id"]
+        current = current_by_id.get(event_id)
+        if operation["op"] == OP_DELETE:
+            if current is not None:
+                rebased.append(operation)
+            continue
+
+        base = base_by_id.get(event_id)
+        event = operation["event"]
+        if current is None:
+            if base is not None:
+                print(f"Warning: {event_id} was deleted by another writer; dropping its update")
+                continue
+            rebased.append(operation)
+            continue
+
+        merged = dict(current)
+        base = base or {}
+        for key, value in event.items():
+            if base.get(key, _MISSING) != value:
+                merged[key] = value
+        for key in base:
+            if key not in event:
+                merged.pop(key, None)
+        if merged != current:
+            rebased.append(upsert_op(merged))
+    return rebased
@@ -0,0 +1,181 @@
+"""Compact runtime event model.
+
+``Event`` keeps the common event fields in ``__slots__`` and behaves like the
+runtime dictionaries returned by ``load_events_for_runtime``, so existing
+``event['title']`` / ``event.get(...)`` callers keep working. Values are
+parsed once on assignment: ids are unwrapped, ``event_time_utc`` is a naive
+UTC datetime, metrics are numbers and ``gps_coordinates`` is split into
+``lat``/``lng`` floats.
+"""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+from utils.event_codec import UTC, coerce_datetime, encode_event, unwrap_number_long
+
+# Storage key order, so converting back keeps records stable.
+EVENT_FIELDS = (
+    "_id",
+    "source_type",
+    "source_group_id",
+    "source_event_id",
+    "source_group_name",
+    "event_time_utc",
+    "meet_up_location",
+    "gps_coordinates",
+    "distance_meters",
+    "elevation_gain_meters",
+    "organizer",
+    "strava_url",
+    "title",
+    "description",
+    "route_url",
+    "route_map_url",
+    "route_polyline",
+    "is_active",
+    "event_picture_urls",
+    "source_url",
+)
+_FIELD_SET = frozenset(EVENT_FIELDS)
+
+
+def _to_number(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def parse_gps_coordinates(value: Any) -> Tuple[Optional[float], Optional[float]]:
+    """Split a ``"lat, lng"`` string into floats, or ``(None, None)``."""
+
+    if not isinstance(value, str) or "," not in value:
+        return None, None
+    lat_text, _, lng_text = value.partition(",")
+    try:
+        return float(lat_text), float(lng_text)
+    except ValueError:
+        return None, None
+
+
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "source_group_id": unwrap_number_long,
+    "source_event_id": unwrap_number_long,
+    "event_time_utc": coerce_datetime,
+    "distance_meters": _to_number,
+    "elevation_gain_meters": _to_number,
+}
+
+
+class Event(MutableMapping):
+    """A runtime event with slotted common fields and a dict for the rest."""
+
+    __slots__ = EVENT_FIELDS + ("lat", "lng", "_extra")
+
+    def __init__(self, values: Optional[Mapping[str, Any]] = None) -> None:
+        self.lat: Optional[float] = None
+        self.lng: Optional[float] = None
+        self._extra: Optional[Dict[str, Any]] = None
+        if values:
+            for key, value in values.items():
+                self[key] = value
+
+    @classmethod
+    def from_storage(cls, stored: Mapping[str, Any]) -> Optional["Event"]:
+        """Build an event from its storage (or runtime) form.
+
+        Mirrors ``decode_event``: events without a readable
+        time are rejected and a missing ``_id`` is derived from the source.
+        """
+
+        event = cls(stored)
+        if event.get("event_time_utc") is None:
+            return None
+        if not event.get("_id"):
+            event["_id"] = (
+                f"{event.get('source_type', 'event')}"
+                f"-{event.get('source_group_id', 'unknown')}"
+                f"-{event.get('source_event_id', 'unknown')}"
+            )
+        return event
+
+    def to_storage_dict(self) -> Dict[str, Any]:
+        return encode_event(dict(self.items()))
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        """``event_time_utc`` as an aware UTC datetime."""
+
+        event_time = self.get("event_time_utc")
+        return event_time.replace(tzinfo=UTC) if event_time is not None else None
+
+    @property
+    def coordinates(self) -> Optional[Tuple[float, float]]:
+        if self.lat is None or self.lng is None:
+            return None
+        return self.lat, self.lng
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _FIELD_SET:
+            converter = _CONVERTERS.get(key)
+            if converter is not None:
+                value = converter(value)
+            setattr(self, key, value)
+            if key == "gps_coordinates":
+                self.lat, self.lng = parse_gps_coordinates(value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            if key == "gps_coordinates":
+                self.lat = self.lng = None
+            return
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)  # type: ignore[arg-type]
+        return self._extra is not None and key in self._extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        extra = self._extra
+        return extra.get(key, default) if extra is not None else default
+
+    def __iter__(self) -> Iterator[str]:
+        for key in EVENT_FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Event({self.get('_id')!r}, {self.get('title')!r})"
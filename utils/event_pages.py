@@ -0,0 +1,139 @@
+"""Static detail page per event, for shared links and link previews.
+
+``events/event-<id>.html`` holds the pre-rendered detail popup, OpenGraph
+and Twitter card tags and the event's route, so a shared link loads one
+small page instead of the whole events.json. A page depends only on the
+event, the page template and the current year, so ``site_builder`` renders
+only the pages whose event changed, spread over worker processes when many
+are stale.
+"""
+
+from __future__ import annotations
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from utils.atomic_io import atomic_write_text
+from utils.load_html_utils import DAY_OF_WEEK_MAP, escape_attr, get_event_display, render_event_detail
+
+SITE_URL = "https://haoqiyou.net/"
+EVENT_PAGES_DIR_NAME = "events"
+# Pages render like past events: no calendar button, since the page does
+# not load the calendar scripts.
+EVENT_PAGE_TYPE = "page"
+OG_DESCRIPTION_LENGTH = 160
+# Below this many stale pages the process pool costs more than it saves.
+PARALLEL_PAGE_THRESHOLD = 64
+
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_MARKDOWN_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\([^)]+\)")
+_UNSAFE_ID_CHARACTERS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def event_page_name(event_id: Any) -> str:
+    """File name of an event's page; matches the ``?id=event-<id>`` share links."""
+    return f"event-{_UNSAFE_ID_CHARACTERS.sub('_', str(event_id))}.html"
+
+
+def _plain_text(value: Any) -> str:
+    text = _MARKDOWN_LINK_PATTERN.sub(r"\1", str(value or ""))
+    return " ".join(_TAG_PATTERN.sub(" ", text).split())
+
+
+def _truncate(text: str, length: int) -> str:
+    return text if len(text) <= length else text[: length - 1].rstrip() + "…"
+
+
+def _preview_image(event: Mapping[str, Any]) -> str:
+    pictures = event.get("event_picture_urls") or [event.get("event_picture_url", "")]
+    for url in pictures:
+        if isinstance(url, str) and url.startswith("http"):
+            return url
+    return event.get("route_map_url", "")
+
+
+def og_tags(event: Mapping[str, Any], display: Any) -> Dict[str, str]:
+    """OpenGraph/Twitter properties for an event, as unescaped strings."""
+
+    summary = [
+        f"{display.month_str} {display.day_str}, {display.year} {display.event_time_str} "
+        f"{DAY_OF_WEEK_MAP[display.day_of_week]}"
+    ]
+    if display.event_location:
+        summary.append(display.event_location)
+    if event.get("distance_meters", 0) > 0:
+        summary.append(display.distance_str)
+    description = " · ".join(summary)
+    details = _plain_text(event.get("description"))
+    if details:
+        description = f"{description} — {details}"
+
+    tags = {
+        "og:type": "article",
+        "og:site_name": "好骑友",
+        "og:title": event.get("title", ""),
+        "og:description": _truncate(description, OG_DESCRIPTION_LENGTH),
+        "og:url": f"{SITE_URL}{EVENT_PAGES_DIR_NAME}/{event_page_name(event['_id'])}",
+        "og:image": _preview_image(event),
+        "twitter:card": "summary_large_image",
+    }
+    return {name: value for name, value in tags.items() if value}
+
+
+def render_event_page(event: Mapping[str, Any], template: str, current_year: int) -> str:
+    display = get_event_display(event)
+    tags = og_tags(event, display)
+    meta = "\n".join(
+        f'    <meta {"name" if name.startswith("twitter:") else "property"}="{name}" content="{escape_attr(value)}">'
+        for name, value in tags.items()
+    )
+    replacements = {
+        "{{page_title}}": escape_attr(f"{event.get('title', '')} | 好骑友"),
+        "{{meta_description}}": escape_attr(tags.get("og:description", "")),
+        "{{canonical_url}}": escape_attr(tags["og:url"]),
+        "{{og_tags}}": meta,
+        "{{event_id}}": escape_attr(f"event-{event['_id']}"),
+        "{{gps_coordinates}}": escape_attr(display.gps_coordinates_str),
+        "{{route_polyline}}": escape_attr(event.get("route_polyline", "")),
+        "{{event_detail}}": render_event_detail(event, EVENT_PAGE_TYPE, current_year, hidden=False, display=display),
+    }
+    page = template
+    for placeholder, value in replacements.items():
+        page = page.replace(placeholder, value)
+    return page
+
+
+def _write_pages(jobs: Sequence[Tuple[Dict[str, Any], str]], template: str, current_year: int) -> int:
+    for event, path in jobs:
+        atomic_write_text(Path(path), render_event_page(event, template, current_year))
+    return len(jobs)
+
+
+def _chunks(items: List[Any], count: int) -> Iterable[List[Any]]:
+    size = -(-len(items) // count)
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def write_event_pages(
+    events: Iterable[Mapping[str, Any]],
+    output_dir: Path,
+    template: str,
+    current_year: int,
+    workers: Optional[int] = None,
+) -> int:
+    """Render and write the pages of ``events``; returns how many were written.
+
+    With ``workers`` > 1 and enough pages, they are rendered by a process
+    pool, one chunk of pages per worker.
+    """
+
+    jobs = [(dict(event), str(output_dir / event_page_name(event["_id"]))) for event in events]
+    if not workers or workers <= 1 or len(jobs) < PARALLEL_PAGE_THRESHOLD:
+        return _write_pages(jobs, template, current_year)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_write_pages, chunk, template, current_year) for chunk in _chunks(jobs, workers)]
+        return sum(future.result() for future in futures)
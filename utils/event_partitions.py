@@ -0,0 +1,154 @@
+"""Monthly partitions of events.json for time-windowed loads.
+
+``write_partitions`` splits the events into
+``storage/partitions/events_YYYYMM.json`` (the same layout as the hand-made
+files in storage/backup) and a ``manifest.json`` recording each partition's
+time range, count and hash plus a fingerprint of the events.json it came
+from. Windowed readers open only the partitions overlapping their window, and
+fall back to the full snapshot whenever the manifest is stale.
+
+Snapshot writes do not maintain the partitions: the site pages all read the
+full event list, so nothing in the build loads by window. Run
+``write_partitions`` before a batch of windowed reads that should use them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.atomic_io import atomic_write_text
+from utils.event_codec import coerce_datetime, dumps, isoformat_datetime, loads
+from utils.event_journal import journal_path_for
+
+PARTITIONS_DIR_NAME = "partitions"
+MANIFEST_FILE_NAME = "manifest.json"
+PARTITION_FILE_TEMPLATE = "events_{key}.json"
+
+
+def partitions_dir_for(events_path: Path) -> Path:
+    return events_path.parent / PARTITIONS_DIR_NAME
+
+
+def file_fingerprint(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+    }
+
+
+def fingerprint_matches(path: Path, fingerprint: Optional[Dict[str, Any]]) -> bool:
+    """Cheap size/mtime check first; hash only when the mtime moved (e.g. after a checkout)."""
+
+    if not fingerprint or not path.exists():
+        return False
+    stat = path.stat()
+    if stat.st_size != fingerprint.get("size"):
+        return False
+    if stat.st_mtime_ns == fingerprint.get("mtime_ns"):
+        return True
+    return hashlib.sha256(path.read_bytes()).hexdigest() == fingerprint.get("sha256")
+
+
+def load_manifest(partitions_dir: Path) -> Optional[Dict[str, Any]]:
+    manifest_path = partitions_dir / MANIFEST_FILE_NAME
+    try:
+        with manifest_path.open("r", encoding="utf-8") as infile:
+            return loads(infile.read())
+    except (FileNotFoundError, json.JSONDecodeError) as exc:
+        if not isinstance(exc, FileNotFoundError):
+            print(f"Warning: ignoring unreadable partition manifest {manifest_path}: {exc}")
+        return None
+
+
+def write_partitions(
+    stored_events: List[Dict[str, Any]],
+    events_path: Path,
+    partitions_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Split ``stored_events`` into monthly files and write the manifest.
+
+    Partitions whose content hash is unchanged are not rewritten. Events
+    without a readable time are left out, as runtime loads drop them anyway.
+    """
+
+    partitions_dir = partitions_dir or partitions_dir_for(events_path)
+    previous = load_manifest(partitions_dir) or {}
+    previous_hashes = {entry["key"]: entry["sha256"] for entry in previous.get("partitions", [])}
+
+    grouped: Dict[str, List[Tuple[datetime, Dict[str, Any]]]] = {}
+    for event in stored_events:
+        event_time = coerce_datetime(event.get("event_time_utc"))
+        if event_time is None:
+            continue
+        grouped.setdefault(event_time.strftime("%Y%m"), []).append((event_time, event))
+
+    entries: List[Dict[str, Any]] = []
+    for key in sorted(grouped):
+        timed_events = grouped[key]
+        file_name = PARTITION_FILE_TEMPLATE.format(key=key)
+        content = dumps([event for _, event in timed_events]) + "\n"
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        partition_path = partitions_dir / file_name
+        if previous_hashes.get(key) != digest or not partition_path.exists():
+            atomic_write_text(partition_path, content)
+        times = [event_time for event_time, _ in timed_events]
+        entries.append(
+            {
+                "key": key,
+                "file": file_name,
+                "start": isoformat_datetime(min(times)),
+                "end": isoformat_datetime(max(times)),
+                "count": len(timed_events),
+                "sha256": digest,
+            }
+        )
+
+    for key in set(previous_hashes) - set(grouped):
+        (partitions_dir / PARTITION_FILE_TEMPLATE.format(key=key)).unlink(missing_ok=True)
+
+    manifest = {"source": file_fingerprint(events_path), "partitions": entries}
+    atomic_write_text(partitions_dir / MANIFEST_FILE_NAME, json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def snapshot_is_current(events_path: Path, fingerprint: Optional[Dict[str, Any]]) -> bool:
+    """True if ``fingerprint`` still describes events.json and no journal is pending."""
+
+    journal_path = journal_path_for(events_path)
+    if journal_path.exists() and journal_path.stat().st_size:
+        return False
+    return fingerprint_matches(events_path, fingerprint)
+
+
+def fresh_manifest(events_path: Path, partitions_dir: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Return the manifest if it still describes the current events."""
+
+    manifest = load_manifest(partitions_dir or partitions_dir_for(events_path))
+    if manifest is None or not snapshot_is_current(events_path, manifest.get("source")):
+        return None
+    return manifest
+
+
+def load_partitioned_events(
+    manifest: Dict[str, Any],
+    partitions_dir: Path,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Load storage-form events from partitions overlapping ``[start, end)``."""
+
+    events: List[Dict[str, Any]] = []
+    for entry in manifest.get("partitions", []):
+        if start is not None and coerce_datetime(entry["end"]) < start:
+            continue
+        if end is not None and coerce_datetime(entry["start"]) >= end:
+            continue
+        with (partitions_dir / entry["file"]).open("r", encoding="utf-8") as infile:
+            events.extend(loads(infile.read()))
+    return events
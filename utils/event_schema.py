@@ -0,0 +1,184 @@
+"""Declarative event schema compiled into fast validators.
+
+``EVENT_SCHEMA`` lists the known fields with their type, whether they are
+required and an optional default. ``compile_schema`` turns it into a
+validator that returns the problems of one record, in either storage form
+(``$numberLong``/``$date`` wrappers) or runtime form. Unknown fields are
+allowed.
+
+Storage writes reject records that fail, and page builds drop them at load
+and fill in defaults, so bad data surfaces at ingest rather than as a crash
+during rendering.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from utils.event_codec import coerce_datetime
+from utils.event_model import parse_gps_coordinates
+
+# ``required`` fields cannot be stored without; fields with a ``default``
+# are read unguarded by the page renderers and are filled in on validated
+# loads.
+EVENT_SCHEMA: Dict[str, Dict[str, Any]] = {
+    "_id": {"type": "string", "required": True},
+    "source_type": {"type": "string", "default": ""},
+    "source_group_id": {"type": "long", "default": 0},
+    "source_event_id": {"type": "long"},
+    "source_group_name": {"type": "string", "default": ""},
+    "event_time_utc": {"type": "datetime", "required": True},
+    "meet_up_location": {"type": "string"},
+    "gps_coordinates": {"type": "gps"},
+    "region_code": {"type": "string"},
+    "distance_meters": {"type": "number", "min": 0, "default": 0},
+    "elevation_gain_meters": {"type": "number", "min": 0, "default": 0},
+    "organizer": {"type": "string", "default": ""},
+    "title": {"type": "string", "default": ""},
+    "description": {"type": "string", "default": ""},
+    "route_url": {"type": "string"},
+    "route_map_url": {"type": "string", "default": ""},
+    "route_polyline": {"type": "string"},
+    "is_active": {"type": "bool"},
+    "event_picture_urls": {"type": "string_list"},
+    "source_url": {"type": "string"},
+    "strava_url": {"type": "string"},
+}
+
+_MISSING = object()
+
+
+class EventValidationError(ValueError):
+    """Raised when events fail the schema; ``errors`` maps record to problems."""
+
+    def __init__(self, errors: Dict[str, List[str]]) -> None:
+        super().__init__(format_validation_errors(errors))
+        self.errors = errors
+
+
+def _check_string(value: Any) -> Optional[str]:
+    return None if isinstance(value, str) else f"expected a string, got {type(value).__name__}"
+
+
+def _check_long(value: Any) -> Optional[str]:
+    if isinstance(value, dict):
+        value = value.get("$numberLong")
+        if isinstance(value, str) and value.lstrip("-").isdigit():
+            return None
+        return "expected a $numberLong wrapper holding digits"
+    if isinstance(value, int) and not isinstance(value, bool):
+        return None
+    return f"expected an integer id, got {type(value).__name__}"
+
+
+def _check_datetime(value: Any) -> Optional[str]:
+    if isinstance(value, datetime) or coerce_datetime(value) is not None:
+        return None
+    return f"unreadable time {value!r}"
+
+
+def _check_number(value: Any) -> Optional[str]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return None
+    return f"expected a number, got {value!r}"
+
+
+def _check_bool(value: Any) -> Optional[str]:
+    return None if isinstance(value, bool) else f"expected true/false, got {value!r}"
+
+
+def _check_string_list(value: Any) -> Optional[str]:
+    if isinstance(value, list) and all(isinstance(item, str) for item in value):
+        return None
+    return "expected a list of strings"
+
+
+def _check_gps(value: Any) -> Optional[str]:
+    if value == "":
+        return None
+    lat, lng = parse_gps_coordinates(value)
+    if lat is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return f"expected \"lat, lng\", got {value!r}"
+    return None
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], Optional[str]]] = {
+    "string": _check_string,
+    "long": _check_long,
+    "datetime": _check_datetime,
+    "number": _check_number,
+    "bool": _check_bool,
+    "string_list": _check_string_list,
+    "gps": _check_gps,
+}
+
+
+def compile_schema(schema: Mapping[str, Mapping[str, Any]]) -> Callable[[Mapping[str, Any]], List[str]]:
+    """Build a validator returning the problems of one event (empty if valid)."""
+
+    checks: List[Tuple[str, Callable[[Any], Optional[str]], bool, Optional[float]]] = []
+    for field, spec in schema.items():
+        if spec["type"] not in _TYPE_CHECKS:
+            raise ValueError(f"Unknown schema type {spec['type']!r} for field {field!r}")
+        checks.append((field, _TYPE_CHECKS[spec["type"]], bool(spec.get("required")), spec.get("min")))
+
+    def validate(event: Mapping[str, Any]) -> List[str]:
+        errors: List[str] = []
+        for field, check, required, minimum in checks:
+            value = event.get(field, _MISSING)
+            if value is _MISSING or value is None:
+                if required:
+                    errors.append(f"{field}: missing")
+                continue
+            problem = check(value)
+            if problem is None and minimum is not None and value < minimum:
+                problem = f"must be >= {minimum}, got {value!r}"
+            if problem is not None:
+                errors.append(f"{field}: {problem}")
+        return errors
+
+    return validate
+
+
+def compile_defaults(schema: Mapping[str, Mapping[str, Any]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build a function that fills missing fields with their schema defaults."""
+
+    defaults = [(field, spec["default"]) for field, spec in schema.items() if "default" in spec]
+
+    def apply_defaults(event: Dict[str, Any]) -> Dict[str, Any]:
+        for field, default in defaults:
+            if event.get(field) is None:
+                event[field] = default
+        return event
+
+    return apply_defaults
+
+
+validate_event = compile_schema(EVENT_SCHEMA)
+apply_event_defaults = compile_defaults(EVENT_SCHEMA)
+
+
+def _record_label(event: Mapping[str, Any], position: int) -> str:
+    event_id = event.get("_id")
+    return str(event_id) if event_id else f"#{position}"
+
+
+def validate_events(events: Iterable[Mapping[str, Any]]) -> Dict[str, List[str]]:
+    """Validate every event and return the problems keyed by ``_id`` (or position)."""
+
+    errors: Dict[str, List[str]] = {}
+    for position, event in enumerate(events):
+        problems = validate_event(event)
+        if problems:
+            errors[_record_label(event, position)] = problems
+    return errors
+
+
+def format_validation_errors(errors: Mapping[str, List[str]], limit: int = 20) -> str:
+    lines = [f"{len(errors)} invalid event(s):"]
+    for label, problems in list(errors.items())[:limit]:
+        lines.append(f"  {label}: {'; '.join(problems)}")
+    if len(errors) > limit:
+        lines.append(f"  ... and {len(errors) - limit} more")
+    return "\n".join(lines)
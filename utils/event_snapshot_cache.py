@@ -0,0 +1,47 @@
+"""Pickled snapshot of normalised runtime events for fast startup.
+
+``load_events_for_runtime`` keeps ``events.runtime.pickle`` next to
+events.json holding the already-normalised events, keyed by the source
+file's fingerprint (size, mtime_ns, sha256). A fresh cache skips JSON parsing
+and per-record normalisation; a stale or unreadable one is rebuilt on the next
+full load. The cache is a local file and is never committed.
+"""
+
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.atomic_io import atomic_write_bytes
+from utils.event_partitions import file_fingerprint, snapshot_is_current
+
+CACHE_SUFFIX = ".runtime.pickle"
+# Bump when the runtime event shape changes so old caches are ignored.
+CACHE_FORMAT = 1
+
+
+def runtime_cache_path_for(events_path: Path) -> Path:
+    return events_path.with_name(events_path.stem + CACHE_SUFFIX)
+
+
+def load_runtime_cache(events_path: Path) -> Optional[List[Dict[str, Any]]]:
+    """Return cached runtime events if they still match events.json."""
+
+    cache_path = runtime_cache_path_for(events_path)
+    try:
+        with cache_path.open("rb") as infile:
+            payload = pickle.load(infile)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, AttributeError, ValueError) as exc:
+        print(f"Warning: ignoring unreadable runtime cache {cache_path}: {exc}")
+        return None
+    if payload.get("format") != CACHE_FORMAT or not snapshot_is_current(events_path, payload.get("source")):
+        return None
+    return payload["events"]
+
+
+def write_runtime_cache(events_path: Path, runtime_events: List[Dict[str, Any]]) -> None:
+    payload = {"format": CACHE_FORMAT, "source": file_fingerprint(events_path), "events": runtime_events}
+    atomic_write_bytes(runtime_cache_path_for(events_path), pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
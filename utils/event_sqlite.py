@@ -0,0 +1,207 @@
+"""Optional SQLite backend for stored events.
+
+Events keep their storage (Mongo extended JSON) form in a ``document`` column,
+with the columns callers filter on promoted and indexed. Heavy fields live out
+of row in ``event_blobs`` and are only joined in when requested, so filtered
+loads never read route polylines or descriptions they do not need.
+
+``events.json`` stays the format the static site reads; ``import_events`` and
+``export_events`` convert between the two.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from utils.event_codec import HEAVY_FIELDS, coerce_datetime, dumps, loads
+
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+# Heavy fields that are not text are stored as compact JSON.
+JSON_BLOB_FIELDS = ("event_picture_urls",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    _id TEXT PRIMARY KEY,
+    event_time_utc TEXT,
+    source_type TEXT,
+    source_group_id INTEGER,
+    is_active INTEGER NOT NULL DEFAULT 1,
+    document TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS event_blobs (
+    _id TEXT PRIMARY KEY REFERENCES events(_id) ON DELETE CASCADE,
+    route_polyline TEXT,
+    description TEXT,
+    event_picture_urls TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_time ON events(event_time_utc);
+CREATE INDEX IF NOT EXISTS idx_events_group ON events(source_group_id, event_time_utc);
+CREATE INDEX IF NOT EXISTS idx_events_type ON events(source_type, event_time_utc);
+CREATE INDEX IF NOT EXISTS idx_events_active ON events(is_active, event_time_utc);
+"""
+
+
+def is_sqlite_path(path: Path) -> bool:
+    return path.suffix.lower() in SQLITE_SUFFIXES
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(str(db_path))
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.executescript(_SCHEMA)
+    blob_columns = {row[1] for row in connection.execute("PRAGMA table_info(event_blobs)")}
+    for field in HEAVY_FIELDS:
+        if field not in blob_columns:
+            connection.execute(f"ALTER TABLE event_blobs ADD COLUMN {field} TEXT")
+    return connection
+
+
+def _time_key(value: Optional[datetime]) -> Optional[str]:
+    """Fixed-width naive-UTC ISO text, so string order matches time order."""
+
+    if value is None:
+        return None
+    return value.isoformat(timespec="microseconds")
+
+
+def _unwrap_group_id(value: Any) -> Optional[int]:
+    if isinstance(value, dict):
+        value = value.get("$numberLong")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _blob_value(field: str, value: Any) -> Any:
+    if field in JSON_BLOB_FIELDS and value is not None:
+        return dumps(value, pretty=False)
+    return value
+
+
+def _event_rows(event: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Tuple[Any, ...]]:
+    # Heavy fields keep a null placeholder so exports preserve key order.
+    document = {key: (None if key in HEAVY_FIELDS else value) for key, value in event.items()}
+    event_id = str(event["_id"])
+    row = (
+        event_id,
+        _time_key(coerce_datetime(event.get("event_time_utc"))),
+        event.get("source_type"),
+        _unwrap_group_id(event.get("source_group_id")),
+        1 if event.get("is_active", True) else 0,
+        dumps(document, pretty=False),
+    )
+    blob_row = (event_id,) + tuple(_blob_value(field, event.get(field)) for field in HEAVY_FIELDS)
+    return row, blob_row
+
+
+def _upsert(connection: sqlite3.Connection, events: Iterable[Dict[str, Any]]) -> int:
+    rows = []
+    blob_rows = []
+    for event in events:
+        if not event.get("_id"):
+            continue
+        row, blob_row = _event_rows(event)
+        rows.append(row)
+        blob_rows.append(blob_row)
+    connection.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?)", rows)
+    connection.executemany(
+        f"INSERT OR REPLACE INTO event_blobs (_id, {', '.join(HEAVY_FIELDS)}) "
+        f"VALUES (?{', ?' * len(HEAVY_FIELDS)})",
+        blob_rows,
+    )
+    return len(rows)
+
+
+def import_events(stored_events: Iterable[Dict[str, Any]], db_path: Path) -> int:
+    """Replace the database contents with ``stored_events``."""
+
+    with closing(connect(db_path)) as connection, connection:
+        connection.execute("DELETE FROM event_blobs")
+        connection.execute("DELETE FROM events")
+        return _upsert(connection, stored_events)
+
+
+def apply_operations(db_path: Path, operations: Iterable[Dict[str, Any]]) -> int:
+    """Apply journal-style upsert/delete operations in one transaction."""
+
+    applied = 0
+    with closing(connect(db_path)) as connection, connection:
+        for operation in operations:
+            if operation["op"] == "delete":
+                connection.execute("DELETE FROM events WHERE _id = ?", (str(operation["_id"]),))
+            else:
+                _upsert(connection, [operation["event"]])
+            applied += 1
+    return applied
+
+
+def query_events(
+    db_path: Path,
+    *,
+    active_only: bool = False,
+    source_group_ids: Optional[Iterable[int]] = None,
+    source_types: Optional[Iterable[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_heavy: bool = True,
+) -> List[Dict[str, Any]]:
+    """Return storage-form events matching every given filter, ordered by time."""
+
+    if not db_path.exists():
+        return []
+
+    clauses: List[str] = []
+    params: List[Any] = []
+    if active_only:
+        clauses.append("e.is_active = 1")
+    for column, values in (("e.source_group_id", source_group_ids), ("e.source_type", source_types)):
+        if values is None:
+            continue
+        values = list(values)
+        clauses.append(f"{column} IN ({', '.join('?' for _ in values) or 'NULL'})")
+        params.extend(values)
+    if start is not None:
+        clauses.append("e.event_time_utc >= ?")
+        params.append(_time_key(start))
+    if end is not None:
+        clauses.append("e.event_time_utc < ?")
+        params.append(_time_key(end))
+
+    heavy_columns: Sequence[str] = HEAVY_FIELDS if include_heavy else ()
+    select = ", ".join(["e.document"] + [f"b.{field}" for field in heavy_columns])
+    sql = f"SELECT {select} FROM events e"
+    if heavy_columns:
+        sql += " LEFT JOIN event_blobs b ON b._id = e._id"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY e.event_time_utc, e.rowid"
+
+    events: List[Dict[str, Any]] = []
+    with closing(connect(db_path)) as connection:
+        for row in connection.execute(sql, params):
+            event = loads(row[0])
+            heavy_values = dict(zip(heavy_columns, row[1:]))
+            for field in HEAVY_FIELDS:
+                # Rows written before a field became heavy keep it inline
+                if field not in event or event[field] is not None:
+                    continue
+                value = heavy_values.get(field)
+                if value is None:
+                    del event[field]
+                else:
+                    event[field] = loads(value) if field in JSON_BLOB_FIELDS else value
+            events.append(event)
+    return events
+
+
+def export_events(db_path: Path) -> List[Dict[str, Any]]:
+    """Return every stored event in time order, ready to dump as events.json."""
+
+    return query_events(db_path)
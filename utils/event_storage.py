@@ -5,191 +5,552 @@ from __future__ import annotations
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
-
-import pytz
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.atomic_io import atomic_write_text, file_lock
+from utils.event_codec import (  # noqa: F401 - re-exported for existing callers
+    HEAVY_FIELDS,
+    UTC,
+    clean_dict,
+    coerce_datetime,
+    decode_event as normalize_event_for_runtime,
+    dumps,
+    encode_event as rehydrate_event_for_storage,
+    ensure_list_of_strings,
+    isoformat_datetime,
+    loads,
+    unwrap_number_long,
+    wrap_date,
+    wrap_number_long,
+)
+from utils.event_index import BoundingBox, EventIndex, TimeRange
+from utils.event_schema import (
+    EventValidationError,
+    apply_event_defaults,
+    format_validation_errors,
+    validate_event,
+    validate_events,
+)
+from utils.event_journal import (
+    OP_UPSERT,
+    append_operations,
+    delete_op,
+    diff_events,
+    journal_path_for,
+    read_operations,
+    rebase_operations,
+    replay_operations,
+)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 DEFAULT_EVENTS_FILE = BASE_DIR / "storage" / "events.json"
-UTC = pytz.utc
-
-
-def unwrap_number_long(value: Any) -> Any:
-    """Return the numeric value stored in a MongoDB $numberLong wrapper."""
-    if isinstance(value, dict):
-        raw_value = value.get("$numberLong") or value.get("$oid")
-        if raw_value is not None:
-            try:
-                return int(raw_value)
-            except (TypeError, ValueError):
-                return raw_value
-    return value
-
-
-def _coerce_datetime(value: Any) -> Optional[datetime]:
-    if isinstance(value, dict):
-        value = value.get("$date")
-    if isinstance(value, datetime):
-        dt = value
-    elif isinstance(value, str):
-        normalised = value.replace("Z", "+00:00")
-        try:
-            dt = datetime.fromisoformat(normalised)
-        except ValueError:
-            return None
-    elif value is None:
-        return None
-    else:
-        return None
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=UTC)
-    return dt.astimezone(UTC).replace(tzinfo=None)
-
-
-def normalize_event_for_runtime(event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """Normalise a stored event for in-memory processing."""
-    normalised = dict(event)
-    if "source_group_id" in normalised:
-        normalised["source_group_id"] = unwrap_number_long(normalised.get("source_group_id"))
-    if "source_event_id" in normalised:
-        normalised["source_event_id"] = unwrap_number_long(normalised.get("source_event_id"))
-
-    event_time = _coerce_datetime(normalised.get("event_time_utc"))
-    if event_time is None:
-        return None
-    normalised["event_time_utc"] = event_time
-
-    if not normalised.get("_id"):
-        normalised["_id"] = (
-            f"{normalised.get('source_type', 'event')}"
-            f"-{normalised.get('source_group_id', 'unknown')}"
-            f"-{normalised.get('source_event_id', 'unknown')}"
-        )
+# Compact once the journal grows to this fraction of the snapshot size.
+JOURNAL_COMPACTION_RATIO = 0.5
+
 
-    return normalised
+def _read_snapshot(events_path: Path) -> List[Dict[str, Any]]:
+    if not events_path.exists():
+        return []
+    try:
+        data = loads(events_path.read_bytes())
+    except (json.JSONDecodeError, OSError) as exc:
+        print(f"Warning: unable to load events from {events_path}: {exc}")
+        return []
+    return data if isinstance(data, list) else []
+
+
+def load_stored_events(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """Load storage-form events: the events.json snapshot plus its journal.
+
+    A ``.sqlite``/``.db`` path reads the SQLite backend instead.
+    """
+
+    events_path = path or DEFAULT_EVENTS_FILE
+    with file_lock(events_path, shared=True):
+        if _is_sqlite(events_path):
+            from utils.event_sqlite import export_events
+
+            return export_events(events_path)
+        operations = read_operations(journal_path_for(events_path))
+        return replay_operations(_read_snapshot(events_path), operations)
+
+
+def _is_sqlite(events_path: Path) -> bool:
+    from utils.event_sqlite import is_sqlite_path
+
+    return is_sqlite_path(events_path)
+
+
+def _load_partitions_for_window(
+    events_path: Path,
+    start: Optional[datetime],
+    end: Optional[datetime],
+) -> Optional[List[Dict[str, Any]]]:
+    from utils.event_partitions import fresh_manifest, load_partitioned_events, partitions_dir_for
+
+    with file_lock(events_path, shared=True):
+        manifest = fresh_manifest(events_path)
+        if manifest is None:
+            return None
+        return load_partitioned_events(manifest, partitions_dir_for(events_path), start, end)
 
 
 def load_events_for_runtime(
     path: Optional[Path] = None,
     *,
     active_only: bool = False,
+    source_group_ids: Optional[Iterable[int]] = None,
+    source_types: Optional[Iterable[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fields: Optional[Iterable[str]] = None,
+    model: bool = False,
+    cache: bool = True,
+    validate: bool = False,
 ) -> List[Dict[str, Any]]:
-    """Load events from storage JSON into runtime-friendly dictionaries."""
+    """Load events from storage into runtime-friendly dictionaries.
 
-    events_path = path or DEFAULT_EVENTS_FILE
-    if not events_path.exists():
-        return []
+    Every given filter must match; ``start`` is inclusive and ``end`` exclusive.
+    With the SQLite backend the filters run as indexed queries; with JSON a
+    time window only opens the monthly partitions it overlaps, when
+    ``utils.event_partitions.write_partitions`` has written current ones.
 
-    try:
-        with events_path.open("r", encoding="utf-8") as infile:
-            stored_events = json.load(infile)
-    except (json.JSONDecodeError, OSError) as exc:
-        print(f"Warning: unable to load events from {events_path}: {exc}")
-        return []
+    ``fields`` projects each event onto those keys (``_id`` and
+    ``event_time_utc`` are always kept). Projected JSON loads read the slim
+    index and fetch heavy fields only for the events that pass the filters.
+
+    With ``model`` the events are compact ``utils.event_model.Event``
+    objects, which support the same mapping access as the dictionaries.
+
+    Full JSON loads reuse the pickled runtime snapshot next to events.json
+    while it matches the file, unless ``cache`` is False. SQLite loads always
+    query the database, so ``cache`` has no effect there.
+
+    With ``validate`` events failing the event schema are dropped and
+    reported together, and the rest get the schema defaults for fields the
+    renderers rely on.
+    """
+
+    events_path = path or DEFAULT_EVENTS_FILE
+    start = coerce_datetime(start)
+    end = coerce_datetime(end)
+    group_ids = set(source_group_ids) if source_group_ids is not None else None
+    types = set(source_types) if source_types is not None else None
+    projection = set(fields) | {"_id", "event_time_utc"} if fields is not None else None
+    normalise = normalize_event_for_runtime
+    if model:
+        from utils.event_model import Event
+
+        normalise = Event.from_storage
+
+    # Project before decoding, keeping what the filters read, so decoding
+    # never copies fields the caller dropped. Validation needs whole events.
+    keep = None
+    if projection is not None and not validate:
+        keep = set(projection)
+        if active_only:
+            keep.add("is_active")
+        if group_ids is not None:
+            keep.add("source_group_id")
+        if types is not None:
+            keep.add("source_type")
+
+    stored_events = None
+    heavy_store = None
+    if _is_sqlite(events_path):
+        from utils.event_sqlite import query_events
+
+        stored_events = query_events(
+            events_path,
+            active_only=active_only,
+            source_group_ids=group_ids,
+            source_types=types,
+            start=start,
+            end=end,
+            include_heavy=projection is None or bool(projection.intersection(HEAVY_FIELDS)),
+        )
+    elif projection is not None:
+        from utils.event_heavy_store import load_event_index
+
+        with file_lock(events_path, shared=True):
+            event_index = load_event_index(events_path)
+        if event_index is not None:
+            stored_events, heavy_store = event_index
+    if stored_events is None and (start is not None or end is not None):
+        stored_events = _load_partitions_for_window(events_path, start, end)
+    if stored_events is None and cache:
+        stored_events = _load_cached_runtime_events(events_path)
+        if stored_events is not None and not model:
+            normalise = _already_normalised
+    if stored_events is None:
+        stored_events = load_stored_events(events_path)
 
     runtime_events: List[Dict[str, Any]] = []
+    invalid: Dict[str, List[str]] = {}
     for stored_event in stored_events:
-        normalised = normalize_event_for_runtime(stored_event)
+        # Events without an _id need the source fields to derive one
+        if keep is not None and stored_event.get("_id"):
+            stored_event = {key: value for key, value in stored_event.items() if key in keep}
+        normalised = normalise(stored_event)
         if not normalised:
             continue
+        if validate:
+            problems = validate_event(normalised)
+            if problems:
+                invalid[str(normalised["_id"])] = problems
+                continue
+            apply_event_defaults(normalised)
         if active_only and not normalised.get("is_active", True):
             continue
+        if group_ids is not None and normalised.get("source_group_id") not in group_ids:
+            continue
+        if types is not None and normalised.get("source_type") not in types:
+            continue
+        if start is not None and normalised["event_time_utc"] < start:
+            continue
+        if end is not None and normalised["event_time_utc"] >= end:
+            continue
         runtime_events.append(normalised)
-    return runtime_events
+    if invalid:
+        print(f"Warning: skipping {format_validation_errors(invalid)}")
+
+    heavy_fields = projection.intersection(HEAVY_FIELDS) if heavy_store is not None else None
+    if heavy_fields:
+        heavy = heavy_store.get_many(str(event["_id"]) for event in runtime_events)
+        for event in runtime_events:
+            event.update(
+                (key, value) for key, value in heavy.get(str(event["_id"]), {}).items() if key in heavy_fields
+            )
+    if keep == projection:
+        return runtime_events
+    return _project_events(runtime_events, projection)
+
+
+def load_indexed_events(
+    path: Optional[Path] = None,
+    *,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    active_only: bool = False,
+    model: bool = False,
+    validate: bool = False,
+) -> EventIndex:
+    """Load runtime events once and index them for repeated ``query`` calls."""
 
+    return EventIndex(
+        load_events_for_runtime(path, active_only=active_only, start=start, end=end, model=model, validate=validate)
+    )
 
-def isoformat_datetime(value: datetime) -> str:
-    dt = value
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=UTC)
-    dt = dt.astimezone(UTC)
-    iso_value = dt.isoformat().replace("+00:00", "Z")
-    if dt.microsecond == 0 and "." not in iso_value:
-        iso_value = iso_value.replace("Z", ".000Z")
-    return iso_value
 
+def query(
+    path: Optional[Path] = None,
+    *,
+    time_range: Optional[TimeRange] = None,
+    group_ids: Optional[Iterable[int]] = None,
+    source_types: Optional[Iterable[str]] = None,
+    ids: Optional[Iterable[Any]] = None,
+    bbox: Optional[BoundingBox] = None,
+    active: Optional[bool] = None,
+    model: bool = False,
+    validate: bool = False,
+) -> List[Dict[str, Any]]:
+    """One-off indexed query; see ``EventIndex.query`` for the filters.
 
-def wrap_number_long(value: Any) -> Optional[Dict[str, str]]:
-    if value is None:
-        return None
-    if isinstance(value, dict) and "$numberLong" in value:
-        return value
-    return {"$numberLong": str(value)}
+    The time range also limits which partitions are read. Scripts that
+    query several times should index once with ``load_indexed_events``.
+    """
 
+    start, end = time_range or (None, None)
+    index = load_indexed_events(
+        path, start=start, end=end, active_only=bool(active), model=model, validate=validate
+    )
+    return index.query(
+        time_range=time_range,
+        group_ids=group_ids,
+        source_types=source_types,
+        ids=ids,
+        bbox=bbox,
+        active=active,
+    )
 
-def wrap_date(value: Any) -> Optional[Dict[str, str]]:
-    if value is None:
-        return None
-    if isinstance(value, dict) and "$date" in value:
-        return value
-    dt = _coerce_datetime(value)
-    if dt is None:
-        return None
-    return {"$date": isoformat_datetime(dt)}
 
+def _already_normalised(event: Dict[str, Any]) -> Dict[str, Any]:
+    return event
 
-def ensure_list_of_strings(value: Any) -> List[str]:
-    if value is None:
-        return []
-    if isinstance(value, list):
-        return [str(item) for item in value if item not in (None, "")]
-    return [str(value)]
 
+def _load_cached_runtime_events(events_path: Path) -> Optional[List[Dict[str, Any]]]:
+    """Normalised events from the runtime cache, rebuilding it when stale.
 
-def clean_dict(data: Dict[str, Any]) -> Dict[str, Any]:
-    cleaned: Dict[str, Any] = {}
-    for key, value in data.items():
-        if value is None:
-            continue
-        if isinstance(value, dict):
-            nested = clean_dict(value)
-            if nested:
-                cleaned[key] = nested
-            continue
-        if isinstance(value, list):
-            cleaned_list = [item for item in value if item not in (None, "")]
-            cleaned[key] = cleaned_list
-            continue
-        cleaned[key] = value
-    return cleaned
+    Returns None while a journal is pending, since the cache only mirrors
+    the events.json snapshot.
+    """
 
+    from utils.event_snapshot_cache import load_runtime_cache, write_runtime_cache
 
-def rehydrate_event_for_storage(event: Dict[str, Any]) -> Dict[str, Any]:
-    hydrated = dict(event)
+    with file_lock(events_path, shared=True):
+        cached = load_runtime_cache(events_path)
+        if cached is not None:
+            return cached
+        journal_path = journal_path_for(events_path)
+        if not events_path.exists() or (journal_path.exists() and journal_path.stat().st_size):
+            return None
+        runtime_events = [event for event in map(normalize_event_for_runtime, _read_snapshot(events_path)) if event]
+        write_runtime_cache(events_path, runtime_events)
+        return runtime_events
 
-    if "source_event_id" in hydrated:
-        hydrated["source_event_id"] = wrap_number_long(hydrated.get("source_event_id"))
-    if "source_group_id" in hydrated:
-        hydrated["source_group_id"] = wrap_number_long(hydrated.get("source_group_id"))
 
-    if "event_time_utc" in hydrated:
-        event_time = wrap_date(hydrated.get("event_time_utc"))
-        if event_time is not None:
-            hydrated["event_time_utc"] = event_time
-        else:
-            hydrated.pop("event_time_utc", None)
+def _project_events(
+    events: List[Dict[str, Any]],
+    projection: Optional[set],
+) -> List[Dict[str, Any]]:
+    if projection is None:
+        return events
+    return [type(event)({key: value for key, value in event.items() if key in projection}) for event in events]
+
+
+def load_event_heavy_fields(event_id: str, path: Optional[Path] = None) -> Dict[str, Any]:
+    """Return the heavy fields of one event, read on demand by ``_id``."""
+
+    from utils.event_heavy_store import load_event_index
+
+    events_path = path or DEFAULT_EVENTS_FILE
+    with file_lock(events_path, shared=True):
+        event_index = load_event_index(events_path)
+        if event_index is not None:
+            return event_index[1].get(str(event_id))
+        for event in load_stored_events(events_path):
+            if str(event.get("_id")) == str(event_id):
+                return {key: event[key] for key in HEAVY_FIELDS if key in event}
+    return {}
+
+
+def _meta_path_for(events_path: Path) -> Path:
+    return events_path.with_name(events_path.stem + ".meta.json")
+
+
+def read_storage_version(path: Optional[Path] = None) -> int:
+    """Return the storage version, bumped on every committed change."""
+
+    meta_path = _meta_path_for(path or DEFAULT_EVENTS_FILE)
+    try:
+        with meta_path.open("r", encoding="utf-8") as infile:
+            return int(json.load(infile).get("version", 0))
+    except (FileNotFoundError, json.JSONDecodeError, TypeError, ValueError):
+        return 0
+
+
+def _bump_storage_version(events_path: Path) -> int:
+    version = read_storage_version(events_path) + 1
+    atomic_write_text(_meta_path_for(events_path), json.dumps({"version": version}, indent=2) + "\n")
+    return version
+
+
+def _stored_event_sort_key(event: Dict[str, Any]) -> datetime:
+    return coerce_datetime(event.get("event_time_utc")) or datetime.max
+
+
+def _write_snapshot(events_path: Path, stored_events: List[Dict[str, Any]]) -> None:
+    """Rewrite events.json, drop the journal and refresh the slim index."""
+
+    if _is_sqlite(events_path):
+        from utils.event_sqlite import import_events
+
+        import_events(stored_events, events_path)
+        return
+    from utils.event_heavy_store import write_event_index
 
-    if "event_picture_urls" in hydrated:
-        hydrated["event_picture_urls"] = ensure_list_of_strings(hydrated["event_picture_urls"])
-    elif "event_picture_url" in hydrated:
-        hydrated["event_picture_urls"] = ensure_list_of_strings(hydrated["event_picture_url"])
-        hydrated.pop("event_picture_url", None)
-    else:
-        hydrated["event_picture_urls"] = []
+    atomic_write_text(events_path, dumps(stored_events) + "\n")
+    journal_path_for(events_path).unlink(missing_ok=True)
+    write_event_index(stored_events, events_path)
 
-    if not hydrated.get("source_url"):
-        hydrated["source_url"] = hydrated.get("strava_url", "")
 
-    return clean_dict(hydrated)
+def _tagged_for_storage(events: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Storage form of ``events`` with their ``region_code`` assigned.
+
+    Regions are looked up here, on the way in, so readers only use the code.
+    """
+
+    from utils.region_index import tag_event_regions
+
+    stored_events = [rehydrate_event_for_storage(event) for event in events]
+    tag_event_regions(stored_events)
+    return stored_events
 
 
 def save_events_to_storage(
     events: Iterable[Dict[str, Any]],
     path: Optional[Path] = None,
 ) -> None:
+    """Rewrite the whole snapshot; prefer ``save_event_changes`` for ingest.
+
+    Raises ``EventValidationError`` listing every invalid record, in which
+    case nothing is written.
+    """
+
+    from utils.event_changes import diff_change_set, write_change_set
+
+    events_path = path or DEFAULT_EVENTS_FILE
+    serialised_events = _tagged_for_storage(events)
+    errors = validate_events(serialised_events)
+    if errors:
+        raise EventValidationError(errors)
+    with file_lock(events_path):
+        change_set = diff_change_set(load_stored_events(events_path), serialised_events)
+        _write_snapshot(events_path, serialised_events)
+        write_change_set(events_path, _bump_storage_version(events_path), change_set)
+
+
+def compact_events_storage(path: Optional[Path] = None) -> int:
+    """Fold the journal into events.json and return the number of events."""
+
     events_path = path or DEFAULT_EVENTS_FILE
-    events_path.parent.mkdir(parents=True, exist_ok=True)
-    serialised_events = [rehydrate_event_for_storage(event) for event in events]
-    with events_path.open("w", encoding="utf-8") as outfile:
-        json.dump(serialised_events, outfile, indent=2, ensure_ascii=False)
-        outfile.write("\n")
+    with file_lock(events_path):
+        stored_events = load_stored_events(events_path)
+        if _is_sqlite(events_path):
+            return len(stored_events)
+        stored_events.sort(key=_stored_event_sort_key)
+        _write_snapshot(events_path, stored_events)
+    return len(stored_events)
+
+
+def _journal_needs_compaction(events_path: Path) -> bool:
+    journal_path = journal_path_for(events_path)
+    if not journal_path.exists():
+        return False
+    snapshot_size = events_path.stat().st_size if events_path.exists() else 0
+    return journal_path.stat().st_size >= snapshot_size * JOURNAL_COMPACTION_RATIO
+
+
+def record_event_changes(
+    operations: Iterable[Dict[str, Any]],
+    path: Optional[Path] = None,
+    *,
+    current_events: Optional[List[Dict[str, Any]]] = None,
+) -> int:
+    """Append journal operations, compacting when the journal grows large.
+
+    Upserts failing the event schema are rejected and reported together;
+    the remaining operations are still written. Each commit also writes its
+    change set under storage/changes. ``current_events`` (storage form, as
+    of the current version) saves reloading storage to work out which fields
+    changed.
+    """
+
+    from utils.event_changes import build_change_set, write_change_set
+    from utils.region_index import tag_event_regions
+
+    events_path = path or DEFAULT_EVENTS_FILE
+    operations = list(operations)
+    tag_event_regions(operation["event"] for operation in operations if operation["op"] == OP_UPSERT)
+    operations = _reject_invalid_upserts(operations)
+    if not operations:
+        return 0
+    with file_lock(events_path):
+        if current_events is None:
+            current_events = load_stored_events(events_path)
+        if _is_sqlite(events_path):
+            from utils.event_sqlite import apply_operations
+
+            appended = apply_operations(events_path, operations)
+        else:
+            appended = append_operations(journal_path_for(events_path), operations)
+            if appended and _journal_needs_compaction(events_path):
+                compact_events_storage(events_path)
+        if appended:
+            version = _bump_storage_version(events_path)
+            write_change_set(events_path, version, build_change_set(operations, current_events))
+    return appended
+
+
+def _reject_invalid_upserts(operations: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    accepted: List[Dict[str, Any]] = []
+    errors: Dict[str, List[str]] = {}
+    for operation in operations:
+        if operation["op"] == OP_UPSERT:
+            problems = validate_event(operation["event"])
+            if problems:
+                errors[operation["_id"]] = problems
+                continue
+        accepted.append(operation)
+    if errors:
+        print(f"Warning: rejected {format_validation_errors(errors)}")
+    return accepted
+
+
+def load_events_for_update(
+    path: Optional[Path] = None,
+    *,
+    runtime: bool = False,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Load events together with the storage version they were read at.
+
+    Pass both back to ``commit_event_changes``. With ``runtime`` the events are
+    normalised like ``load_events_for_runtime``.
+    """
+
+    events_path = path or DEFAULT_EVENTS_FILE
+    with file_lock(events_path, shared=True):
+        version = read_storage_version(events_path)
+        events = load_stored_events(events_path)
+    if runtime:
+        events = [event for event in map(normalize_event_for_runtime, events) if event]
+    return events, version
+
+
+def commit_event_changes(
+    events: Iterable[Dict[str, Any]],
+    base_events: Iterable[Dict[str, Any]],
+    base_version: int,
+    path: Optional[Path] = None,
+) -> int:
+    """Journal the changes from ``base_events`` to ``events``.
+
+    Both lists are complete event lists, in runtime or storage form; events
+    missing from ``events`` are deleted. If another writer committed since
+    ``base_version`` the changes are merged field by field onto the current
+    records instead of overwriting them. Returns the operations written.
+    """
+
+    events_path = path or DEFAULT_EVENTS_FILE
+    # Tag the base too, so a missing region_code alone is not a change
+    base = _tagged_for_storage(base_events)
+    operations = diff_events(base, _tagged_for_storage(events))
+    if not operations:
+        return 0
+
+    with file_lock(events_path):
+        current_version = read_storage_version(events_path)
+        current = base
+        if current_version != base_version:
+            print(
+                f"Storage moved from version {base_version} to {current_version}; "
+                f"merging {len(operations)} changes"
+            )
+            current = load_stored_events(events_path)
+            operations = rebase_operations(operations, base, current)
+        return record_event_changes(operations, events_path, current_events=current)
+
+
+def save_event_changes(
+    events: Iterable[Dict[str, Any]],
+    path: Optional[Path] = None,
+) -> int:
+    """Journal only the records of ``events`` that differ from storage now.
+
+    For read-modify-write jobs prefer ``load_events_for_update`` plus
+    ``commit_event_changes``, which keep concurrent writers' changes.
+    """
+
+    events_path = path or DEFAULT_EVENTS_FILE
+    with file_lock(events_path):
+        base_events, version = load_events_for_update(events_path)
+        return commit_event_changes(events, base_events, version, events_path)
+
+
+def delete_events_from_storage(
+    event_ids: Iterable[Any],
+    path: Optional[Path] = None,
+) -> int:
+    """Journal deletes for ``event_ids`` and return how many were written."""
+
+    return record_event_changes((delete_op(event_id) for event_id in event_ids), path)
@@ -0,0 +1,124 @@
+"""Cache of rendered per-event HTML fragments keyed by event content.
+
+Each event card on a page depends only on the event's fields, the list it is
+rendered into (``event_type``) and the current year, so
+``gen_div_for_events_from_list`` renders a card once per distinct key and
+joins the cached fragments. Re-rendering a page where one event changed
+re-renders only that card.
+
+The cache lives in memory for the process and can be persisted with
+``save``/``load`` so a later build reuses the fragments of a previous one.
+Saved fragments record a digest of the files the cards are rendered from
+(``RENDERER_INPUTS``) and are dropped on load once any of them changed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Sequence, Set, Tuple
+
+from utils.atomic_io import atomic_write_bytes
+from utils.region_index import DEFAULT_REGIONS_FILE
+
+# Layout of the saved payload; the card templates are covered by RENDERER_INPUTS.
+FRAGMENT_FORMAT = 1
+# Files a rendered card depends on besides the event itself.
+RENDERER_INPUTS: Tuple[Path, ...] = (Path(__file__).resolve().parent / "load_html_utils.py", DEFAULT_REGIONS_FILE)
+DEFAULT_MAX_FRAGMENTS = 8192
+CACHE_FILE_NAME = "html_fragments.pickle"
+
+FragmentKey = Tuple[int, str, int, str]
+
+
+def fragment_cache_path_for(events_path: Path) -> Path:
+    return events_path.with_name(CACHE_FILE_NAME)
+
+
+def event_content_hash(event: Mapping[str, Any]) -> str:
+    """Digest of every field of a runtime event (dict or ``Event``).
+
+    Pickling is several times faster than ``repr`` for the long route and
+    description strings. Equal events can in rare cases pickle differently
+    (shared vs. copied values), which only costs a re-render.
+    """
+    content = pickle.dumps(sorted(event.items()), protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha1(content).hexdigest()
+
+
+def renderer_digest(paths: Optional[Sequence[Path]] = None) -> str:
+    """Digest of the renderer inputs; a missing file hashes as empty."""
+    digest = hashlib.sha256()
+    for path in paths if paths is not None else RENDERER_INPUTS:
+        try:
+            content = Path(path).read_bytes()
+        except FileNotFoundError:
+            content = b""
+        digest.update(hashlib.sha256(content).digest())
+    return digest.hexdigest()
+
+
+def fragment_key(event: Mapping[str, Any], event_type: str, current_year: int) -> FragmentKey:
+    return (FRAGMENT_FORMAT, event_type, current_year, event_content_hash(event))
+
+
+class FragmentCache:
+    """Rendered fragments by ``fragment_key``, oldest evicted first."""
+
+    __slots__ = ("fragments", "used", "max_fragments", "hits", "misses")
+
+    def __init__(self, max_fragments: int = DEFAULT_MAX_FRAGMENTS) -> None:
+        self.fragments: Dict[FragmentKey, str] = {}
+        self.used: Set[FragmentKey] = set()
+        self.max_fragments = max_fragments
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.fragments)
+
+    def get(self, key: FragmentKey) -> Optional[str]:
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.used.add(key)
+        return fragment
+
+    def put(self, key: FragmentKey, fragment: str) -> None:
+        self.fragments[key] = fragment
+        self.used.add(key)
+        if len(self.fragments) > self.max_fragments:
+            for stale in list(self.fragments)[: len(self.fragments) - self.max_fragments]:
+                del self.fragments[stale]
+                self.used.discard(stale)
+
+    def clear(self) -> None:
+        self.fragments.clear()
+        self.used.clear()
+        self.hits = self.misses = 0
+
+    def load(self, path: Path) -> int:
+        """Merge fragments saved by an earlier build; returns how many were read."""
+        try:
+            with Path(path).open("rb") as infile:
+                payload = pickle.load(infile)
+        except FileNotFoundError:
+            return 0
+        except (pickle.UnpicklingError, EOFError, AttributeError, ValueError) as exc:
+            print(f"Warning: ignoring unreadable fragment cache {path}: {exc}")
+            return 0
+        if payload.get("format") != FRAGMENT_FORMAT or payload.get("renderer") != renderer_digest():
+            return 0
+        fragments = payload["fragments"]
+        for key, fragment in fragments.items():
+            self.fragments.setdefault(key, fragment)
+        return len(fragments)
+
+    def save(self, path: Path) -> None:
+        """Persist the fragments used by this build; unused ones are dropped."""
+        fragments = {key: self.fragments[key] for key in self.used if key in self.fragments}
+        payload = {"format": FRAGMENT_FORMAT, "renderer": renderer_digest(), "fragments": fragments}
+        atomic_write_bytes(Path(path), pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
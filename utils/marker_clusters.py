@@ -0,0 +1,144 @@
+"""Multi-zoom clustering of map markers, computed at build time.
+
+Overlapping markers used to be nudged apart by fixed 0.03° offsets, which
+moved pins by kilometres and still piled them up in busy areas. Instead the
+build clusters the markers once per zoom level, like supercluster: starting
+from the individual markers just above ``MAX_ZOOM``, every level greedily
+merges the nodes of the level above that lie within ``RADIUS_PX`` screen
+pixels of each other into a weighted-centroid cluster. Neighbours are found
+through a grid of radius-sized cells, so each level is linear in the number
+of nodes.
+
+The index only stores the clusters (the zoom they form at, centroid, size
+and parent) and each marker's innermost cluster. The map walks a marker up
+its parents to find what represents it at the current zoom and groups the
+markers it shows by that, so filtering stays on the client and costs
+O(markers).
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+CLUSTER_FORMAT = 1
+MIN_ZOOM = 0
+# Leaflet zooms above this show the MAX_ZOOM clusters, i.e. only markers
+# within a few dozen metres of each other stay grouped.
+MAX_ZOOM = 16
+RADIUS_PX = 40
+TILE_SIZE = 256
+MIN_POINTS = 2
+COORDINATE_DIGITS = 5
+
+# (marker id, lat, lng)
+MarkerPoint = Tuple[str, float, float]
+
+
+def _project(lat: float, lng: float) -> Tuple[float, float]:
+    """Web Mercator position in the unit square."""
+
+    sin = math.sin(math.radians(max(min(lat, 85.0511), -85.0511)))
+    return lng / 360 + 0.5, 0.5 - 0.25 * math.log((1 + sin) / (1 - sin)) / math.pi
+
+
+def _unproject(x: float, y: float) -> Tuple[float, float]:
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+    return round(lat, COORDINATE_DIGITS), round((x - 0.5) * 360, COORDINATE_DIGITS)
+
+
+class _Node:
+    __slots__ = ("x", "y", "count", "row", "visited")
+
+    def __init__(self, x: float, y: float, count: int, row: int) -> None:
+        self.x = x
+        self.y = y
+        self.count = count
+        # Row in the cluster list; individual markers use -1 - their position
+        self.row = row
+        self.visited = False
+
+
+def build_marker_clusters(
+    points: Iterable[MarkerPoint],
+    min_zoom: int = MIN_ZOOM,
+    max_zoom: int = MAX_ZOOM,
+    radius_px: int = RADIUS_PX,
+) -> Dict[str, Any]:
+    """Cluster index for ``points``, ready to serialise as JSON.
+
+    ``clusters`` holds ``[zoom, lat, lng, count, parent]`` rows, where
+    ``zoom`` is the highest zoom the cluster is shown at and ``parent`` the
+    row it merges into at lower zooms (-1 for none). ``points`` maps every
+    marker id to its innermost cluster row, or -1 if it is never clustered.
+    """
+
+    marker_ids: List[str] = []
+    level: List[_Node] = []
+    for marker_id, lat, lng in points:
+        level.append(_Node(*_project(lat, lng), 1, -1 - len(marker_ids)))
+        marker_ids.append(marker_id)
+
+    clusters: List[List[Any]] = []
+    marker_parents = [-1] * len(marker_ids)
+    for zoom in range(max_zoom, min_zoom - 1, -1):
+        radius = radius_px / (TILE_SIZE * 2**zoom)
+        grid: Dict[Tuple[int, int], List[_Node]] = {}
+        for node in level:
+            node.visited = False
+            grid.setdefault((int(node.x // radius), int(node.y // radius)), []).append(node)
+
+        next_level: List[_Node] = []
+        for node in level:
+            if node.visited:
+                continue
+            node.visited = True
+            cell_x, cell_y = int(node.x // radius), int(node.y // radius)
+            neighbours = [
+                other
+                for cell in ((cell_x + dx, cell_y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+                for other in grid.get(cell, ())
+                if not other.visited and (other.x - node.x) ** 2 + (other.y - node.y) ** 2 <= radius * radius
+            ]
+            count = node.count + sum(other.count for other in neighbours)
+            if not neighbours or count < MIN_POINTS:
+                next_level.append(node)
+                continue
+
+            members = [node, *neighbours]
+            x = sum(member.x * member.count for member in members) / count
+            y = sum(member.y * member.count for member in members) / count
+            row = len(clusters)
+            clusters.append([zoom, *_unproject(x, y), count, -1])
+            for member in members:
+                member.visited = True
+                if member.row >= 0:
+                    clusters[member.row][4] = row
+                else:
+                    marker_parents[-1 - member.row] = row
+            next_level.append(_Node(x, y, count, row))
+        level = next_level
+
+    return {
+        "format": CLUSTER_FORMAT,
+        "min_zoom": min_zoom,
+        "max_zoom": max_zoom,
+        "points": dict(zip(marker_ids, marker_parents)),
+        "clusters": clusters,
+    }
+
+
+def cluster_at_zoom(index: Dict[str, Any], marker_id: str, zoom: int) -> Optional[int]:
+    """Cluster row that shows ``marker_id`` at ``zoom``, or None if it is shown on its own.
+
+    Mirrors ``getMarkerClusterAtZoom`` in map_scriptrs.js.
+    """
+
+    zoom = min(zoom, index["max_zoom"])
+    clusters = index["clusters"]
+    row = index["points"].get(marker_id, -1)
+    if row < 0 or clusters[row][0] < zoom:
+        return None
+    while clusters[row][4] >= 0 and clusters[clusters[row][4]][0] >= zoom:
+        row = clusters[row][4]
+    return row
@@ -0,0 +1,186 @@
+"""Region lookup for event coordinates, from the polygons in storage/regions.json.
+
+Each region has a ``code`` stored on events as ``region_code``, a display
+``name`` (北加, 南加, ...) and a polygon of ``[lat, lng]`` vertices; the first
+region containing a point wins, and points on a polygon edge count as
+inside. The index lays a grid of ``cell_degrees`` cells over the regions:
+a cell records the regions whose bounding box reaches it and whether the
+cell lies wholly inside one, so most lookups never run the point-in-polygon
+test at all.
+
+Regions are assigned once when events are written (``tag_event_regions``);
+renderers only map the stored code to its name.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from utils.event_model import parse_gps_coordinates
+
+DEFAULT_REGIONS_FILE = Path(__file__).resolve().parent.parent / "storage" / "regions.json"
+DEFAULT_CELL_DEGREES = 0.5
+
+Point = Tuple[float, float]
+
+
+class Region:
+    """One named polygon."""
+
+    __slots__ = ("code", "name", "polygon", "bbox")
+
+    def __init__(self, code: str, name: str, polygon: Sequence[Sequence[float]]) -> None:
+        self.code = code
+        self.name = name
+        self.polygon: List[Point] = [(float(lat), float(lng)) for lat, lng in polygon]
+        lats = [lat for lat, _ in self.polygon]
+        lngs = [lng for _, lng in self.polygon]
+        self.bbox = (min(lats), min(lngs), max(lats), max(lngs))
+
+    def edges(self) -> Iterable[Tuple[Point, Point]]:
+        return zip(self.polygon, self.polygon[1:] + self.polygon[:1])
+
+    def contains(self, lat: float, lng: float) -> bool:
+        """Ray casting, with points on an edge counted as inside."""
+
+        inside = False
+        for (lat1, lng1), (lat2, lng2) in self.edges():
+            if _on_segment(lat, lng, lat1, lng1, lat2, lng2):
+                return True
+            if (lng1 > lng) != (lng2 > lng):
+                crossing = lat1 + (lng - lng1) * (lat2 - lat1) / (lng2 - lng1)
+                if lat < crossing:
+                    inside = not inside
+        return inside
+
+    def covers_cell(self, south: float, west: float, north: float, east: float) -> bool:
+        """True if the whole cell lies inside the polygon."""
+
+        corners = ((south, west), (south, east), (north, west), (north, east))
+        if not all(self.contains(lat, lng) for lat, lng in corners):
+            return False
+        return not any(_crosses_cell_interior(edge, south, west, north, east) for edge in self.edges())
+
+
+def _on_segment(lat: float, lng: float, lat1: float, lng1: float, lat2: float, lng2: float) -> bool:
+    cross = (lat2 - lat1) * (lng - lng1) - (lng2 - lng1) * (lat - lat1)
+    if abs(cross) > 1e-12:
+        return False
+    return min(lat1, lat2) <= lat <= max(lat1, lat2) and min(lng1, lng2) <= lng <= max(lng1, lng2)
+
+
+def _crosses_cell_interior(edge: Tuple[Point, Point], south: float, west: float, north: float, east: float) -> bool:
+    """Clip the edge to the cell (Liang-Barsky) and test the clipped midpoint.
+
+    The open segment between two boundary points of a rectangle is interior
+    unless both lie on the same side, so the midpoint decides.
+    """
+
+    (lat1, lng1), (lat2, lng2) = edge
+    d_lat, d_lng = lat2 - lat1, lng2 - lng1
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-d_lat, lat1 - south), (d_lat, north - lat1), (-d_lng, lng1 - west), (d_lng, east - lng1)):
+        if p == 0:
+            if q < 0:
+                return False
+            continue
+        t = q / p
+        if p < 0:
+            t0 = max(t0, t)
+        else:
+            t1 = min(t1, t)
+        if t0 > t1:
+            return False
+    t = (t0 + t1) / 2
+    lat, lng = lat1 + t * d_lat, lng1 + t * d_lng
+    return south < lat < north and west < lng < east
+
+
+class RegionIndex:
+    """Grid-accelerated point-in-polygon lookup over the regions."""
+
+    __slots__ = ("regions", "cell_degrees", "cells", "_names")
+
+    def __init__(self, regions: Sequence[Region], cell_degrees: float = DEFAULT_CELL_DEGREES) -> None:
+        self.regions = list(regions)
+        self.cell_degrees = cell_degrees
+        self._names = {region.code: region.name for region in self.regions}
+        # (row, col) -> [(region, covers whole cell)] in region priority order
+        self.cells: Dict[Tuple[int, int], List[Tuple[Region, bool]]] = {}
+        for region in self.regions:
+            south, west, north, east = region.bbox
+            for row in range(self._cell(south), self._cell(north) + 1):
+                for col in range(self._cell(west), self._cell(east) + 1):
+                    covers = region.covers_cell(
+                        row * cell_degrees, col * cell_degrees, (row + 1) * cell_degrees, (col + 1) * cell_degrees
+                    )
+                    self.cells.setdefault((row, col), []).append((region, covers))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "RegionIndex":
+        regions = [Region(entry["code"], entry["name"], entry["polygon"]) for entry in data.get("regions", [])]
+        return cls(regions, data.get("cell_degrees", DEFAULT_CELL_DEGREES))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RegionIndex":
+        with path.open("r", encoding="utf-8") as infile:
+            return cls.from_dict(json.load(infile))
+
+    def _cell(self, degrees: float) -> int:
+        return math.floor(degrees / self.cell_degrees)
+
+    def region_for(self, lat: float, lng: float) -> Optional[Region]:
+        for region, covers in self.cells.get((self._cell(lat), self._cell(lng)), ()):
+            if covers or region.contains(lat, lng):
+                return region
+        return None
+
+    def code_for_gps(self, gps_coordinates: Any) -> str:
+        """Region code for a ``"lat, lng"`` string; empty when outside every region."""
+
+        lat, lng = parse_gps_coordinates(gps_coordinates)
+        if lat is None:
+            return ""
+        region = self.region_for(lat, lng)
+        return region.code if region else ""
+
+    def names(self) -> Dict[str, str]:
+        """Display name by region code."""
+
+        return dict(self._names)
+
+    def name_of(self, code: str) -> str:
+        return self._names.get(code, "")
+
+
+@lru_cache(maxsize=1)
+def default_region_index() -> RegionIndex:
+    return RegionIndex.from_file(DEFAULT_REGIONS_FILE)
+
+
+def tag_event_regions(events: Iterable[Dict[str, Any]], index: Optional[RegionIndex] = None) -> None:
+    """Store each event's ``region_code`` (empty outside every region), in place."""
+
+    index = index or default_region_index()
+    for event in events:
+        event["region_code"] = index.code_for_gps(event.get("gps_coordinates"))
+
+
+def event_region_code(event: Mapping[str, Any], index: Optional[RegionIndex] = None) -> str:
+    """The event's stored ``region_code``; events stored before tagging are looked up."""
+
+    code = event.get("region_code")
+    if code is None:
+        code = (index or default_region_index()).code_for_gps(event.get("gps_coordinates"))
+    return code
+
+
+def region_name(event: Mapping[str, Any], index: Optional[RegionIndex] = None) -> str:
+    """Display name of the event's region."""
+
+    index = index or default_region_index()
+    return index.name_of(event_region_code(event, index))
@@ -0,0 +1,236 @@
+"""Compact binary container for route geometry.
+
+Each route is stored as little-endian int32 lat/lng deltas at a fixed
+precision (the first pair is absolute), optionally zlib-compressed::
+
+    magic "HQYG" | version u8 | flags u8 | precision u8 | pad u8 | count u32 | deltas
+
+Many routes are packed into one ``routes.pack`` file whose JSON index maps
+route hashes to byte ranges and event ids to route hashes. Uncompressed
+routes are read as ``memoryview`` slices of the pack buffer, so loading a pack
+does not copy or decode any geometry until a caller asks for coordinates.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from utils.atomic_io import atomic_write_bytes
+from utils.route_utils import DEFAULT_PRECISION, _decode_polyline_ints, _encode_value
+
+try:  # NumPy is optional; it only speeds up bulk coordinate access.
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+
+GEOMETRY_MAGIC = b"HQYG"
+PACK_MAGIC = b"HQYP"
+FORMAT_VERSION = 1
+FLAG_ZLIB = 0x01
+_GEOMETRY_HEADER = struct.Struct("<4sBBBxI")
+_PACK_HEADER = struct.Struct("<4sBxxxI")
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def route_hash(route_polyline: str) -> str:
+    """Return the short content hash used to address a route."""
+
+    return hashlib.sha1(route_polyline.encode("utf-8")).hexdigest()[:16]
+
+
+def strip_route_polyline(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a stored event with its polyline replaced by the ``route_hash``.
+
+    Client bundles carry these summaries; the polyline is fetched from the
+    route's own file when the map draws it.
+    """
+
+    summary = dict(event)
+    polyline = summary.pop("route_polyline", None)
+    if polyline:
+        summary["route_hash"] = route_hash(polyline)
+    return summary
+
+
+class RouteGeometry:
+    """Delta-encoded route points backed by an int32 buffer."""
+
+    __slots__ = ("precision", "deltas")
+
+    def __init__(self, deltas: Sequence[int], precision: int = DEFAULT_PRECISION) -> None:
+        if len(deltas) % 2:
+            raise ValueError("Route deltas must contain lat/lng pairs")
+        self.precision = precision
+        self.deltas = deltas
+
+    def __len__(self) -> int:
+        return len(self.deltas) // 2
+
+    @classmethod
+    def from_polyline(cls, route_polyline: str, precision: int = DEFAULT_PRECISION) -> "RouteGeometry":
+        """Build a geometry from a canonical Google polyline."""
+
+        return cls(array("i", _decode_polyline_ints(route_polyline)), precision)
+
+    @classmethod
+    def from_coordinates(
+        cls,
+        coordinates: Iterable[Sequence[float]],
+        precision: int = DEFAULT_PRECISION,
+    ) -> "RouteGeometry":
+        factor = 10 ** precision
+        deltas = array("i")
+        prev_lat = prev_lng = 0
+        for lat, lng in coordinates:
+            lat_i = int(round(lat * factor))
+            lng_i = int(round(lng * factor))
+            deltas.append(lat_i - prev_lat)
+            deltas.append(lng_i - prev_lng)
+            prev_lat, prev_lng = lat_i, lng_i
+        return cls(deltas, precision)
+
+    @classmethod
+    def from_bytes(cls, buffer: Any) -> "RouteGeometry":
+        """Load a geometry; uncompressed little-endian payloads are not copied."""
+
+        view = memoryview(buffer)
+        magic, version, flags, precision, count = _GEOMETRY_HEADER.unpack_from(view)
+        if magic != GEOMETRY_MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a route geometry buffer")
+        payload: Any = view[_GEOMETRY_HEADER.size:]
+        if flags & FLAG_ZLIB:
+            payload = memoryview(zlib.decompress(payload))
+        if len(payload) != count * 8:
+            raise ValueError("Route geometry payload is truncated")
+        if _LITTLE_ENDIAN:
+            deltas: Sequence[int] = payload.cast("i")
+        else:  # pragma: no cover - big-endian hosts need a swapped copy
+            deltas = array("i", payload.tobytes())
+            deltas.byteswap()
+        return cls(deltas, precision)
+
+    def to_bytes(self, *, compress: bool = False) -> bytes:
+        deltas = array("i", self.deltas)
+        if not _LITTLE_ENDIAN:  # pragma: no cover
+            deltas.byteswap()
+        payload = deltas.tobytes()
+        flags = 0
+        if compress:
+            payload = zlib.compress(payload, 9)
+            flags |= FLAG_ZLIB
+        header = _GEOMETRY_HEADER.pack(GEOMETRY_MAGIC, FORMAT_VERSION, flags, self.precision, len(self))
+        return header + payload
+
+    def iter_coordinates(self) -> Iterator[Tuple[float, float]]:
+        factor = 10 ** self.precision
+        deltas = self.deltas
+        lat = lng = 0
+        for index in range(0, len(deltas), 2):
+            lat += deltas[index]
+            lng += deltas[index + 1]
+            yield lat / factor, lng / factor
+
+    def coordinates(self) -> List[Tuple[float, float]]:
+        return list(self.iter_coordinates())
+
+    def as_array(self) -> Any:
+        """Return an (N, 2) float array of lat/lng; requires NumPy."""
+
+        if np is None:
+            raise RuntimeError("NumPy is required for RouteGeometry.as_array()")
+        ints = np.frombuffer(self.deltas, dtype="<i4").reshape(-1, 2)
+        return ints.cumsum(axis=0, dtype=np.int64) / float(10 ** self.precision)
+
+    def to_polyline(self) -> str:
+        output: List[str] = []
+        for value in self.deltas:
+            _encode_value(value, output)
+        return "".join(output)
+
+
+class RoutePack:
+    """Read-only view over a routes.pack buffer."""
+
+    __slots__ = ("_buffer", "routes", "events")
+
+    def __init__(self, buffer: bytes) -> None:
+        view = memoryview(buffer)
+        magic, version, index_length = _PACK_HEADER.unpack_from(view)
+        if magic != PACK_MAGIC or version != FORMAT_VERSION:
+            raise ValueError("Not a route pack")
+        index_end = _PACK_HEADER.size + index_length
+        index = json.loads(bytes(view[_PACK_HEADER.size:index_end]))
+        self._buffer = view[index_end:]
+        self.routes: Dict[str, Tuple[int, int]] = {key: tuple(span) for key, span in index["routes"].items()}
+        self.events: Dict[str, str] = index["events"]
+
+    def __len__(self) -> int:
+        return len(self.routes)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.routes
+
+    def get(self, key: str) -> Optional[RouteGeometry]:
+        span = self.routes.get(key)
+        if span is None:
+            return None
+        offset, length = span
+        return RouteGeometry.from_bytes(self._buffer[offset:offset + length])
+
+    def for_event(self, event_id: str) -> Optional[RouteGeometry]:
+        key = self.events.get(event_id)
+        return self.get(key) if key else None
+
+    def iter_event_geometries(self) -> Iterator[Tuple[str, RouteGeometry]]:
+        for event_id, key in self.events.items():
+            geometry = self.get(key)
+            if geometry is not None:
+                yield event_id, geometry
+
+
+def build_route_pack(events: Iterable[Dict[str, Any]], *, compress: bool = False) -> bytes:
+    """Pack the distinct route polylines of ``events`` into one buffer."""
+
+    blobs: List[bytes] = []
+    routes: Dict[str, List[int]] = {}
+    event_routes: Dict[str, str] = {}
+    offset = 0
+    for event in events:
+        polyline = event.get("route_polyline") or ""
+        event_id = event.get("_id")
+        if not polyline or not event_id:
+            continue
+        key = route_hash(polyline)
+        if key not in routes:
+            try:
+                blob = RouteGeometry.from_polyline(polyline).to_bytes(compress=compress)
+            except ValueError:
+                continue
+            routes[key] = [offset, len(blob)]
+            blobs.append(blob)
+            offset += len(blob)
+        event_routes[str(event_id)] = key
+
+    index = json.dumps({"routes": routes, "events": event_routes}, separators=(",", ":")).encode("utf-8")
+    return _PACK_HEADER.pack(PACK_MAGIC, FORMAT_VERSION, len(index)) + index + b"".join(blobs)
+
+
+def write_route_pack(events: Iterable[Dict[str, Any]], path: Path, *, compress: bool = False) -> int:
+    """Write ``routes.pack`` for ``events`` and return the number of routes."""
+
+    data = build_route_pack(events, compress=compress)
+    atomic_write_bytes(path, data)
+    return len(RoutePack(data))
+
+
+def load_route_pack(path: Path) -> Optional[RoutePack]:
+    if not path.exists():
+        return None
+    return RoutePack(path.read_bytes())
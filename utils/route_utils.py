@@ -4,16 +4,27 @@ from __future__ import annotations
 
 import base64
 import binascii
+import json
 import math
-from typing import Iterable, List, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Sequence, Tuple
 
-from utils.constants import RouteOrientation
+from utils.constants import PolylineFormat, RouteOrientation
+
+if TYPE_CHECKING:
+    from utils.route_geometry import RouteGeometry
 
 BASE64_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=\n\r")
+# Google polylines use "?" (63) to "~" (126); characters below "_" end a value.
+POLYLINE_CHARS = frozenset(chr(code) for code in range(63, 127))
+POLYLINE_VALUE_END_CHARS = tuple(chr(code) for code in range(63, 95))
 EARTH_RADIUS_M = 6_371_000.0
 DEFAULT_PRECISION = 5
+CANONICAL_PRECISION = DEFAULT_PRECISION
 DEFAULT_CLOSURE_THRESHOLD_M = 50.0
 AREA_EPSILON = 1e-12
+EXTENT_DIGITS = 5
+ROUTE_INDEX_CELL_DEGREES = 0.25
+ROUTE_EXTENT_FIELDS = ("route_bbox", "route_centroid", "route_length_meters")
 
 
 def _maybe_decode_base64(encoded: str) -> str:
@@ -55,6 +66,46 @@ def _decode_value(polyline: str, index: int) -> Tuple[int, int]:
     return delta, index
 
 
+def _decode_polyline_ints(polyline: str) -> List[int]:
+    """Return the raw interleaved lat/lng deltas of a polyline string."""
+
+    deltas: List[int] = []
+    index = 0
+    while index < len(polyline):
+        d_lat, index = _decode_value(polyline, index)
+        d_lng, index = _decode_value(polyline, index)
+        deltas.append(d_lat)
+        deltas.append(d_lng)
+    return deltas
+
+
+def _encode_value(value: int, output: List[str]) -> None:
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        output.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    output.append(chr(value + 63))
+
+
+def encode_polyline(
+    coordinates: Iterable[Sequence[float]],
+    precision: int = DEFAULT_PRECISION,
+) -> str:
+    """Encode latitude/longitude pairs as a Google-style polyline string."""
+
+    factor = 10 ** precision
+    output: List[str] = []
+    prev_lat = 0
+    prev_lng = 0
+    for lat, lng in coordinates:
+        lat_i = int(round(float(lat) * factor))
+        lng_i = int(round(float(lng) * factor))
+        _encode_value(lat_i - prev_lat, output)
+        _encode_value(lng_i - prev_lng, output)
+        prev_lat, prev_lng = lat_i, lng_i
+    return "".join(output)
+
+
 def decode_polyline(polyline: str, precision: int = DEFAULT_PRECISION) -> List[Tuple[float, float]]:
     """Decode a Google-style polyline string into latitude/longitude pairs."""
 
@@ -111,8 +162,160 @@ def _signed_area(points: Sequence[Sequence[float]]) -> float:
     return area / 2.0
 
 
+def _route_points(
+    route: str | RouteGeometry,
+    precision: int = DEFAULT_PRECISION,
+) -> List[Tuple[float, float]]:
+    """Return the points of a polyline string or a binary ``RouteGeometry``.
+
+    Stored polylines are canonical (see ``normalize_route_polyline``), so no
+    format detection happens here. Raises ``ValueError`` for malformed
+    polylines.
+    """
+
+    if not isinstance(route, str):
+        return route.coordinates()
+    return decode_polyline(route, precision=precision)
+
+
+def _in_coordinate_range(deltas: Sequence[int], factor: int) -> bool:
+    lat = 0
+    lng = 0
+    for index in range(0, len(deltas), 2):
+        lat += deltas[index]
+        lng += deltas[index + 1]
+        if abs(lat) > 90 * factor or abs(lng) > 180 * factor:
+            return False
+    return True
+
+
+def _garmin_points(payload: Any) -> List[Tuple[float, float]]:
+    if isinstance(payload, dict):
+        payload = payload.get("polyline") or payload.get("geoPoints") or []
+    points: List[Tuple[float, float]] = []
+    for point in payload if isinstance(payload, list) else []:
+        if isinstance(point, dict):
+            lat = point.get("lat", point.get("latitude"))
+            lng = point.get("lon", point.get("lng", point.get("longitude")))
+        elif isinstance(point, (list, tuple)) and len(point) >= 2:
+            lat, lng = point[0], point[1]
+        else:
+            continue
+        if lat is None or lng is None:
+            continue
+        points.append((float(lat), float(lng)))
+    return points
+
+
+def normalize_route_polyline(value: Any) -> Tuple[str, PolylineFormat]:
+    """Rewrite a stored route into the canonical polyline encoding.
+
+    Accepts plain Google polylines, base64-wrapped polylines, precision-6
+    polylines and Garmin ``geoPolyline`` payloads (as a dict, a point list or
+    their JSON text). Returns ``(canonical_polyline, detected_format)`` where
+    the canonical form is a Google polyline at ``CANONICAL_PRECISION``.
+    Raises ``ValueError`` when the value cannot be interpreted as a route.
+    """
+
+    if value is None or value == "":
+        return "", PolylineFormat.EMPTY
+
+    if isinstance(value, (dict, list)):
+        points = _garmin_points(value)
+        if not points:
+            raise ValueError("Garmin geoPolyline payload has no points")
+        return encode_polyline(points, CANONICAL_PRECISION), PolylineFormat.GARMIN
+
+    text = str(value).strip()
+    if not text:
+        return "", PolylineFormat.EMPTY
+
+    # A plain polyline is tried before base64: letters-only polylines are
+    # valid base64 text too, while base64 digits, "+", "/" and "=" never
+    # occur in a polyline.
+    candidates: List[Tuple[str, PolylineFormat]] = [(text, PolylineFormat.GOOGLE)]
+    unwrapped = _maybe_decode_base64(text).strip()
+    if unwrapped and unwrapped != text:
+        candidates.append((unwrapped, PolylineFormat.BASE64))
+
+    last_error = "Polyline contains characters outside the polyline alphabet"
+    for candidate, source_format in candidates:
+        if candidate[0] not in "{[" and not set(candidate) <= POLYLINE_CHARS:
+            continue
+        if candidate[0] in "{[":
+            try:
+                payload = json.loads(candidate)
+            except ValueError:
+                payload = None
+            if payload is not None:
+                return normalize_route_polyline(payload)[0], PolylineFormat.GARMIN
+        try:
+            canonical, detected_format = _canonical_from_polyline(candidate)
+        except ValueError as exc:
+            last_error = str(exc)
+            continue
+        if detected_format is PolylineFormat.PRECISION6:
+            source_format = detected_format
+        return canonical, source_format
+
+    raise ValueError(last_error)
+
+
+def _canonical_from_polyline(polyline: str) -> Tuple[str, PolylineFormat]:
+    deltas = _decode_polyline_ints(polyline)
+    if not deltas:
+        raise ValueError("Polyline has no points")
+
+    factor = 10 ** CANONICAL_PRECISION
+    if not _in_coordinate_range(deltas, factor):
+        if not _in_coordinate_range(deltas, factor * 10):
+            raise ValueError("Polyline decodes outside of valid coordinates")
+        points = decode_polyline(polyline, precision=CANONICAL_PRECISION + 1)
+        return encode_polyline(points, CANONICAL_PRECISION), PolylineFormat.PRECISION6
+
+    output: List[str] = []
+    for delta in deltas:
+        _encode_value(delta, output)
+    return "".join(output), PolylineFormat.GOOGLE
+
+
+def is_canonical_polyline(value: Any) -> bool:
+    """Cheap format check for a stored route: a well-formed Google polyline.
+
+    Only the alphabet and the value boundaries are checked; nothing is
+    decoded, so this can run on every storage write. Converting other
+    formats is ``normalize_route_polyline``'s job at ingest.
+    """
+
+    if not isinstance(value, str):
+        return False
+    if not value:
+        return True
+    if not set(value) <= POLYLINE_CHARS or value[-1] not in POLYLINE_VALUE_END_CHARS:
+        return False
+    # Complete lat/lng pairs
+    return sum(map(value.count, POLYLINE_VALUE_END_CHARS)) % 2 == 0
+
+
+def canonicalize_event_route(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Ingest guard: store ``route_polyline`` on ``event`` in canonical form.
+
+    Routes that cannot be interpreted are dropped with a warning instead of
+    being stored in a format downstream code would have to sniff.
+    """
+
+    if "route_polyline" not in event:
+        return event
+    try:
+        event["route_polyline"], _ = normalize_route_polyline(event.get("route_polyline"))
+    except ValueError as exc:
+        print(f"Warning: dropping unreadable route_polyline for {event.get('_id', 'unknown')}: {exc}")
+        event["route_polyline"] = ""
+    return event
+
+
 def classify_route_loop(
-    route_polyline: str,
+    route_polyline: str | RouteGeometry,
     *,
     precision: int = DEFAULT_PRECISION,
     closure_threshold_m: float = DEFAULT_CLOSURE_THRESHOLD_M,
@@ -123,14 +326,11 @@ def classify_route_loop(
     ``RouteOrientation.COUNTERCLOCKWISE`` when the
     geometry forms a closed loop. ``None`` indicates the shape is not a loop or
     the winding direction cannot be determined (e.g., degenerate area).
+    ``route_polyline`` may also be a ``RouteGeometry`` loaded from a route pack.
     """
 
-    decoded_polyline = _maybe_decode_base64(route_polyline)
-    if not decoded_polyline:
-        return False, None
-
     try:
-        points = decode_polyline(decoded_polyline, precision=precision)
+        points = _route_points(route_polyline, precision)
     except ValueError:
         return False, None
 
@@ -149,3 +349,89 @@ def classify_route_loop(
         RouteOrientation.COUNTERCLOCKWISE if area > 0 else RouteOrientation.CLOCKWISE
     )
     return True, orientation
+
+
+def compute_route_extent(
+    route_polyline: str | RouteGeometry,
+    *,
+    precision: int = DEFAULT_PRECISION,
+) -> Dict[str, Any]:
+    """Return the bounding box, centroid and length of a route polyline.
+
+    The result uses the same keys that are stored on events
+    (``route_bbox``, ``route_centroid``, ``route_length_meters``) so callers
+    can ``update`` an event with it directly. An empty dict is returned when
+    the polyline is missing or cannot be decoded.
+    """
+
+    try:
+        points = _route_points(route_polyline, precision)
+    except ValueError:
+        return {}
+
+    cleaned = _dedupe_sequential(points)
+    if not cleaned:
+        return {}
+
+    lats = [lat for lat, _ in cleaned]
+    lngs = [lng for _, lng in cleaned]
+    length_m = 0.0
+    for index in range(1, len(cleaned)):
+        length_m += _haversine_distance_m(cleaned[index - 1], cleaned[index])
+
+    return {
+        "route_bbox": [
+            round(min(lats), EXTENT_DIGITS),
+            round(min(lngs), EXTENT_DIGITS),
+            round(max(lats), EXTENT_DIGITS),
+            round(max(lngs), EXTENT_DIGITS),
+        ],
+        "route_centroid": [
+            round(sum(lats) / len(lats), EXTENT_DIGITS),
+            round(sum(lngs) / len(lngs), EXTENT_DIGITS),
+        ],
+        "route_length_meters": int(round(length_m)),
+    }
+
+
+def annotate_route_extent(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Store the route extent fields on ``event`` in place and return it."""
+
+    extent = compute_route_extent(event.get("route_polyline") or "")
+    for key in ROUTE_EXTENT_FIELDS:
+        event.pop(key, None)
+    event.update(extent)
+    return event
+
+
+def _grid_cell(value: float, cell_degrees: float) -> int:
+    return math.floor(value / cell_degrees)
+
+
+def build_route_grid_index(
+    events: Iterable[Dict[str, Any]],
+    *,
+    cell_degrees: float = ROUTE_INDEX_CELL_DEGREES,
+) -> Dict[str, Any]:
+    """Bucket event routes into a coarse lat/lng grid keyed by ``"row,col"``.
+
+    Each route is registered in every cell its bounding box touches, so the
+    map can look up the routes for a viewport without decoding polylines.
+    Events that were stored before the extent fields existed are measured on
+    the fly.
+    """
+
+    cells: Dict[str, List[str]] = {}
+    for event in events:
+        bbox = event.get("route_bbox")
+        if not bbox:
+            bbox = compute_route_extent(event.get("route_polyline") or "").get("route_bbox")
+        if not bbox:
+            continue
+        event_id = f"event-{event.get('_id', '')}"
+        min_lat, min_lng, max_lat, max_lng = bbox
+        for row in range(_grid_cell(min_lat, cell_degrees), _grid_cell(max_lat, cell_degrees) + 1):
+            for col in range(_grid_cell(min_lng, cell_degrees), _grid_cell(max_lng, cell_degrees) + 1):
+                cells.setdefault(f"{row},{col}", []).append(event_id)
+
+    return {"cell_degrees": cell_degrees, "cells": cells}
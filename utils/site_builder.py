@@ -0,0 +1,692 @@
+"""Incremental build of the static HTML pages.
+
+Each ``Artifact`` names one output file, the source files it is rendered
+from (template, styles, renderer code) and a ``select`` step that picks the
+events it shows. ``build_site`` hashes those inputs and compares them with
+the hashes recorded in storage/build_manifest.json when the output was last
+written. Only artifacts whose inputs changed, or whose output is missing or
+was edited by hand, are rendered again; every artifact is reported as
+rebuilt or up to date, with the reason.
+
+The events input is the content hash of every selected event in display
+order, so a page is rebuilt when an event it shows changes or moves between
+lists as time passes, but not when unrelated events are ingested.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from utils.atomic_io import atomic_write_text
+from utils.event_archive import (
+    ARCHIVE_CHUNK_SIZE,
+    ARCHIVE_DIR_NAME,
+    build_archive,
+    dump_events,
+    remove_archive_file,
+    write_archive_file,
+)
+from utils.event_codec import UTC, dumps, isoformat_datetime, loads
+from utils.event_index import EventIndex
+from utils.event_pages import EVENT_PAGES_DIR_NAME, event_page_name, write_event_pages
+from utils.event_storage import BASE_DIR, DEFAULT_EVENTS_FILE, load_indexed_events
+from utils.html_fragment_cache import event_content_hash, fragment_cache_path_for
+from utils.load_html_utils import (
+    default_fragment_cache,
+    gen_div_for_events_from_list,
+    gen_gmp_advanced_marker_for_events_from_list,
+    local_tz,
+    serialize_event_markers_to_json,
+    serialize_marker_clusters_to_json,
+)
+from utils.region_index import event_region_code
+
+MANIFEST_FORMAT = 1
+DEFAULT_MANIFEST_FILE = DEFAULT_EVENTS_FILE.parent / "build_manifest.json"
+# Code that shapes every page; editing it rebuilds everything.
+RENDERER_SOURCES = ("utils/load_html_utils.py", "utils/site_builder.py", "storage/regions.json")
+
+# Named event lists in display order, e.g. {"upcoming": [...], "past": [...]}
+Selection = Dict[str, List[Dict[str, Any]]]
+
+
+class BuildContext:
+    """Shared state for one build: the clock and the loaded event indexes."""
+
+    __slots__ = ("root", "events_path", "now", "workers", "fragments_loaded", "_indexes")
+
+    def __init__(
+        self,
+        root: Path,
+        events_path: Path,
+        now: Optional[datetime] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.root = root
+        self.events_path = events_path
+        # Naive UTC, like runtime event times.
+        self.now = now or datetime.now(UTC).replace(tzinfo=None)
+        self.workers = workers
+        self.fragments_loaded = False
+        self._indexes: Dict[Tuple[Optional[datetime], Optional[datetime]], EventIndex] = {}
+
+    def load_fragments(self) -> None:
+        """Load the previous build's rendered cards before the first render."""
+        if not self.fragments_loaded:
+            default_fragment_cache.load(fragment_cache_path_for(self.events_path))
+            self.fragments_loaded = True
+
+    def events(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> EventIndex:
+        """Active, validated events in ``[start, end)``, loaded once per window."""
+        window = (start, end)
+        if window not in self._indexes:
+            self._indexes[window] = load_indexed_events(
+                self.events_path, active_only=True, start=start, end=end, model=True, validate=True
+            )
+        return self._indexes[window]
+
+
+class Artifact:
+    """One output file and the inputs it is built from."""
+
+    __slots__ = ("name", "output", "template", "sources", "select", "render")
+
+    def __init__(
+        self,
+        name: str,
+        output: str,
+        template: str,
+        sources: Sequence[str],
+        select: Callable[[BuildContext], Selection],
+        render: Callable[[BuildContext, str, Selection], str],
+    ) -> None:
+        self.name = name
+        self.output = output
+        self.template = template
+        self.sources = tuple(sources)
+        self.select = select
+        self.render = render
+
+    def input_files(self) -> Tuple[str, ...]:
+        return (self.template, *self.sources, *RENDERER_SOURCES)
+
+    def build(
+        self, context: BuildContext, record: Optional[Dict[str, Any]], *, force: bool, dry_run: bool
+    ) -> Tuple["BuildResult", Optional[Dict[str, Any]]]:
+        """Render the page if it is stale; returns the result and the new manifest record."""
+
+        started = time.perf_counter()
+        output_path = context.root / self.output
+        selection = self.select(context)
+        inputs = input_hashes(self, context, selection)
+        reasons = ["forced"] if force else stale_reasons(record, inputs, output_path)
+        if not reasons or dry_run:
+            return BuildResult(self.name, self.output, reasons), None
+
+        context.load_fragments()
+        template = (context.root / self.template).read_text(encoding="utf-8")
+        html = self.render(context, template, selection)
+        atomic_write_text(output_path, html)
+        record = {
+            "output": self.output,
+            "output_sha256": hashlib.sha256(html.encode("utf-8")).hexdigest(),
+            "inputs": inputs,
+            "built_at": isoformat_datetime(context.now),
+        }
+        return BuildResult(self.name, self.output, reasons, True, time.perf_counter() - started), record
+
+
+class EventPages:
+    """One static page per selected event, each rebuilt only when it changed."""
+
+    __slots__ = ("name", "output_dir", "template", "sources", "select")
+
+    def __init__(
+        self,
+        name: str,
+        output_dir: str,
+        template: str,
+        sources: Sequence[str],
+        select: Callable[[BuildContext], List[Dict[str, Any]]],
+    ) -> None:
+        self.name = name
+        self.output_dir = output_dir
+        self.template = template
+        self.sources = tuple(sources)
+        self.select = select
+
+    def input_files(self) -> Tuple[str, ...]:
+        return (self.template, *self.sources, *RENDERER_SOURCES, "utils/event_pages.py")
+
+    def build(
+        self, context: BuildContext, record: Optional[Dict[str, Any]], *, force: bool, dry_run: bool
+    ) -> Tuple["BuildResult", Optional[Dict[str, Any]]]:
+        started = time.perf_counter()
+        output_dir = context.root / self.output_dir
+        events = self.select(context)
+        inputs: Dict[str, Optional[str]] = {path: _sha256_file(context.root / path) for path in self.input_files()}
+        # Every page shares the template inputs and the current year.
+        shared = hashlib.sha256(f"{dumps(inputs, pretty=False)}{context.now.year}".encode("utf-8")).hexdigest()
+        pages = {
+            str(event["_id"]): hashlib.sha256(f"{shared}{event_content_hash(event)}".encode("ascii")).hexdigest()
+            for event in events
+        }
+
+        previous = (record or {}).get("pages", {}) if not force else {}
+        new_ids = [event_id for event_id in pages if event_id not in previous]
+        changed_ids = [event_id for event_id in pages if event_id in previous and previous[event_id] != pages[event_id]]
+        missing_ids = [
+            event_id
+            for event_id in pages
+            if previous.get(event_id) == pages[event_id] and not (output_dir / event_page_name(event_id)).exists()
+        ]
+        removed_ids = [event_id for event_id in (record or {}).get("pages", {}) if event_id not in pages]
+
+        stale = set(new_ids) | set(changed_ids) | set(missing_ids)
+        if not (stale or removed_ids):
+            return BuildResult(self.name, self.output_dir, []), None
+        if force:
+            reasons = ["forced"]
+        elif record is None:
+            reasons = ["no previous build recorded"]
+        else:
+            recorded = record.get("inputs", {})
+            reasons = [f"{name} changed" for name, value in inputs.items() if recorded.get(name) != value]
+            for ids, label in ((new_ids, "new"), (changed_ids, "changed"), (missing_ids, "missing"), (removed_ids, "removed")):
+                if ids:
+                    reasons.append(f"{len(ids)} {label} page(s)")
+        if dry_run:
+            return BuildResult(self.name, self.output_dir, reasons), None
+
+        template = (context.root / self.template).read_text(encoding="utf-8")
+        written = write_event_pages(
+            [event for event in events if str(event["_id"]) in stale],
+            output_dir,
+            template,
+            context.now.year,
+            workers=context.workers,
+        )
+        for event_id in removed_ids:
+            (output_dir / event_page_name(event_id)).unlink(missing_ok=True)
+        reasons.append(f"{written} of {len(pages)} page(s) written")
+        record = {
+            "output": self.output_dir,
+            "inputs": inputs,
+            "pages": pages,
+            "built_at": isoformat_datetime(context.now),
+        }
+        return BuildResult(self.name, self.output_dir, reasons, True, time.perf_counter() - started), record
+
+
+class EventArchive:
+    """The lazily loaded event archive: a head file, past chunks and their index.
+
+    Only files whose content changed are written, each with its
+    precompressed siblings; chunks no longer in the index are deleted.
+    """
+
+    __slots__ = ("name", "output_dir", "select", "chunk_size")
+
+    def __init__(
+        self,
+        name: str,
+        output_dir: str,
+        select: Callable[[BuildContext], List[Dict[str, Any]]],
+        chunk_size: int = ARCHIVE_CHUNK_SIZE,
+    ) -> None:
+        self.name = name
+        self.output_dir = output_dir
+        self.select = select
+        self.chunk_size = chunk_size
+
+    def build(
+        self, context: BuildContext, record: Optional[Dict[str, Any]], *, force: bool, dry_run: bool
+    ) -> Tuple["BuildResult", Optional[Dict[str, Any]]]:
+        # The files are cheap to serialise, so their content hashes are the inputs.
+        started = time.perf_counter()
+        output_dir = context.root / self.output_dir
+        _, contents = build_archive(
+            self.select(context), context.now, self.chunk_size, _sha256_file(context.events_path)
+        )
+        files = {name: hashlib.sha256(content.encode("utf-8")).hexdigest() for name, content in contents.items()}
+
+        previous = (record or {}).get("files", {}) if not force else {}
+        stale = [
+            name
+            for name, digest in files.items()
+            if previous.get(name) != digest
+            or _sha256_file(output_dir / name) != digest
+            or not (output_dir / f"{name}.gz").exists()
+        ]
+        removed = [name for name in (record or {}).get("files", {}) if name not in files]
+        if not (stale or removed):
+            return BuildResult(self.name, self.output_dir, []), None
+        if force:
+            reasons = ["forced"]
+        elif record is None:
+            reasons = ["no previous build recorded"]
+        else:
+            reasons = [f"{len(stale)} of {len(files)} file(s) changed"]
+            if removed:
+                reasons.append(f"{len(removed)} removed file(s)")
+        if dry_run:
+            return BuildResult(self.name, self.output_dir, reasons), None
+
+        for name in stale:
+            write_archive_file(output_dir / name, contents[name])
+        for name in removed:
+            remove_archive_file(output_dir / name)
+        record = {
+            "output": self.output_dir,
+            "files": files,
+            "built_at": isoformat_datetime(context.now),
+        }
+        return BuildResult(self.name, self.output_dir, reasons, True, time.perf_counter() - started), record
+
+
+class RegionPages:
+    """A page and an event bundle per region, from one pass over the events.
+
+    ``select`` groups the events by region code and ``page_lists`` picks the
+    lists a region's page shows. A region's page is rendered again only when
+    its lists or the shared inputs change, its ``<code>.json`` bundle only
+    when its content changes; outputs of regions without events are deleted.
+    """
+
+    __slots__ = ("name", "output_dir", "template", "sources", "select", "page_lists", "render")
+
+    def __init__(
+        self,
+        name: str,
+        output_dir: str,
+        template: str,
+        sources: Sequence[str],
+        select: Callable[[BuildContext], Dict[str, List[Dict[str, Any]]]],
+        page_lists: Callable[[BuildContext, List[Dict[str, Any]]], Selection],
+        render: Callable[[BuildContext, str, Selection], str],
+    ) -> None:
+        self.name = name
+        self.output_dir = output_dir
+        self.template = template
+        self.sources = tuple(sources)
+        self.select = select
+        self.page_lists = page_lists
+        self.render = render
+
+    def input_files(self) -> Tuple[str, ...]:
+        return (self.template, *self.sources, *RENDERER_SOURCES)
+
+    def build(
+        self, context: BuildContext, record: Optional[Dict[str, Any]], *, force: bool, dry_run: bool
+    ) -> Tuple["BuildResult", Optional[Dict[str, Any]]]:
+        started = time.perf_counter()
+        output_dir = context.root / self.output_dir
+        groups = self.select(context)
+        selections = {code: self.page_lists(context, events) for code, events in groups.items()}
+        bundles = {f"{code}.json": dump_events(events) for code, events in groups.items()}
+        inputs: Dict[str, Optional[str]] = {path: _sha256_file(context.root / path) for path in self.input_files()}
+        shared = hashlib.sha256(dumps(inputs, pretty=False).encode("utf-8")).hexdigest()
+        pages = {
+            f"{code}.html": hashlib.sha256(f"{shared}{selection_digest(selection, context.now)}".encode("ascii")).hexdigest()
+            for code, selection in selections.items()
+        }
+        files = {name: hashlib.sha256(content.encode("utf-8")).hexdigest() for name, content in bundles.items()}
+
+        previous_pages = (record or {}).get("pages", {}) if not force else {}
+        previous_files = (record or {}).get("files", {}) if not force else {}
+        stale_pages = [
+            name
+            for name, digest in pages.items()
+            if previous_pages.get(name) != digest or not (output_dir / name).exists()
+        ]
+        stale_files = [
+            name
+            for name, digest in files.items()
+            if previous_files.get(name) != digest or _sha256_file(output_dir / name) != digest
+        ]
+        removed = [
+            name
+            for name in (*(record or {}).get("pages", {}), *(record or {}).get("files", {}))
+            if name not in pages and name not in files
+        ]
+        if not (stale_pages or stale_files or removed):
+            return BuildResult(self.name, self.output_dir, []), None
+        if force:
+            reasons = ["forced"]
+        elif record is None:
+            reasons = ["no previous build recorded"]
+        else:
+            reasons = []
+            if stale_pages:
+                reasons.append(f"{len(stale_pages)} of {len(pages)} page(s) changed")
+            if stale_files:
+                reasons.append(f"{len(stale_files)} of {len(files)} bundle(s) changed")
+            if removed:
+                reasons.append(f"{len(removed)} removed file(s)")
+        if dry_run:
+            return BuildResult(self.name, self.output_dir, reasons), None
+
+        if stale_pages:
+            context.load_fragments()
+            template = (context.root / self.template).read_text(encoding="utf-8")
+            for name in stale_pages:
+                atomic_write_text(output_dir / name, self.render(context, template, selections[name[: -len(".html")]]))
+        for name in stale_files:
+            atomic_write_text(output_dir / name, bundles[name])
+        for name in removed:
+            (output_dir / name).unlink(missing_ok=True)
+        record = {
+            "output": self.output_dir,
+            "inputs": inputs,
+            "pages": pages,
+            "files": files,
+            "built_at": isoformat_datetime(context.now),
+        }
+        return BuildResult(self.name, self.output_dir, reasons, True, time.perf_counter() - started), record
+
+
+class BuildResult:
+    """What happened to one artifact; ``reasons`` is empty when it was up to date."""
+
+    __slots__ = ("name", "output", "reasons", "written", "seconds")
+
+    def __init__(self, name: str, output: str, reasons: List[str], written: bool = False, seconds: float = 0.0) -> None:
+        self.name = name
+        self.output = output
+        self.reasons = reasons
+        self.written = written
+        self.seconds = seconds
+
+    def describe(self) -> str:
+        if not self.reasons:
+            return f"up to date  {self.output}"
+        if not self.written:
+            return f"stale       {self.output} ({'; '.join(self.reasons)})"
+        return f"rebuilt     {self.output} in {self.seconds * 1000:.1f} ms ({'; '.join(self.reasons)})"
+
+
+def _sha256_file(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def selection_digest(selection: Selection, now: datetime) -> str:
+    """Hash of the selected events per list, plus the year cards render against."""
+    digest = hashlib.sha256(str(now.year).encode("ascii"))
+    for list_name, events in selection.items():
+        digest.update(f"\0{list_name}:{len(events)}".encode("utf-8"))
+        for event in events:
+            digest.update(event_content_hash(event).encode("ascii"))
+    return digest.hexdigest()
+
+
+def input_hashes(artifact: Artifact, context: BuildContext, selection: Selection) -> Dict[str, Optional[str]]:
+    hashes: Dict[str, Optional[str]] = {path: _sha256_file(context.root / path) for path in artifact.input_files()}
+    hashes["events"] = selection_digest(selection, context.now)
+    return hashes
+
+
+def stale_reasons(
+    record: Optional[Dict[str, Any]],
+    inputs: Dict[str, Optional[str]],
+    output_path: Path,
+) -> List[str]:
+    """Why the artifact has to be rebuilt; empty when it is up to date."""
+
+    if record is None:
+        return ["no previous build recorded"]
+    output_hash = _sha256_file(output_path)
+    if output_hash is None:
+        return ["output missing"]
+    if output_hash != record.get("output_sha256"):
+        return ["output modified since the last build"]
+    recorded = record.get("inputs", {})
+    return [f"{name} changed" for name, value in inputs.items() if recorded.get(name) != value]
+
+
+def load_build_manifest(manifest_path: Path) -> Dict[str, Any]:
+    try:
+        manifest = loads(manifest_path.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except ValueError as exc:
+        print(f"Warning: ignoring unreadable build manifest {manifest_path}: {exc}")
+        return {}
+    if manifest.get("format") != MANIFEST_FORMAT:
+        return {}
+    return manifest.get("artifacts", {})
+
+
+def write_build_manifest(manifest_path: Path, artifacts: Dict[str, Any]) -> None:
+    atomic_write_text(manifest_path, dumps({"format": MANIFEST_FORMAT, "artifacts": artifacts}) + "\n")
+
+
+def build_site(
+    artifacts: Optional[Iterable[Union[Artifact, EventPages, EventArchive, RegionPages]]] = None,
+    *,
+    root: Optional[Path] = None,
+    events_path: Optional[Path] = None,
+    manifest_path: Optional[Path] = None,
+    now: Optional[datetime] = None,
+    force: bool = False,
+    dry_run: bool = False,
+    workers: Optional[int] = None,
+) -> List[BuildResult]:
+    """Rebuild the artifacts whose inputs changed and record the new hashes.
+
+    ``force`` rebuilds everything; ``dry_run`` only reports what would be
+    rebuilt. ``workers`` > 1 renders large batches of event cards and event
+    pages in a process pool.
+    """
+
+    root = root or BASE_DIR
+    events_path = events_path or DEFAULT_EVENTS_FILE
+    manifest_path = manifest_path or DEFAULT_MANIFEST_FILE
+    artifacts = list(artifacts) if artifacts is not None else default_artifacts()
+    context = BuildContext(root, events_path, now, workers)
+    manifest = load_build_manifest(manifest_path)
+
+    results: List[BuildResult] = []
+    manifest_changed = False
+    for artifact in artifacts:
+        result, record = artifact.build(context, manifest.get(artifact.name), force=force, dry_run=dry_run)
+        results.append(result)
+        if record is not None:
+            manifest[artifact.name] = record
+            manifest_changed = True
+
+    if context.fragments_loaded:
+        default_fragment_cache.save(fragment_cache_path_for(events_path))
+    if manifest_changed:
+        write_build_manifest(manifest_path, manifest)
+    return results
+
+
+def fill_page_template(
+    context: BuildContext, template: str, list_content: str, map_content: str, cluster_content: str
+) -> str:
+    # Sample output: Aug 1st (2024) 9:39 PM PDT
+    current_time_str_PDT = context.now.replace(tzinfo=UTC).astimezone(local_tz).strftime('%D %H:%M')
+    index_html = template.replace('{{current_time_str_PDT}}', current_time_str_PDT)
+    index_html = index_html.replace('{{list_content}}', list_content)
+    index_html = index_html.replace('{{map_content}}', map_content)
+    return index_html.replace('{{cluster_content}}', cluster_content)
+
+
+# Main page (deprecated/): upcoming, planning and past lists around now.
+# Every past event is kept: the map can show rides older than two months.
+def select_main_page(context: BuildContext) -> Selection:
+    return main_page_lists(context.events(), context.now)
+
+
+def main_page_lists(all_events: EventIndex, now: datetime) -> Selection:
+    # Ongoing events that started in the last 6 hours still count as upcoming
+    six_hours_before = now - timedelta(hours=6)
+    days_difference = now + timedelta(days=14)
+    past_events_list = all_events.query(time_range=(None, six_hours_before))
+    past_events_list.reverse()  # most recent first
+    return {
+        "upcoming": all_events.query(time_range=(six_hours_before, days_difference)),
+        "planning": all_events.query(time_range=(days_difference, None)),
+        "past": past_events_list,
+    }
+
+
+def render_main_page(context: BuildContext, template: str, selection: Selection) -> str:
+    events_list_content = """
+    <h2><span style="opacity: 100;">U</span>Pcoming Events <img src="https://maps.google.com/mapfiles/ms/icons/green-dot.png" alt="Green Marker" /></h2>
+    <div class="events-container">
+"""
+
+    events_list_content += gen_div_for_events_from_list(selection["upcoming"], event_type='upcoming', workers=context.workers)
+
+
+    events_list_content += f"""
+        </div>
+        <h2>Planning Events <img src="https://maps.google.com/mapfiles/ms/icons/blue-dot.png" alt="Blue Marker" /></h2>
+        <div class="events-container">
+"""
+    events_list_content += gen_div_for_events_from_list(selection["planning"], event_type='planning', workers=context.workers)
+
+
+    events_list_content += f"""
+        </div>
+        <h2>Past Events <img src="https://maps.google.com/mapfiles/ms/icons/yellow-dot.png" alt="Yellow Marker" /></h2>
+        <div class="events-container">
+"""
+    events_list_content += gen_div_for_events_from_list(selection["past"], event_type='past', workers=context.workers)
+
+    # Close the last events-container div
+    events_list_content += """
+    </div>
+"""
+
+    event_markers = []
+    event_markers.extend(gen_gmp_advanced_marker_for_events_from_list(selection["past"], 'past'))
+    event_markers.extend(gen_gmp_advanced_marker_for_events_from_list(selection["upcoming"], 'upcoming'))
+    event_markers.extend(gen_gmp_advanced_marker_for_events_from_list(selection["planning"], 'planning'))
+
+    map_content = serialize_event_markers_to_json(event_markers)
+    cluster_content = serialize_marker_clusters_to_json(event_markers)
+    return fill_page_template(context, template, events_list_content, map_content, cluster_content)
+
+
+# NorCal specific filters
+NORCAL_GROUP_IDS = {59884023036, 1157973}
+INCLUDE_SOURCE_TYPES = {'wechat'}
+INCLUDE_EVENT_IDS = {'675cbf464d14b254128dbbf1'}
+
+
+# NorCal2024/: every NorCal club ride, most recent first.
+def select_norcal_page(context: BuildContext) -> Selection:
+    all_events = context.events()
+    all_events_list = all_events.union(
+        all_events.query(ids=INCLUDE_EVENT_IDS),
+        all_events.query(source_types=INCLUDE_SOURCE_TYPES),
+        all_events.query(group_ids=NORCAL_GROUP_IDS),
+    )
+    all_events_list.reverse()
+    return {"past": all_events_list}
+
+
+def render_norcal_page(context: BuildContext, template: str, selection: Selection) -> str:
+    all_events_list = selection["past"]
+    events_list_content = """
+    <h2><span style=\"opacity: 0;\">U</span>北加州骑行团2024骑行记录回顾 <img src=\"https://maps.google.com/mapfiles/ms/icons/green-dot.png\" alt=\"Green Marker\" /></h2>
+    <div class=\"events-container\">
+"""
+
+    events_list_content += gen_div_for_events_from_list(all_events_list, event_type='past', workers=context.workers)
+
+    # Close the last events-container div
+    events_list_content += """
+    </div>
+"""
+
+    event_markers = []
+    event_markers.extend(gen_gmp_advanced_marker_for_events_from_list(all_events_list, 'upcoming'))
+
+    map_content = serialize_event_markers_to_json(event_markers)
+    cluster_content = serialize_marker_clusters_to_json(event_markers)
+    return fill_page_template(context, template, events_list_content, map_content, cluster_content)
+
+
+# events/: a shareable page for every active event.
+def select_event_pages(context: BuildContext) -> List[Dict[str, Any]]:
+    return context.events().events
+
+
+# storage/archive/: every active event, split for lazy loading by dynamic-loader.js.
+def select_archive(context: BuildContext) -> List[Dict[str, Any]]:
+    return context.events().events
+
+
+# regions/: the main page and an event bundle per region, e.g. regions/norcal.html.
+def select_regions(context: BuildContext) -> Dict[str, List[Dict[str, Any]]]:
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for event in context.events().events:
+        code = event_region_code(event)
+        if code:
+            groups.setdefault(code, []).append(event)
+    return groups
+
+
+def select_region_page(context: BuildContext, events: List[Dict[str, Any]]) -> Selection:
+    return main_page_lists(EventIndex(events), context.now)
+
+
+def default_artifacts() -> List[Union[Artifact, EventPages, EventArchive, RegionPages]]:
+    return [
+        Artifact(
+            "main",
+            "deprecated/index.html",
+            "deprecated/index_template.html",
+            ["styles.css"],
+            select_main_page,
+            render_main_page,
+        ),
+        Artifact(
+            "norcal2024",
+            "NorCal2024/index.html",
+            "NorCal2024/index_template.html",
+            ["styles.css"],
+            select_norcal_page,
+            render_norcal_page,
+        ),
+        EventPages(
+            "event-pages",
+            EVENT_PAGES_DIR_NAME,
+            "event_page_template.html",
+            [],
+            select_event_pages,
+        ),
+        EventArchive("event-archive", ARCHIVE_DIR_NAME, select_archive),
+        RegionPages(
+            "regions",
+            "regions",
+            "deprecated/index_template.html",
+            ["styles.css"],
+            select_regions,
+            select_region_page,
+            render_main_page,
+        ),
+    ]
+
+
+def print_build_report(results: List[BuildResult], seconds: Optional[float] = None) -> None:
+    for result in results:
+        print(result.describe())
+    rebuilt = sum(result.written for result in results)
+    stale = sum(bool(result.reasons) and not result.written for result in results)
+    summary = f"{rebuilt} of {len(results)} artifact(s) rebuilt"
+    if stale:
+        summary += f", {stale} stale"
+    if seconds is not None:
+        summary += f" in {seconds * 1000:.1f} ms"
+    print(summary)